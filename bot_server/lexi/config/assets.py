@@ -6,6 +6,7 @@ from lexi.utils.yaml import YAMLSettings, find_assets_sources
 
 class Assets(YAMLSettings):
     commands: dict[str, list[BotCommand]]
+    moderation_blocklist: dict[str, list[str]] = {}
 
     model_config = SettingsConfigDict(
         yaml_file_encoding="utf-8",
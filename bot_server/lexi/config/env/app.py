@@ -4,12 +4,16 @@ from lexi.const import ENV_FILE
 
 from .common import CommonConfig
 from .content_moderation import ContentModerationConfig
+from .llm_cache import LLMCacheConfig
+from .llm_gateway import LLMGatewayConfig
 from .postgres import PostgresConfig
 from .redis import RedisConfig
 from .server import ServerConfig
 from .sql_alchemy import SQLAlchemyConfig
 from .story_teller import StoryTellerConfig
 from .telegram import TelegramConfig
+from .update_scheduler import UpdateSchedulerConfig
+from .user_cache import UserCacheConfig
 
 
 class AppConfig(BaseSettings):
@@ -28,3 +32,7 @@ class AppConfig(BaseSettings):
     common: CommonConfig
     story_teller: StoryTellerConfig
     content_moderation: ContentModerationConfig = ContentModerationConfig()
+    llm_cache: LLMCacheConfig = LLMCacheConfig()
+    llm_gateway: LLMGatewayConfig = LLMGatewayConfig()
+    user_cache: UserCacheConfig = UserCacheConfig()
+    update_scheduler: UpdateSchedulerConfig = UpdateSchedulerConfig()
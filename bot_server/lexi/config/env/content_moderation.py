@@ -5,3 +5,8 @@ from pydantic_settings import BaseSettings
 class ContentModerationConfig(BaseSettings):
     openai_api_key: SecretStr = SecretStr("")
     is_enabled: bool = True
+    model: str = "omni-moderation-latest"
+    # Inputs arriving within the window are sent in one API call
+    batch_window: float = 0.02
+    batch_size: int = 32
+    allowlist_ttl: int = 30 * 86400
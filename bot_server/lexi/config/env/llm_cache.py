@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings
+
+
+class LLMCacheConfig(BaseSettings):
+    is_enabled: bool = False
+    max_entries: int = 50_000
+    # Calls sampled above this temperature are never cached
+    max_temperature: float = 0.5
+    default_ttl: int = 86400
+    ttls: dict[str, int] = {
+        "vocabulary": 7 * 86400,
+    }
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class HedgingConfig(BaseSettings):
+    is_enabled: bool = False
+    # Hedge once the first token takes longer than this share of recent requests
+    percentile: float = 0.95
+    min_delay: float = 0.5
+    max_delay: float = 8.0
+    window: int = 500
+    min_samples: int = 20
+    fallback_model: Optional[str] = None
+    max_hedge_ratio: float = 0.05
+    burst: float = 5.0
+
+
+class LLMGatewayConfig(BaseSettings):
+    base_url: Optional[str] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    # Concurrent in-flight requests per model, the rest wait in a queue
+    default_concurrency: int = 16
+    model_concurrency: dict[str, int] = {}
+    queue_timeout: float = 30.0
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 20.0
+    hedging: HedgingConfig = HedgingConfig()
@@ -1,13 +1,27 @@
+from pathlib import Path
+from typing import Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 
+class RedisCompressionConfig(BaseSettings):
+    is_enabled: bool = False
+    level: int = 3
+    # Smaller values are stored as they are
+    min_size: int = 256
+    # Values compressed with a dictionary can only be read with the same dictionary
+    dictionary_path: Optional[Path] = None
+    dictionary_size: int = 64 * 1024
+
+
 class RedisConfig(BaseSettings):
     host: str
     user: str
     password: SecretStr
     port: int
     db: int
+    compression: RedisCompressionConfig = RedisCompressionConfig()
 
     def build_url(self) -> str:
         return f"redis://{self.user}:{self.password.get_secret_value()}@{self.host}:{self.port}/{self.db}"
@@ -8,3 +8,7 @@ class SQLAlchemyConfig(BaseSettings):
     max_overflow: int = 25
     pool_timeout: int = 10
     pool_recycle: int = 3600
+    # One session per Telegram update instead of one per query
+    share_session_per_update: bool = False
+    # Seconds without queries after which a shared session returns its connection
+    shared_session_idle_timeout: float = 0.05
@@ -11,6 +11,63 @@ class OpenAIConfig(BaseSettings):
     api_key: SecretStr = SecretStr("")
 
 
+class StreamingConfig(BaseSettings):
+    is_enabled: bool = False
+    edit_interval: float = 1.0
+    min_edit_chars: int = 20
+
+
+class SpeculationConfig(BaseSettings):
+    is_enabled: bool = False
+    max_concurrent_jobs: int = 20
+    max_jobs_per_user: int = 2
+    result_ttl: int = 300
+
+
+class CompactionConfig(BaseSettings):
+    is_enabled: bool = False
+    keep_last_segments: int = 3
+    model: str = "gpt-4o-mini"
+    max_tokens: int = 300
+
+
+class SessionLifecycleConfig(BaseSettings):
+    is_enabled: bool = False
+    # Sessions idle for this long are moved to Postgres by the sweeper
+    archive_after: int = 6 * 3600
+    # Redis keys expire on their own if the sweeper did not run in time
+    idle_ttl: int = 24 * 3600
+    sweep_interval: int = 300
+    batch_size: int = 100
+
+
+class StoryHistoryConfig(BaseSettings):
+    is_enabled: bool = False
+    batch_size: int = 200
+    flush_interval: float = 2.0
+    # Finished stories beyond this are dropped while Postgres is unavailable
+    max_pending: int = 10_000
+
+
+class TurnGuardConfig(BaseSettings):
+    is_enabled: bool = False
+    # Upper bound on a generation, a crashed one frees the turn after it
+    lock_ttl: int = 120
+    # How long repeated taps are answered with the story bit of the first one
+    result_ttl: int = 600
+    # Seconds a repeated tap waits for the generation of the first one
+    wait_timeout: float = 60.0
+
+
 class StoryTellerConfig(BaseSettings):
     available_languages: StringList
     openai: OpenAIConfig
+    fold_character_growth: bool = False
+    structured_output: bool = False
+    prefetch_vocabulary: bool = False
+    streaming: StreamingConfig = StreamingConfig()
+    speculation: SpeculationConfig = SpeculationConfig()
+    compaction: CompactionConfig = CompactionConfig()
+    lifecycle: SessionLifecycleConfig = SessionLifecycleConfig()
+    history: StoryHistoryConfig = StoryHistoryConfig()
+    turn_guard: TurnGuardConfig = TurnGuardConfig()
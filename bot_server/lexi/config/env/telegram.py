@@ -4,6 +4,27 @@ from pydantic_settings import BaseSettings
 from lexi.utils.custom_types import StringList
 
 
+class OutboundRateLimitConfig(BaseSettings):
+    is_enabled: bool = False
+    # Requests per second to the Bot API across all chats
+    global_rate: float = 30.0
+    global_burst: int = 30
+    # Requests per second to one chat
+    chat_rate: float = 1.0
+    chat_burst: int = 3
+    # Attempts of a request after a flood control error
+    max_retries: int = 3
+
+
+class MessageEditsConfig(BaseSettings):
+    is_enabled: bool = False
+    # Seconds between edits of the same message, newer edits replace waiting ones
+    min_interval: float = 1.0
+    # Messages whose last edit is remembered to skip edits that change nothing
+    max_messages: int = 10_000
+    ttl: float = 300.0
+
+
 class TelegramConfig(BaseSettings):
     bot_token: SecretStr
     locales: StringList
@@ -12,3 +33,9 @@ class TelegramConfig(BaseSettings):
     reset_webhook: bool
     webhook_path: str
     webhook_secret: SecretStr
+    # Send the first quick Bot API call of an update in the webhook response
+    reply_in_webhook: bool = False
+    # Seconds an update has to make that call before the webhook is answered empty
+    webhook_reply_timeout: float = 0.5
+    rate_limit: OutboundRateLimitConfig = OutboundRateLimitConfig()
+    edits: MessageEditsConfig = MessageEditsConfig()
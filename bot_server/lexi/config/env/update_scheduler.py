@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings
+
+
+class UpdateSchedulerConfig(BaseSettings):
+    is_enabled: bool = False
+    # Updates handled at the same time across all users
+    max_concurrency: int = 64
+    # Updates accepted but not finished yet, Telegram redelivers the rest later
+    max_pending: int = 5_000
+    max_pending_per_user: int = 20
+    # Seconds to finish accepted updates on shutdown
+    shutdown_timeout: float = 10.0
@@ -0,0 +1,8 @@
+from pydantic_settings import BaseSettings
+
+
+class UserCacheConfig(BaseSettings):
+    is_enabled: bool = False
+    max_size: int = 10_000
+    # Upper bound on staleness if an invalidation message is lost
+    ttl: float = 30.0
@@ -1,8 +1,19 @@
+from typing import Optional
+
+from aiogram import Bot
 from fastapi import APIRouter, Request, Response
 
+from lexi.endpoints.telegram import TelegramRequestHandler
 from lexi.models.dto.healthcheck import HealthcheckResponse
+from lexi.models.dto.llm import LLMModelStats
+from lexi.models.dto.redis import CacheTierStats, CompressionStats
+from lexi.models.dto.telegram import OutboundQueueStats
+from lexi.models.dto.update_scheduler import UpdateSchedulerStats
+from lexi.services.crud import UserService
 from lexi.services.healthcheck import check_redis
+from lexi.services.llm_gateway import LLMGateway
 from lexi.services.redis import RedisRepository
+from lexi.telegram.middlewares import OutboundRateLimitMiddleware
 
 router: APIRouter = APIRouter(prefix="/health")
 
@@ -22,3 +33,43 @@ async def handle_readiness(request: Request, response: Response) -> HealthcheckR
         await check_redis(response=response_body, redis=redis)
     response.status_code = response_body.get_status_code()
     return response_body
+
+
+@router.get(path="/llm")
+async def handle_llm_stats(request: Request) -> list[LLMModelStats]:
+    llm_gateway: LLMGateway = request.app.state.llm_gateway
+    return llm_gateway.get_stats()
+
+
+@router.get(path="/compression")
+async def handle_compression_stats(request: Request) -> CompressionStats:
+    redis: RedisRepository = request.app.state.redis_repository
+    return redis.codec.get_stats()
+
+
+@router.get(path="/user_cache")
+async def handle_user_cache_stats(request: Request) -> list[CacheTierStats]:
+    user_service: UserService = request.app.state.user_service
+    if user_service.local_cache is None:
+        return []
+    return user_service.local_cache.get_stats()
+
+
+@router.get(path="/updates")
+async def handle_update_scheduler_stats(request: Request) -> Optional[UpdateSchedulerStats]:
+    # Absent when polling
+    handler: Optional[TelegramRequestHandler] = getattr(
+        request.app.state, "tg_webhook_handler", None
+    )
+    if handler is None or handler.scheduler is None:
+        return None
+    return handler.scheduler.get_stats()
+
+
+@router.get(path="/telegram")
+async def handle_outbound_stats(request: Request) -> list[OutboundQueueStats]:
+    bot: Bot = request.app.state.bot
+    for middleware in bot.session.middleware:
+        if isinstance(middleware, OutboundRateLimitMiddleware):
+            return middleware.get_stats()
+    return []
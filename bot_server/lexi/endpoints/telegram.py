@@ -1,17 +1,29 @@
 import asyncio
 import secrets
-from typing import Annotated, Any, Optional
+from functools import partial
+from typing import Annotated, Any, Hashable, Optional
 
 from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
 from aiogram.methods import TelegramMethod
 from aiogram.types import Update
 from fastapi import APIRouter, Body, Header, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from lexi.services.update_scheduler import UpdateScheduler
+from lexi.telegram.middlewares.webhook_reply import (
+    WebhookReply,
+    build_webhook_reply,
+    webhook_reply,
+)
 
 
 class TelegramRequestHandler:
     dispatcher: Dispatcher
     bot: Bot
     secret_token: Optional[str]
+    scheduler: Optional[UpdateScheduler]
+    reply_timeout: Optional[float]
     _feed_update_tasks: set[asyncio.Task[Any]]
 
     def __init__(
@@ -20,14 +32,21 @@ class TelegramRequestHandler:
         bot: Bot,
         path: str,
         secret_token: Optional[str] = None,
+        scheduler: Optional[UpdateScheduler] = None,
+        reply_timeout: Optional[float] = None,
     ) -> None:
         """
         Base handler that helps to handle incoming request from aiohttp
         and propagate it to the Dispatcher
+
+        :param reply_timeout: Wait this long for a Bot API call of the update to send it
+            in the response, requires ``WebhookReplyMiddleware`` in the bot session
         """
         self.dispatcher = dispatcher
         self.bot = bot
         self.secret_token = secret_token
+        self.scheduler = scheduler
+        self.reply_timeout = reply_timeout
         self.router: APIRouter = APIRouter(
             on_startup=(self.startup,),
             on_shutdown=(self.shutdown,),
@@ -46,6 +65,8 @@ class TelegramRequestHandler:
     async def shutdown(self) -> None:
         if self.dispatcher.get("shutdown_completed"):
             return
+        if self.scheduler is not None:
+            await self.scheduler.close()
         await self.dispatcher.emit_shutdown(
             dispatcher=self.dispatcher,
             bot=self.bot,
@@ -61,17 +82,34 @@ class TelegramRequestHandler:
             return secrets.compare_digest(telegram_secret_token, self.secret_token)
         return True
 
-    async def _feed_update(self, update: Update) -> None:
-        result = await self.dispatcher.feed_update(
-            bot=self.bot,
-            update=update,
-            dispatcher=self.dispatcher,
-        )
-        if isinstance(result, TelegramMethod):
-            await self.dispatcher.silent_call_request(bot=self.bot, result=result)
+    async def _feed_update(self, update: Update, reply: Optional[WebhookReply] = None) -> None:
+        # Set here, the tasks of the scheduler outlive the request that created them
+        token = webhook_reply.set(reply)
+        try:
+            result = await self.dispatcher.feed_update(
+                bot=self.bot,
+                update=update,
+                dispatcher=self.dispatcher,
+            )
+            if isinstance(result, TelegramMethod):
+                await self.dispatcher.silent_call_request(bot=self.bot, result=result)
+        finally:
+            if reply is not None:
+                reply.close()
+            webhook_reply.reset(token)
 
-    async def _handle_request_background(self, update: Update) -> None:
-        feed_update_task: asyncio.Task[Any] = asyncio.create_task(self._feed_update(update=update))
+    async def _handle_request_background(
+        self, update: Update, reply: Optional[WebhookReply] = None
+    ) -> None:
+        if self.scheduler is not None:
+            # Rejected updates are answered with an error status, Telegram retries them
+            self.scheduler.submit(
+                _get_update_key(update), partial(self._feed_update, update=update, reply=reply)
+            )
+            return
+        feed_update_task: asyncio.Task[Any] = asyncio.create_task(
+            self._feed_update(update=update, reply=reply)
+        )
         self._feed_update_tasks.add(feed_update_task)
         feed_update_task.add_done_callback(self._feed_update_tasks.discard)
 
@@ -79,10 +117,33 @@ class TelegramRequestHandler:
         self,
         update: Annotated[Update, Body()],
         x_telegram_bot_api_secret_token: Annotated[str, Header()],
-    ) -> None:
+    ) -> Optional[JSONResponse]:
         if not self.verify_secret(x_telegram_bot_api_secret_token):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid secret token",
             )
-        await self._handle_request_background(update=update)
+        if self.reply_timeout is None:
+            await self._handle_request_background(update=update)
+            return None
+
+        reply = WebhookReply()
+        await self._handle_request_background(update=update, reply=reply)
+        method = await reply.wait(timeout=self.reply_timeout)
+        if method is None:
+            return None
+        body = build_webhook_reply(bot=self.bot, method=method)
+        if body is None:
+            await self.dispatcher.silent_call_request(bot=self.bot, result=method)
+            return None
+        return JSONResponse(content=body)
+
+
+def _get_update_key(update: Update) -> Hashable:
+    """Updates with the same key are handled in order"""
+    context = UserContextMiddleware.resolve_event_context(event=update)
+    if context.user is not None:
+        return context.user.id
+    if context.chat is not None:
+        return context.chat.id
+    return ("update", update.update_id)
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class StorySessionStatus(StrEnum):
+    ABANDONED = "abandoned"
+    FINISHED = "finished"
@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+
+class OutboundPriority(IntEnum):
+    """Order in which queued Bot API requests are sent, lower first"""
+
+    CALLBACK_ANSWER = 0
+    EDIT = 1
+    MESSAGE = 2
+    BROADCAST = 3
@@ -0,0 +1,9 @@
+from lexi.errors.base import AppError
+
+
+class LLMError(AppError):
+    pass
+
+
+class LLMOverloadedError(LLMError):
+    pass
@@ -0,0 +1,13 @@
+from starlette import status
+
+from lexi.errors.http import HTTPError
+
+
+class UpdateQueueFullError(HTTPError):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Too many pending updates"
+
+
+class UserQueueFullError(UpdateQueueFullError):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Too many pending updates of the user"
@@ -1,47 +1,98 @@
 from __future__ import annotations
 
-from typing import Any, TypedDict
+from typing import Any, Optional, TypedDict
 
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from lexi.config import AppConfig
+from lexi.config import AppConfig, Assets
+from lexi.services.content_moderation import ContentModerator
 from lexi.services.crud import UserService
+from lexi.services.crud.user_cache import LocalUserCache
+from lexi.services.llm_cache import LLMResponseCache
+from lexi.services.llm_gateway import LLMGateway
 from lexi.services.redis import RedisRepository
 from lexi.services.story_creator import StoryCreatorService
+from lexi.services.story_history import StoryHistoryWriter
+from lexi.services.story_lifecycle import StorySessionLifecycle
+from lexi.services.story_session_store import StorySessionStore
 from lexi.services.story_teller import StoryTellerService
+from lexi.utils.compression import PayloadCodec
 
 
 class Services(TypedDict):
     redis_repository: RedisRepository
+    llm_gateway: LLMGateway
     user_service: UserService
     story_creator: StoryCreatorService
     story_teller: StoryTellerService
+    story_lifecycle: Optional[StorySessionLifecycle]
+    story_history: Optional[StoryHistoryWriter]
 
 
 def create_services(
     session_pool: async_sessionmaker[AsyncSession],
     redis: Redis,
     config: AppConfig,
+    assets: Assets,
 ) -> Services:
+    codec: PayloadCodec = PayloadCodec(config=config.redis.compression)
     crud_service_kwargs: dict[str, Any] = {
         "session_pool": session_pool,
         "redis": redis,
         "config": config,
+        "codec": codec,
     }
 
-    redis_repository: RedisRepository = RedisRepository(client=redis, config=config)
-    user_service: UserService = UserService(**crud_service_kwargs)
+    redis_repository: RedisRepository = RedisRepository(client=redis, config=config, codec=codec)
+    local_user_cache: Optional[LocalUserCache] = None
+    if config.user_cache.is_enabled:
+        local_user_cache = LocalUserCache(config=config.user_cache, redis=redis)
+    user_service: UserService = UserService(**crud_service_kwargs, local_cache=local_user_cache)
+    llm_gateway: LLMGateway = LLMGateway(config=config)
+    llm_cache: LLMResponseCache = LLMResponseCache(
+        config=config.llm_cache, redis_repo=redis_repository
+    )
+    moderator: ContentModerator = ContentModerator(
+        config=config.content_moderation,
+        redis_repo=redis_repository,
+        llm_gateway=llm_gateway,
+        blocklist=(word for words in assets.moderation_blocklist.values() for word in words),
+    )
     story_creator: StoryCreatorService = StoryCreatorService(
-        config=config, user_service=user_service
+        config=config, user_service=user_service, moderator=moderator
+    )
+    lifecycle_config = config.story_teller.lifecycle
+    session_store: StorySessionStore = StorySessionStore(
+        redis_repo=redis_repository,
+        idle_ttl=lifecycle_config.idle_ttl if lifecycle_config.is_enabled else None,
     )
+    story_lifecycle: Optional[StorySessionLifecycle] = None
+    if lifecycle_config.is_enabled:
+        story_lifecycle = StorySessionLifecycle(
+            config=lifecycle_config, session_pool=session_pool, store=session_store
+        )
+    story_history: Optional[StoryHistoryWriter] = None
+    if config.story_teller.history.is_enabled:
+        story_history = StoryHistoryWriter(
+            config=config.story_teller.history, session_pool=session_pool
+        )
     story_teller: StoryTellerService = StoryTellerService(
-        config=config, redis_repo=redis_repository
+        config=config,
+        redis_repo=redis_repository,
+        llm_gateway=llm_gateway,
+        llm_cache=llm_cache,
+        session_store=session_store,
+        lifecycle=story_lifecycle,
+        history_writer=story_history,
     )
 
     return Services(
         redis_repository=redis_repository,
+        llm_gateway=llm_gateway,
         user_service=user_service,
         story_creator=story_creator,
         story_teller=story_teller,
+        story_lifecycle=story_lifecycle,
+        story_history=story_history,
     )
@@ -8,6 +8,7 @@ from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 from aiogram.types import LinkPreviewOptions
 
+from lexi.telegram.middlewares import OutboundRateLimitMiddleware, WebhookReplyMiddleware
 from lexi.utils import mjson
 
 if TYPE_CHECKING:
@@ -16,6 +17,11 @@ if TYPE_CHECKING:
 
 def create_bot(config: AppConfig) -> Bot:
     session: AiohttpSession = AiohttpSession(json_loads=mjson.decode, json_dumps=mjson.encode)
+    if config.telegram.use_webhook and config.telegram.reply_in_webhook:
+        session.middleware(WebhookReplyMiddleware())
+    if config.telegram.rate_limit.is_enabled:
+        # Inside the webhook reply, calls sent in the webhook response are not queued
+        session.middleware(OutboundRateLimitMiddleware(config=config.telegram.rate_limit))
     return Bot(
         token=config.telegram.bot_token.get_secret_value(),
         session=session,
@@ -10,10 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from lexi.config import AppConfig, Assets
 from lexi.factory import create_redis, create_session_pool
-from lexi.factory.services import create_services
+from lexi.factory.services import Services, create_services
 from lexi.factory.telegram.i18n import create_i18n_middleware
 from lexi.telegram.handlers import admin, extra, main, story_creation, story_dialog
-from lexi.telegram.middlewares import ErrorLoggerMiddleware, MessageHelperMiddleware, UserMiddleware
+from lexi.telegram.helpers import EditCoalescer
+from lexi.telegram.middlewares import (
+    ErrorLoggerMiddleware,
+    MessageHelperMiddleware,
+    SQLSessionMiddleware,
+    UserMiddleware,
+)
 from lexi.utils import mjson
 
 
@@ -24,6 +30,13 @@ def create_dispatcher(config: AppConfig) -> Dispatcher:
     session_pool: async_sessionmaker[AsyncSession] = create_session_pool(config=config)
     redis: Redis = create_redis(config=config)
     i18n_middleware: I18nMiddleware = create_i18n_middleware(config)
+    assets: Assets = Assets()  # type: ignore
+    services: Services = create_services(
+        session_pool=session_pool,
+        redis=redis,
+        config=config,
+        assets=assets,
+    )
 
     dispatcher: Dispatcher = Dispatcher(
         name="main_dispatcher",
@@ -34,23 +47,44 @@ def create_dispatcher(config: AppConfig) -> Dispatcher:
             json_dumps=mjson.encode,
         ),
         config=config,
-        assets=Assets(),  # type: ignore
+        assets=assets,
         session_pool=session_pool,
         redis=redis,
-        **create_services(
-            session_pool=session_pool,
-            redis=redis,
-            config=config,
-        ),
+        **services,
     )
+    dispatcher.shutdown.register(services["llm_gateway"].close)
+    if services["user_service"].local_cache is not None:
+        dispatcher.startup.register(services["user_service"].local_cache.start)
+        dispatcher.shutdown.register(services["user_service"].local_cache.stop)
+    if services["story_lifecycle"] is not None:
+        dispatcher.startup.register(services["story_lifecycle"].start)
+        dispatcher.shutdown.register(services["story_lifecycle"].stop)
+    if services["story_history"] is not None:
+        dispatcher.startup.register(services["story_history"].start)
+        dispatcher.shutdown.register(services["story_history"].stop)
 
     dispatcher.include_routers(
         admin.router, main.router, extra.router, story_creation.router, story_dialog.router
     )
     dispatcher.update.outer_middleware(ErrorLoggerMiddleware())
+    if config.sql_alchemy.share_session_per_update:
+        dispatcher.update.outer_middleware(
+            SQLSessionMiddleware(
+                session_pool=session_pool,
+                idle_timeout=config.sql_alchemy.shared_session_idle_timeout,
+            )
+        )
     dispatcher.update.outer_middleware(UserMiddleware())
     i18n_middleware.setup(dispatcher=dispatcher)
-    dispatcher.update.outer_middleware(MessageHelperMiddleware())
+    dispatcher.update.outer_middleware(
+        MessageHelperMiddleware(
+            edit_coalescer=(
+                EditCoalescer(config=config.telegram.edits)
+                if config.telegram.edits.is_enabled
+                else None
+            )
+        )
+    )
     dispatcher.callback_query.middleware(CallbackAnswerMiddleware())
 
     return dispatcher
@@ -0,0 +1,14 @@
+from lexi.models.base import PydanticModel
+
+
+class LLMModelStats(PydanticModel):
+    model: str
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    queue_wait_avg: float = 0.0
+    queue_wait_max: float = 0.0
+    generation_avg: float = 0.0
+    generation_max: float = 0.0
@@ -0,0 +1,16 @@
+from lexi.models.base import PydanticModel
+
+
+class CompressionStats(PydanticModel):
+    is_enabled: bool
+    values: int
+    raw_bytes: int
+    stored_bytes: int
+    ratio: float
+
+
+class CacheTierStats(PydanticModel):
+    tier: str
+    hits: int
+    misses: int
+    hit_ratio: float
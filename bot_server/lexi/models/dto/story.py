@@ -1,5 +1,6 @@
 import random
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -18,6 +19,7 @@ class StoryParams(BaseModel):
 
 class StoryLogic(BaseModel):
     character_growths_moments_left: int
+    growth_moments: list[str] = []
 
 
 class StorySession(BaseModel):
@@ -28,11 +30,30 @@ class StorySession(BaseModel):
     logic: StoryLogic
     story_text: str = ""
     choices: list[str] = []
+    # Choices picked by the user, one per continuation
+    chosen_choices: list[str] = []
     key_words: list[str] = []
     turn_count: int = 0
     created_at: datetime
     last_updated: datetime
 
+    @property
+    def story_id(self) -> int:
+        """Tells this story from the other stories of the user"""
+        return int(self.created_at.timestamp() * 1000)
+
+    @property
+    def segments(self) -> list[str]:
+        """Story bits in the order they were told"""
+        return self.story_text.split("\n\n") if self.story_text else []
+
+
+class StorySummary(BaseModel):
+    """Rolling summary of the earlier story segments"""
+
+    text: str = ""
+    segments_count: int = 0
+
 
 class VocabularyWord(BaseModel):
     """Vocabulary word with translation and definition"""
@@ -56,3 +77,19 @@ class StoryBit(BaseModel):
     text: str
     choices: list[StoryChoice]
     key_words: list[str]
+    # Turn count of the session after this bit, tapping a choice continues from it
+    turn: int = 0
+    story_id: Optional[int] = None
+
+
+class StoryContinuation(BaseModel):
+    """Raw LLM continuation for a story choice, not yet applied to the session"""
+
+    content: str
+
+
+class StoryDraft(BaseModel):
+    """Partial story bit produced while the response is being streamed"""
+
+    text: str
+    story_bit: StoryBit | None = None
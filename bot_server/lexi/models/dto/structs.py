@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import msgspec
+
+
+class StoryParamsStruct(msgspec.Struct, kw_only=True):
+    """msgspec mirror of :class:`lexi.models.dto.story.StoryParams`"""
+
+    target_language_code: str
+    protagonist: str
+    setting: str
+    native_language_code: str
+    openai_model: str
+    max_tokens: int
+    temperature: float
+
+
+class StoryLogicStruct(msgspec.Struct, kw_only=True):
+    """msgspec mirror of :class:`lexi.models.dto.story.StoryLogic`"""
+
+    character_growths_moments_left: int
+    growth_moments: list[str] = []
+
+
+class StorySessionStruct(msgspec.Struct, kw_only=True):
+    """msgspec mirror of :class:`lexi.models.dto.story.StorySession`"""
+
+    user_id: int
+    params: StoryParamsStruct
+    logic: StoryLogicStruct
+    story_text: str = ""
+    choices: list[str] = []
+    chosen_choices: list[str] = []
+    key_words: list[str] = []
+    turn_count: int = 0
+    created_at: datetime
+    last_updated: datetime
+
+
+class VocabularyWordStruct(msgspec.Struct, kw_only=True):
+    """msgspec mirror of :class:`lexi.models.dto.story.VocabularyWord`"""
+
+    word: str
+    definition: str
+    translation: str
+    language_code: str
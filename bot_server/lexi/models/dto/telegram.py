@@ -0,0 +1,10 @@
+from lexi.models.base import PydanticModel
+
+
+class OutboundQueueStats(PydanticModel):
+    priority: str
+    queued: int
+    sent: int
+    retried: int
+    wait_avg: float
+    wait_max: float
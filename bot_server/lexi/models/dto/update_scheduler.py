@@ -0,0 +1,11 @@
+from lexi.models.base import PydanticModel
+
+
+class UpdateSchedulerStats(PydanticModel):
+    pending: int
+    running: int
+    users: int
+    max_user_queue: int
+    processed: int
+    failed: int
+    rejected: int
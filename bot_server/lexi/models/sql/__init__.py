@@ -1,3 +1,5 @@
+from .story import Story, StoryKeyWord, StorySegment
+from .story_session_archive import StorySessionArchive
 from .user import User
 
-__all__ = ["User"]
+__all__ = ["Story", "StoryKeyWord", "StorySegment", "StorySessionArchive", "User"]
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lexi.utils.custom_types import Int16, Int64
+
+from .base import Base
+from .mixins import TimestampMixin
+
+
+class Story(Base, TimestampMixin):
+    """Finished story, written in batches with COPY"""
+
+    __tablename__ = "stories"
+    __table_args__ = (Index("ix_stories_user_id_finished_at", "user_id", "finished_at"),)
+
+    # Generated by the writer, so that segments can be copied without a round trip
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    user_id: Mapped[Int64] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    target_language_code: Mapped[str] = mapped_column(String(length=8))
+    native_language_code: Mapped[str] = mapped_column(String(length=8))
+    protagonist: Mapped[str] = mapped_column()
+    setting: Mapped[str] = mapped_column()
+    model: Mapped[str] = mapped_column()
+    turn_count: Mapped[Int16] = mapped_column()
+    started_at: Mapped[datetime] = mapped_column()
+    finished_at: Mapped[datetime] = mapped_column()
+
+
+class StorySegment(Base):
+    __tablename__ = "story_segments"
+
+    story_id: Mapped[UUID] = mapped_column(
+        ForeignKey("stories.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[Int16] = mapped_column(primary_key=True)
+    text: Mapped[str] = mapped_column()
+    # Branch picked by the user that led to this segment, empty for the opening one
+    chosen_choice: Mapped[Optional[str]] = mapped_column()
+
+
+class StoryKeyWord(Base):
+    __tablename__ = "story_key_words"
+    __table_args__ = (
+        Index("ix_story_key_words_user_id_language_code", "user_id", "language_code"),
+    )
+
+    story_id: Mapped[UUID] = mapped_column(
+        ForeignKey("stories.id", ondelete="CASCADE"), primary_key=True
+    )
+    word: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[Int64] = mapped_column()
+    language_code: Mapped[str] = mapped_column(String(length=8))
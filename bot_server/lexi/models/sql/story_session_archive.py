@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lexi.models.dto.story import StorySession
+from lexi.utils.custom_types import Int64
+
+from .base import Base
+from .mixins import TimestampMixin
+
+
+class StorySessionArchive(Base, TimestampMixin):
+    """Story session moved out of Redis after it was finished or abandoned"""
+
+    __tablename__ = "story_session_archives"
+    __table_args__ = (Index("ix_story_session_archives_user_id_status", "user_id", "status"),)
+
+    user_id: Mapped[Int64] = mapped_column(primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(primary_key=True)
+    status: Mapped[str] = mapped_column(String(length=16))
+    last_active_at: Mapped[datetime] = mapped_column()
+    session: Mapped[dict[str, Any]] = mapped_column()
+
+    def dto(self) -> StorySession:
+        return StorySession.model_validate(self.session)
@@ -63,8 +63,23 @@ def get_continue_story_prompt(
     story_so_far: str,
     user_choice: str,
     turn_count: int,
+    character_growth: bool = False,
+    structured_output: bool = False,
 ) -> str:
     """Generate story continuation with escalating tension"""
+    growth_rule = ""
+    if character_growth:
+        growth_format = (
+            'Also put exactly these sentences into "growth_moment".'
+            if structured_output
+            else 'Put these sentences on the first line, beginning with "GROWTH:".'
+        )
+        growth_rule = f"""
+CHARACTER GROWTH:
+Start the scene with 1-2 sentences in {target_language} where the {protagonist} shows GROWTH or learns something important.
+Make it feel like the child's choices helped the {protagonist} grow!
+{growth_format}
+"""
     return f"""You are masterful screenwriter and adventure book writer, giving master class in storytelling for a child learning {target_language}.
     Their native language is {native_language}.
     Do not use any other text than the story, and don't address the child, just tell the story.
@@ -93,7 +108,7 @@ WRITE THE NEXT SCENE in {target_language}:
 - Introduce new danger or mystery
 - Two dramatic choices (numbered 1 and 2)
 - No text after the choices
-
+{growth_rule}
 If this is turn {turn_count} or higher, start building toward an EPIC CONCLUSION!"""
 
 
@@ -141,6 +156,28 @@ Translation: [translation in {native_language}]
 Keep both definition and translation simple and suitable for a 13-year-old child."""
 
 
+def get_vocabulary_definitions_prompt(
+    word_contexts: dict[str, str],
+    target_language: str,
+    native_language: str,
+) -> str:
+    """Generate prompt defining several words at once, each with its own sentence as context"""
+    words = "\n".join(f'- "{word}" in: {context}' for word, context in word_contexts.items())
+    return f"""You are a helpful language teacher. Provide a simple definition and translation for each of these words, as used in the given sentence:
+
+{words}
+
+Target language: {target_language}
+Native language: {native_language}
+
+For every word, provide your response in this exact format:
+Word: [the word exactly as given]
+Definition: [simple definition in {target_language}]
+Translation: [translation in {native_language}]
+
+Keep both definition and translation simple and suitable for a 13-year-old child."""
+
+
 def get_story_conclusion_prompt(
     target_language: str,
     native_language: str,
@@ -179,6 +216,48 @@ WRITE THE EPIC CONCLUSION in {target_language}:
 Make the child feel like they just won an amazing adventure!"""
 
 
+def get_story_summary_prompt(
+    target_language: str,
+    previous_summary: str,
+    new_scenes: str,
+) -> str:
+    """Generate prompt for the rolling summary of earlier story scenes"""
+    return f"""You are keeping notes for an ongoing adventure story written in {target_language}.
+
+SUMMARY SO FAR:
+{previous_summary or "(the story has just started)"}
+
+NEW SCENES:
+{new_scenes}
+
+Update the summary so it also covers the new scenes.
+Keep every important character, item, place, problem and decision the child made.
+Write the summary in {target_language}, in plain prose, under 120 words.
+Do not add anything that did not happen in the story."""
+
+
+def format_compacted_story(summary: str, recent_scenes: list[str]) -> str:
+    """Format story context from the rolling summary and the most recent scenes"""
+    recent = "\n\n".join(recent_scenes)
+    return f"""(Summary of earlier events)
+{summary}
+
+(Most recent scenes)
+{recent}"""
+
+
+def get_structured_output_instructions(target_language: str) -> str:
+    """Instructions appended to story prompts when structured output is used"""
+    return f"""
+
+RESPONSE FORMAT:
+Respond with a JSON object instead of plain text:
+- "text": the scene itself in {target_language}, without the choices
+- "choices": the choices as separate strings, without numbers (empty list if the story ends)
+- "key_words": 1-2 words from "text", exactly as written there, useful for a child learning {target_language}
+- "growth_moment": the character growth sentences if the scene has them, otherwise null"""
+
+
 def get_quiz_prompt(
     target_language: str,
     native_language: str,
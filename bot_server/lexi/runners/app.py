@@ -15,6 +15,7 @@ from lexi.factory.telegram import setup_fastapi
 from lexi.runners.lifespan import emit_aiogram_shutdown
 from lexi.runners.polling import polling_lifespan, polling_startup
 from lexi.runners.webhook import webhook_shutdown, webhook_startup
+from lexi.services.update_scheduler import UpdateScheduler
 
 if TYPE_CHECKING:
     from lexi.config import AppConfig
@@ -58,6 +59,14 @@ def run_webhook(dispatcher: Dispatcher, bot: Bot, config: AppConfig) -> None:
         bot=bot,
         path=config.telegram.webhook_path,
         secret_token=config.telegram.webhook_secret.get_secret_value(),
+        scheduler=(
+            UpdateScheduler(config=config.update_scheduler)
+            if config.update_scheduler.is_enabled
+            else None
+        ),
+        reply_timeout=(
+            config.telegram.webhook_reply_timeout if config.telegram.reply_in_webhook else None
+        ),
     )
     app.state.tg_webhook_handler = handler
     app.include_router(handler.router)
@@ -0,0 +1,81 @@
+"""
+Trains the zstd dictionary used to compress Redis values.
+Run against a Redis with real traffic: ``python -m lexi.runners.compression``
+
+Values compressed with a dictionary can only be read with it, so a new dictionary
+should be deployed only once the values compressed with the old one have expired.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Final
+
+from redis.asyncio import Redis
+
+from lexi.config import AppConfig
+from lexi.factory import create_redis
+from lexi.utils.compression import PayloadCodec, train_dictionary
+from lexi.utils.logging import setup_logger
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Keys holding the JSON shapes worth compressing
+SAMPLE_PATTERNS: Final[tuple[str, ...]] = (
+    "cache:*",
+    "vocabulary:*",
+    "story_summary:*",
+    "story_speculation:*",
+    "story_session_segments:*",
+)
+MAX_SAMPLES_PER_PATTERN: Final[int] = 2000
+
+
+async def collect_samples(redis: Redis, codec: PayloadCodec) -> list[bytes]:
+    samples: list[bytes] = []
+    for pattern in SAMPLE_PATTERNS:
+        count = 0
+        async for key in redis.scan_iter(match=pattern, count=500):
+            key_type = (await redis.type(key)).decode()
+            if key_type == "string":
+                values = [await redis.get(key)]
+            elif key_type == "list":
+                values = await redis.lrange(key, 0, -1)
+            else:
+                continue
+            samples.extend(codec.decode(value) for value in values if value)
+            count += 1
+            if count >= MAX_SAMPLES_PER_PATTERN:
+                break
+    return samples
+
+
+async def train(config: AppConfig) -> None:
+    compression = config.redis.compression
+    if compression.dictionary_path is None:
+        raise RuntimeError("REDIS__COMPRESSION__DICTIONARY_PATH is not set")
+
+    redis: Redis = create_redis(config=config)
+    try:
+        samples = await collect_samples(redis, PayloadCodec(config=compression))
+    finally:
+        await redis.aclose()  # type: ignore
+
+    dictionary = train_dictionary(samples, size=compression.dictionary_size)
+    compression.dictionary_path.write_bytes(dictionary)
+    logger.info(
+        "Trained %d byte dictionary on %d samples, saved to %s",
+        len(dictionary),
+        len(samples),
+        compression.dictionary_path,
+    )
+
+
+def main() -> None:
+    setup_logger()
+    asyncio.run(train(AppConfig()))  # type: ignore
+
+
+if __name__ == "__main__":
+    main()
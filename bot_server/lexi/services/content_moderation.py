@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+from typing import TYPE_CHECKING, Final, Iterable, Optional
+
+from lexi.services.llm_gateway import LLMGateway
+from lexi.services.redis.repository import RedisRepository
+from lexi.utils.aho_corasick import AhoCorasick
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.content_moderation import ContentModerationConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+SPACES_PATTERN: Final[re.Pattern[str]] = re.compile(r"\s+")
+
+
+class ModerationAllowlistKey(StorageKey, prefix="moderation_allowlist"):
+    digest: str
+
+
+class ContentModerator:
+    """
+    Checks user provided story parameters.
+
+    Text is first matched against a local multi-language blocklist and a Redis allowlist
+    of previously approved phrases, each of which expires on its own. Only unknown text
+    goes to the moderation API, and concurrent requests are sent together as one list input.
+    """
+
+    config: ContentModerationConfig
+    redis_repo: RedisRepository
+    llm_gateway: LLMGateway
+    blocklist: AhoCorasick
+    _pending: list[tuple[str, asyncio.Future[bool]]]
+    _flush_handle: Optional[asyncio.TimerHandle]
+    _batches: set[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        config: ContentModerationConfig,
+        redis_repo: RedisRepository,
+        llm_gateway: LLMGateway,
+        blocklist: Iterable[str],
+    ) -> None:
+        self.config = config
+        self.redis_repo = redis_repo
+        self.llm_gateway = llm_gateway
+        self.blocklist = AhoCorasick(normalize(word) for word in blocklist)
+        self._pending = []
+        self._flush_handle = None
+        self._batches = set()
+
+    async def is_appropriate(self, text: str) -> bool:
+        """
+        :raises Exception: When the moderation API fails for unknown text
+        """
+        text = normalize(text)
+        if not text:
+            return True
+        if (word := self.blocklist.find(text)) is not None:
+            logger.info("Content blocked locally by %r", word)
+            return False
+        if await self._is_allowed(text):
+            return True
+
+        flagged = await self._submit(text)
+        if not flagged:
+            await self._allow(text)
+        return not flagged
+
+    async def _is_allowed(self, text: str) -> bool:
+        try:
+            return await self.redis_repo.exists(ModerationAllowlistKey(digest=_digest(text)))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to read moderation allowlist: %s", e)
+            return False
+
+    async def _allow(self, text: str) -> None:
+        key = ModerationAllowlistKey(digest=_digest(text))
+        try:
+            await self.redis_repo.client.set(key.pack(), 1, ex=self.config.allowlist_ttl)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to update moderation allowlist: %s", e)
+
+    def _submit(self, text: str) -> asyncio.Future[bool]:
+        """Queue the text for the next batched API call"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.config.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._moderate(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _moderate(self, batch: list[tuple[str, asyncio.Future[bool]]]) -> None:
+        # Equal inputs of a batch are sent once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            response = await self.llm_gateway.moderate(text=texts, model=self.config.model)
+            flagged = {
+                text: result.flagged for text, result in zip(texts, response.results, strict=True)
+            }
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, future in batch:
+            if not future.done():
+                future.set_result(flagged[text])
+
+
+def normalize(text: str) -> str:
+    return SPACES_PATTERN.sub(" ", text.casefold()).strip()
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
@@ -3,20 +3,24 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from lexi.config import AppConfig
 from lexi.services.base import BaseService
+from lexi.utils.compression import PayloadCodec
 
 
 class CrudService(BaseService):
     session_pool: async_sessionmaker[AsyncSession]
     redis: Redis
     config: AppConfig
+    codec: PayloadCodec
 
     def __init__(
         self,
         session_pool: async_sessionmaker[AsyncSession],
         redis: Redis,
         config: AppConfig,
+        codec: PayloadCodec,
     ) -> None:
         super().__init__()
         self.session_pool = session_pool
         self.redis = redis
         self.config = config
+        self.codec = codec
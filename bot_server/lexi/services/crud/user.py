@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Optional
 
 from aiogram.types import User as AiogramUser
@@ -5,38 +6,113 @@ from aiogram_i18n.cores import BaseCore
 
 from lexi.const import DEFAULT_LOCALE, TIME_1M
 from lexi.models.dto.user import UserDto
-from lexi.models.sql import User
 from lexi.services.crud.base import CrudService
+from lexi.services.crud.user_cache import LocalUserCache
 from lexi.services.postgres import SQLSessionContext
-from lexi.services.redis import redis_cache
+from lexi.services.redis import read_cache, redis_cache, single_flight, write_cache
 from lexi.utils.key_builder import build_key
+from lexi.utils.logging import database as logger
 
 
 class UserService(CrudService):
+    local_cache: Optional[LocalUserCache]
+    _upserts: dict[str, asyncio.Task[Any]]
+
+    def __init__(
+        self, *args: Any, local_cache: Optional[LocalUserCache] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.local_cache = local_cache
+        self._upserts = {}
+
     async def clear_cache(self, user_id: int) -> None:
-        cache_key: str = build_key("cache", "get_user", user_id=user_id)
-        await self.redis.delete(cache_key)
-
-    async def create(self, aiogram_user: AiogramUser, i18n_core: BaseCore[Any]) -> UserDto:
-        db_user: User = User(
-            id=aiogram_user.id,
-            name=aiogram_user.full_name,
-            language=(
-                aiogram_user.language_code
-                if aiogram_user.language_code in i18n_core.available_locales
-                else DEFAULT_LOCALE
-            ),
-            language_code=aiogram_user.language_code,
+        await self.redis.delete(self._cache_key(user_id))
+        if self.local_cache is not None:
+            await self.local_cache.invalidate(user_id)
+
+    async def _write_through(self, user: UserDto) -> None:
+        """Replace cached copies of the user instead of dropping them"""
+        await write_cache(self, self._cache_key(user.id), user, ttl=TIME_1M)
+        if self.local_cache is not None:
+            # Other processes drop their copy and load the new one from Redis
+            await self.local_cache.replace(user)
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return build_key("cache", "get_user", user_id=user_id)
+
+    async def get_or_create(self, aiogram_user: AiogramUser, i18n_core: BaseCore[Any]) -> UserDto:
+        """
+        Cached user. When it is not cached or its Telegram name changed, the user is
+        written with a single upsert, without reading it from Postgres first.
+        Concurrent upserts of the same user in a process share one query.
+        """
+        user = await self._get_cached_only(aiogram_user.id)
+        if user is not None and user.name == aiogram_user.full_name:
+            return user
+
+        user = await asyncio.shield(
+            single_flight(
+                self._upserts, str(aiogram_user.id), lambda: self._upsert(aiogram_user, i18n_core)
+            )
         )
+        # Handlers change users in place before saving them
+        return user.model_copy(deep=True)
 
-        async with SQLSessionContext(session_pool=self.session_pool) as (_, uow):
-            await uow.commit(db_user)
+    async def _get_cached_only(self, user_id: int) -> Optional[UserDto]:
+        """User from the local or the Redis cache, ``None`` on a miss of both"""
+        if self.local_cache is None:
+            return await read_cache(self, self._cache_key(user_id), Optional[UserDto])
+        user = self.local_cache.get(user_id)
+        if user is not None:
+            return user
+        version = self.local_cache.version
+        user = await read_cache(self, self._cache_key(user_id), Optional[UserDto])
+        if user is None:
+            self.local_cache.record_load()
+        else:
+            self.local_cache.set(user, version)
+        return user
 
-        await self.clear_cache(user_id=aiogram_user.id)
-        return db_user.dto()
+    async def _upsert(self, aiogram_user: AiogramUser, i18n_core: BaseCore[Any]) -> UserDto:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
+            db_user = await repository.users.upsert(
+                refresh=("name",),
+                id=aiogram_user.id,
+                name=aiogram_user.full_name,
+                language=(
+                    aiogram_user.language_code
+                    if aiogram_user.language_code in i18n_core.available_locales
+                    else DEFAULT_LOCALE
+                ),
+                language_code=aiogram_user.language_code,
+            )
+            user = db_user.dto()
+        # Both timestamps come from the same transaction only for an inserted row
+        if db_user.created_at == db_user.updated_at:
+            logger.info("New user in database: %s (%d)", user.name, user.id)
+        await self._write_through(user)
+        return user
 
-    @redis_cache(prefix="get_user", ttl=TIME_1M)
     async def get(self, user_id: int) -> Optional[UserDto]:
+        if self.local_cache is None:
+            return await self._get_cached(user_id=user_id)
+        user = self.local_cache.get(user_id)
+        if user is not None:
+            return user
+        version = self.local_cache.version
+        user = await self._get_cached(user_id=user_id)
+        if user is not None:
+            self.local_cache.set(user, version)
+        return user
+
+    # Unknown users are cached too, creating a user overwrites the entry
+    @redis_cache(
+        prefix="get_user", ttl=TIME_1M, negative_ttl=TIME_1M, lock_timeout=5.0, early_refresh=1.0
+    )
+    async def _get_cached(self, user_id: int) -> Optional[UserDto]:
+        if self.local_cache is not None:
+            self.local_cache.record_load()
         async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
             user = await repository.users.get(user_id=user_id)
             if user is None:
@@ -63,5 +139,5 @@ class UserService(CrudService):
                 await self.clear_cache(user_id=user.id)
                 return None
             updated_user = user_db.dto()
-            await self.clear_cache(user_id=user.id)
-            return updated_user
+        await self._write_through(updated_user)
+        return updated_user
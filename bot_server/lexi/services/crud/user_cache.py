@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Final, Optional
+
+from redis.asyncio import Redis
+
+from lexi.models.dto.redis import CacheTierStats
+from lexi.models.dto.user import UserDto
+from lexi.utils.key_builder import StorageKey
+from lexi.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from lexi.config.env.user_cache import UserCacheConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+RESUBSCRIBE_DELAY: Final[float] = 1.0
+
+
+class UserCacheChannelKey(StorageKey, prefix="user_cache_invalidation"):
+    """Pub/sub channel carrying ids of users whose cached data changed and the sender"""
+
+
+class LocalUserCache:
+    """
+    In-process cache of users in front of the Redis cache of ``UserService.get``.
+
+    Writers publish the user id over Redis pub/sub, so that every other bot process
+    drops its copy. Entries also expire after ``ttl`` in case a message is lost, and the
+    whole cache is dropped when the subscription has to be restored.
+    """
+
+    config: UserCacheConfig
+    redis: Redis
+    _entries: TTLCache[int, UserDto]
+    _stats: dict[str, int]
+    _version: int
+    _origin: str
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(self, config: UserCacheConfig, redis: Redis) -> None:
+        self.config = config
+        self.redis = redis
+        self._entries = TTLCache(max_size=config.max_size, ttl=config.ttl)
+        self._stats = {"local_hits": 0, "local_misses": 0, "loads": 0}
+        self._version = 0
+        # Tells apart the invalidations sent by this process, which are applied already
+        self._origin = secrets.token_hex(8)
+        self._task = None
+
+    @property
+    def version(self) -> int:
+        """Changes on every invalidation, read it before loading a user to :meth:`set` it"""
+        return self._version
+
+    def get(self, user_id: int) -> Optional[UserDto]:
+        user = self._entries.get(user_id)
+        if user is None:
+            self._stats["local_misses"] += 1
+            return None
+        self._stats["local_hits"] += 1
+        # Handlers change users in place before saving them
+        return user.model_copy(deep=True)
+
+    def set(self, user: UserDto, version: int) -> None:
+        # An invalidation that arrived during the load may be about this very user
+        if version == self._version:
+            self._entries.set(user.id, user.model_copy(deep=True))
+
+    def record_load(self) -> None:
+        """Count a user read from Postgres, i.e. a miss of the Redis tier"""
+        self._stats["loads"] += 1
+
+    async def invalidate(self, user_id: int) -> None:
+        self._drop(user_id)
+        await self._publish(user_id)
+
+    async def replace(self, user: UserDto) -> None:
+        """Cache a user that was just written, other processes drop their copy"""
+        self._drop(user.id)
+        self.set(user, self._version)
+        await self._publish(user.id)
+
+    def get_stats(self) -> list[CacheTierStats]:
+        local_misses = self._stats["local_misses"]
+        loads = min(self._stats["loads"], local_misses)
+        return [
+            _tier_stats("local", hits=self._stats["local_hits"], misses=local_misses),
+            _tier_stats("redis", hits=local_misses - loads, misses=loads),
+        ]
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(UserCacheChannelKey.build())
+                # Invalidations sent while unsubscribed are lost
+                self._entries.clear()
+                self._version += 1
+                async for message in pubsub.listen():
+                    self._on_message(message)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("User cache invalidation channel failed: %s", e)
+            finally:
+                await pubsub.aclose()  # type: ignore[attr-defined]
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def _publish(self, user_id: int) -> None:
+        try:
+            await self.redis.publish(UserCacheChannelKey.build(), f"{user_id}:{self._origin}")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to broadcast user cache invalidation: %s", e)
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        data = message["data"]
+        user_id, _, origin = (data.decode() if isinstance(data, bytes) else data).partition(":")
+        if origin == self._origin:
+            return
+        try:
+            self._drop(int(user_id))
+        except ValueError:
+            logger.warning("Malformed user cache invalidation: %r", data)
+
+    def _drop(self, user_id: int) -> None:
+        self._entries.pop(user_id)
+        self._version += 1
+
+
+def _tier_stats(tier: str, hits: int, misses: int) -> CacheTierStats:
+    total = hits + misses
+    return CacheTierStats(
+        tier=tier, hits=hits, misses=misses, hit_ratio=hits / total if total else 0.0
+    )
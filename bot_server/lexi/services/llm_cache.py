@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Final, Optional, TypeVar
+
+from msgspec.json import Encoder
+
+from lexi.services.redis.repository import RedisRepository
+from lexi.services.redis.serializers import Serializer
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.llm_cache import LLMCacheConfig
+
+T = TypeVar("T")
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+params_encoder: Final[Encoder] = Encoder(order="sorted")
+
+
+class LLMCacheKey(StorageKey, prefix="llm_cache"):
+    call_type: str
+    digest: str
+
+
+class LLMCacheIndexKey(StorageKey, prefix="llm_cache_index"):
+    pass
+
+
+class LLMCacheStatsKey(StorageKey, prefix="llm_cache_stats"):
+    pass
+
+
+class LLMResponseCache:
+    """
+    Caches responses of deterministic LLM calls in Redis.
+
+    Entries are keyed by a hash of the request (model, messages and sampling params)
+    and expire after a per-call-type TTL. A sorted set of cached keys ordered by last
+    access keeps the cache below ``max_entries``, evicting the least recently used.
+    Calls sampled with a high temperature bypass the cache.
+    """
+
+    config: LLMCacheConfig
+    redis_repo: RedisRepository
+
+    def __init__(self, config: LLMCacheConfig, redis_repo: RedisRepository) -> None:
+        self.config = config
+        self.redis_repo = redis_repo
+
+    async def get_or_fetch(
+        self,
+        call_type: str,
+        params: dict[str, Any],
+        fetch: Callable[[], Awaitable[T]],
+        validator: type[T],
+    ) -> T:
+        """
+        Return the cached response for the request or fetch and cache it.
+        :param params: Everything that defines the response: model, messages, sampling params
+        :param fetch: Performs the actual call, failures are propagated and never cached
+        """
+        if not self._is_cacheable(params):
+            return await fetch()
+
+        key = self._get_key(call_type, params)
+        try:
+            cached = await self._get(key, validator)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to read LLM cache: %s", e)
+            return await fetch()
+        if cached is not None:
+            await self._track("hits")
+            return cached
+
+        result = await fetch()
+        try:
+            await self._set(key, call_type, result)
+            await self._track("misses")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to write LLM cache: %s", e)
+        return result
+
+    def _is_cacheable(self, params: dict[str, Any]) -> bool:
+        if not self.config.is_enabled or params.get("stream"):
+            return False
+        return float(params.get("temperature", 1.0)) <= self.config.max_temperature
+
+    def _get_key(self, call_type: str, params: dict[str, Any]) -> LLMCacheKey:
+        digest = hashlib.sha256(params_encoder.encode(params)).hexdigest()
+        return LLMCacheKey(call_type=call_type, digest=digest)
+
+    async def _get(self, key: LLMCacheKey, validator: type[T]) -> Optional[T]:
+        packed = key.pack()
+        value: Any = await self.redis_repo.client.get(packed)
+        if value is None:
+            return None
+        # Refresh recency so frequently used entries survive eviction
+        await self.redis_repo.client.zadd(LLMCacheIndexKey.build(), {packed: time.time()})
+        serializer: Serializer[T] = self.redis_repo.serializers.get(validator)
+        return serializer.decode(self.redis_repo.codec.decode(value))
+
+    async def _set(self, key: LLMCacheKey, call_type: str, value: Any) -> None:
+        packed = key.pack()
+        index = LLMCacheIndexKey.build()
+        ttl = self.config.ttls.get(call_type, self.config.default_ttl)
+        async with self.redis_repo.client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                packed,
+                self.redis_repo.codec.encode(self.redis_repo.serializers.encode(value)),
+                ex=ttl,
+            )
+            pipe.zadd(index, {packed: time.time()})
+            pipe.zcard(index)
+            *_, size = await pipe.execute()
+
+        overflow = int(size) - self.config.max_entries
+        if overflow <= 0:
+            return
+        evicted = await self.redis_repo.client.zpopmin(index, overflow)
+        if evicted:
+            await self.redis_repo.client.delete(*(member for member, _ in evicted))
+
+    async def _track(self, counter: str) -> None:
+        try:
+            await self.redis_repo.increment(LLMCacheStatsKey(), field=counter)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to update LLM cache stats: %s", e)
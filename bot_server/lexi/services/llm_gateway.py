@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Final,
+    Optional,
+    TypeVar,
+)
+
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+    Timeout,
+)
+from openai.types import ModerationCreateResponse
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from lexi.errors.llm import LLMOverloadedError
+from lexi.models.dto.llm import LLMModelStats
+from lexi.services.llm_hedging import HedgingPolicy
+
+if TYPE_CHECKING:
+    from lexi.config import AppConfig
+    from lexi.config.env.llm_gateway import LLMGatewayConfig
+
+T = TypeVar("T")
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS: Final = (APIConnectionError, RateLimitError, InternalServerError)
+
+
+class _ModelStats:
+    __slots__ = (
+        "requests",
+        "retries",
+        "failures",
+        "in_flight",
+        "queued",
+        "queue_wait_total",
+        "queue_wait_max",
+        "generation_total",
+        "generation_max",
+    )
+
+    def __init__(self) -> None:
+        self.requests = self.retries = self.failures = self.in_flight = self.queued = 0
+        self.queue_wait_total = self.queue_wait_max = 0.0
+        self.generation_total = self.generation_max = 0.0
+
+    def to_dto(self, model: str) -> LLMModelStats:
+        return LLMModelStats(
+            model=model,
+            requests=self.requests,
+            retries=self.retries,
+            failures=self.failures,
+            in_flight=self.in_flight,
+            queued=self.queued,
+            queue_wait_avg=self.queue_wait_total / self.requests if self.requests else 0.0,
+            queue_wait_max=self.queue_wait_max,
+            generation_avg=self.generation_total / self.requests if self.requests else 0.0,
+            generation_max=self.generation_max,
+        )
+
+
+class LLMGateway:
+    """
+    Single entry point for OpenAI calls.
+
+    All clients share one keep-alive connection pool. In-flight requests are capped per
+    model, requests over the cap wait in a queue (up to ``queue_timeout``). Rate limits,
+    connection errors and 5xx responses are retried with jittered exponential backoff,
+    honouring ``Retry-After``. Queue wait and generation time are tracked per model.
+    Latency sensitive calls can be hedged, see :class:`HedgingPolicy`.
+    """
+
+    config: LLMGatewayConfig
+    http_client: httpx.AsyncClient
+    client: AsyncOpenAI
+    moderation_client: AsyncOpenAI
+    hedging: Optional[HedgingPolicy]
+    _semaphores: dict[str, asyncio.Semaphore]
+    _stats: dict[str, _ModelStats]
+
+    def __init__(self, config: AppConfig) -> None:
+        self.config = config.llm_gateway
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            timeout=Timeout(self.config.read_timeout, connect=self.config.connect_timeout),
+        )
+        # Retries are done here, so that they are counted against the concurrency limit
+        self.client = AsyncOpenAI(
+            api_key=config.story_teller.openai.api_key.get_secret_value(),
+            base_url=self.config.base_url,
+            http_client=self.http_client,
+            max_retries=0,
+        )
+        self.moderation_client = AsyncOpenAI(
+            api_key=config.content_moderation.openai_api_key.get_secret_value(),
+            base_url=self.config.base_url,
+            http_client=self.http_client,
+            max_retries=0,
+        )
+        self.hedging = None
+        if self.config.hedging.is_enabled:
+            self.hedging = HedgingPolicy(config=self.config.hedging)
+        self._semaphores = {}
+        self._stats = {}
+
+    async def complete(self, hedge: bool = False, **params: Any) -> ChatCompletion:
+        """
+        Chat completion, accepts the ``chat.completions.create`` parameters.
+        :param hedge: Race a backup request when the response is unusually slow
+        """
+        if not hedge or self.hedging is None:
+            return await self._complete(**params)
+        return await self.hedging.run(
+            key=f"{params['model']}:complete",
+            model=params["model"],
+            start=lambda model: self._complete(**{**params, "model": model}),
+        )
+
+    async def stream(
+        self, hedge: bool = False, **params: Any
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """
+        Streamed chat completion, the slot is held until the stream is consumed.
+        :param hedge: Race a backup request when the first token is unusually slow
+        """
+        if not hedge or self.hedging is None:
+            async for chunk in self._stream(**params):
+                yield chunk
+            return
+
+        first_chunk, stream = await self.hedging.run(
+            key=f"{params['model']}:stream",
+            model=params["model"],
+            start=lambda model: self._open_stream(**{**params, "model": model}),
+            discard=lambda opened: opened[1].aclose(),
+        )
+        try:
+            yield first_chunk
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _open_stream(
+        self, **params: Any
+    ) -> tuple[ChatCompletionChunk, AsyncGenerator[ChatCompletionChunk, None]]:
+        """Start a stream and wait for its first chunk"""
+        stream = self._stream(**params)
+        try:
+            return await anext(stream), stream
+        except BaseException:
+            await stream.aclose()
+            raise
+
+    async def _complete(self, **params: Any) -> ChatCompletion:
+        async with self._slot(params["model"]) as stats:
+            started_at = time.monotonic()
+            try:
+                return await self._with_retries(
+                    stats, lambda: self.client.chat.completions.create(**params)
+                )
+            finally:
+                self._track_generation(stats, time.monotonic() - started_at)
+
+    async def _stream(self, **params: Any) -> AsyncGenerator[ChatCompletionChunk, None]:
+        async with self._slot(params["model"]) as stats:
+            started_at = time.monotonic()
+            try:
+                response = await self._with_retries(
+                    stats, lambda: self.client.chat.completions.create(**params, stream=True)
+                )
+                async for chunk in response:
+                    yield chunk
+            finally:
+                self._track_generation(stats, time.monotonic() - started_at)
+
+    async def moderate(self, text: str | list[str], model: str) -> ModerationCreateResponse:
+        """Moderation check, a list of inputs is checked in a single request"""
+        async with self._slot(model) as stats:
+            started_at = time.monotonic()
+            try:
+                return await self._with_retries(
+                    stats,
+                    lambda: self.moderation_client.moderations.create(model=model, input=text),
+                )
+            finally:
+                self._track_generation(stats, time.monotonic() - started_at)
+
+    def get_stats(self) -> list[LLMModelStats]:
+        return [stats.to_dto(model) for model, stats in self._stats.items()]
+
+    async def close(self) -> None:
+        await self.http_client.aclose()
+
+    @asynccontextmanager
+    async def _slot(self, model: str) -> AsyncIterator[_ModelStats]:
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            limit = self.config.model_concurrency.get(model, self.config.default_concurrency)
+            semaphore = self._semaphores[model] = asyncio.Semaphore(limit)
+        stats = self._stats.setdefault(model, _ModelStats())
+
+        queued_at = time.monotonic()
+        stats.queued += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.config.queue_timeout)
+        except asyncio.TimeoutError as e:
+            stats.failures += 1
+            raise LLMOverloadedError(f"No free {model} slot in {self.config.queue_timeout}s") from e
+        finally:
+            stats.queued -= 1
+
+        queue_wait = time.monotonic() - queued_at
+        stats.requests += 1
+        stats.queue_wait_total += queue_wait
+        stats.queue_wait_max = max(stats.queue_wait_max, queue_wait)
+        stats.in_flight += 1
+        try:
+            yield stats
+        finally:
+            stats.in_flight -= 1
+            semaphore.release()
+
+    async def _with_retries(self, stats: _ModelStats, call: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.config.max_retries:
+                    stats.failures += 1
+                    raise
+                delay = self._get_retry_delay(e, attempt)
+                logger.warning("LLM request failed (%s), retrying in %.2fs", e, delay)
+                stats.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception:
+                stats.failures += 1
+                raise
+
+    def _get_retry_delay(self, error: Exception, attempt: int) -> float:
+        # Full jitter keeps a burst of throttled requests from retrying in lockstep
+        delay = random.uniform(0, self.config.retry_base_delay * 2**attempt)
+        retry_after = _parse_retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.config.retry_max_delay)
+
+    @staticmethod
+    def _track_generation(stats: _ModelStats, duration: float) -> None:
+        stats.generation_total += duration
+        stats.generation_max = max(stats.generation_max, duration)
+
+
+def _parse_retry_after(error: Exception) -> Optional[float]:
+    if not isinstance(error, APIStatusError):
+        return None
+    headers = error.response.headers
+    value = headers.get("retry-after-ms")
+    try:
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except ValueError:
+        # HTTP-date form is not used by the API
+        return None
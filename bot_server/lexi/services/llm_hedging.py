@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Final, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from lexi.config.env.llm_gateway import HedgingConfig
+
+T = TypeVar("T")
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies"""
+
+    _samples: deque[float]
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, window: int) -> None:
+        self._samples = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * percentile), len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """
+    Token bucket that keeps hedges below a share of all requests.
+    Every request adds ``ratio`` tokens, every hedge takes one.
+    """
+
+    ratio: float
+    burst: float
+    _tokens: float
+
+    __slots__ = ("ratio", "burst", "_tokens")
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    def on_request(self) -> None:
+        self._tokens = min(self._tokens + self.ratio, self.burst)
+
+    def try_acquire(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class HedgingPolicy:
+    """
+    Fires a backup request when the primary has not produced its first token
+    within a latency percentile observed for the model, and keeps the faster one.
+    """
+
+    config: HedgingConfig
+    budget: HedgeBudget
+    _trackers: dict[str, LatencyTracker]
+
+    def __init__(self, config: HedgingConfig) -> None:
+        self.config = config
+        self.budget = HedgeBudget(ratio=config.max_hedge_ratio, burst=config.burst)
+        self._trackers = {}
+
+    def get_delay(self, key: str) -> float:
+        """How long to wait for the primary before hedging"""
+        tracker = self._trackers.get(key)
+        if tracker is None or len(tracker) < self.config.min_samples:
+            return self.config.max_delay
+        delay = tracker.percentile(self.config.percentile)
+        return min(max(delay, self.config.min_delay), self.config.max_delay)
+
+    async def run(
+        self,
+        key: str,
+        model: str,
+        start: Callable[[str], Coroutine[Any, Any, T]],
+        discard: Optional[Callable[[T], Awaitable[Any]]] = None,
+    ) -> T:
+        """
+        :param key: Latency bucket, e.g. model and call kind
+        :param start: Starts a request to the given model and returns once its first token arrived
+        :param discard: Releases the result of the losing request
+        """
+        self.budget.on_request()
+        started_at = time.monotonic()
+        tasks: list[asyncio.Task[T]] = [asyncio.create_task(start(model))]
+        try:
+            winner = await self._race(key, model, start, tasks)
+        finally:
+            # Also stops the requests when the caller is cancelled
+            for task in tasks:
+                task.cancel()
+        for task in tasks:
+            if task is winner:
+                continue
+            await asyncio.wait([task])
+            if discard is not None and not task.cancelled() and task.exception() is None:
+                await discard(task.result())
+        self._track(key, started_at)
+        return winner.result()
+
+    async def _race(
+        self,
+        key: str,
+        model: str,
+        start: Callable[[str], Coroutine[Any, Any, T]],
+        tasks: list[asyncio.Task[T]],
+    ) -> asyncio.Task[T]:
+        """:return: Task with the result to use, a backup request is appended to ``tasks``"""
+        primary = tasks[0]
+        done, _ = await asyncio.wait([primary], timeout=self.get_delay(key))
+        if done or not self.budget.try_acquire():
+            await asyncio.wait([primary])
+            return primary
+
+        fallback_model = self.config.fallback_model or model
+        logger.info("Hedging slow %s request with %s", model, fallback_model)
+        tasks.append(asyncio.create_task(start(fallback_model)))
+        return await _first_successful(tasks)
+
+    def _track(self, key: str, started_at: float) -> None:
+        tracker = self._trackers.setdefault(key, LatencyTracker(self.config.window))
+        tracker.add(time.monotonic() - started_at)
+
+
+async def _first_successful(tasks: list[asyncio.Task[T]]) -> asyncio.Task[T]:
+    """First task that finished without an error, the last error is raised if all fail"""
+    pending = set(tasks)
+    while True:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task
+        if not pending:
+            # Every request failed, report the original one
+            return tasks[0]
@@ -1,5 +1,5 @@
-from .context import SQLSessionContext
+from .context import SharedSQLSession, SQLSessionContext, shared_sql_session
 from .repositories import Repository
 from .uow import UoW
 
-__all__ = ["Repository", "UoW", "SQLSessionContext"]
+__all__ = ["Repository", "UoW", "SharedSQLSession", "SQLSessionContext", "shared_sql_session"]
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import asyncio
+from contextvars import ContextVar
 from types import TracebackType
-from typing import Optional
+from typing import Final, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -8,18 +11,117 @@ from .repositories import Repository
 from .uow import UoW
 
 
+class SharedSQLSession:
+    """
+    One session for all queries of an update, opened on first use.
+
+    Only the task that created it uses it, other tasks open their own sessions. The
+    connection stays checked out between consecutive queries and is returned to the pool
+    once the update has not queried for ``idle_timeout`` seconds, e.g. while it waits for
+    the LLM. Changes left uncommitted are discarded then, as with a session of its own.
+    """
+
+    _session_pool: async_sessionmaker[AsyncSession]
+    _idle_timeout: float
+    _session: Optional[AsyncSession]
+    _owner: Optional[asyncio.Task[object]]
+    _lock: asyncio.Lock
+    _depth: int
+    _release_handle: Optional[asyncio.TimerHandle]
+    _release_task: Optional[asyncio.Task[None]]
+    _closed: bool
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        idle_timeout: float,
+    ) -> None:
+        self._session_pool = session_pool
+        self._idle_timeout = idle_timeout
+        self._session = None
+        self._owner = asyncio.current_task()
+        self._lock = asyncio.Lock()
+        self._depth = 0
+        self._release_handle = None
+        self._release_task = None
+        self._closed = False
+
+    @property
+    def is_available(self) -> bool:
+        return not self._closed and asyncio.current_task() is self._owner
+
+    async def acquire(self) -> AsyncSession:
+        # Nested contexts of the owner task already hold the lock
+        if self._depth == 0:
+            self._cancel_release()
+            await self._lock.acquire()
+        self._depth += 1
+        if self._session is None:
+            self._session = self._session_pool()
+        return self._session
+
+    async def release(self, failed: bool) -> None:
+        self._depth -= 1
+        if self._depth or self._session is None:
+            return
+        try:
+            if failed:
+                await self._session.rollback()
+            # Objects are detached as they would be by closing a session of their own
+            self._session.expunge_all()
+        finally:
+            self._lock.release()
+        self._release_handle = asyncio.get_running_loop().call_later(
+            self._idle_timeout, self._schedule_release
+        )
+
+    async def close(self) -> None:
+        self._closed = True
+        self._cancel_release()
+        async with self._lock:
+            if self._session is not None:
+                await asyncio.shield(self._session.close())
+                self._session = None
+
+    def _schedule_release(self) -> None:
+        self._release_handle = None
+        self._release_task = asyncio.create_task(self._release_connection())
+
+    async def _release_connection(self) -> None:
+        async with self._lock:
+            if self._session is not None and self._session.in_transaction():
+                await self._session.rollback()
+
+    def _cancel_release(self) -> None:
+        if self._release_handle is not None:
+            self._release_handle.cancel()
+            self._release_handle = None
+
+
+shared_sql_session: Final[ContextVar[Optional[SharedSQLSession]]] = ContextVar(
+    "shared_sql_session", default=None
+)
+
+
 class SQLSessionContext:
     _session_pool: async_sessionmaker[AsyncSession]
     _session: Optional[AsyncSession]
+    _shared: Optional[SharedSQLSession]
 
-    __slots__ = ("_session_pool", "_session")
+    __slots__ = ("_session_pool", "_session", "_shared")
 
     def __init__(self, session_pool: async_sessionmaker[AsyncSession]) -> None:
         self._session_pool = session_pool
         self._session = None
+        self._shared = None
 
     async def __aenter__(self) -> tuple[Repository, UoW]:
-        self._session = await self._session_pool().__aenter__()
+        shared = shared_sql_session.get()
+        if shared is not None and shared.is_available:
+            self._shared = shared
+            self._session = await shared.acquire()
+        else:
+            self._session = await self._session_pool().__aenter__()
         return Repository(session=self._session), UoW(session=self._session)
 
     async def __aexit__(
@@ -30,6 +132,10 @@ class SQLSessionContext:
     ) -> None:
         if self._session is None:
             return
-        task: asyncio.Task[None] = asyncio.create_task(self._session.close())
-        await asyncio.shield(task)
+        if self._shared is not None:
+            await self._shared.release(failed=exc_type is not None)
+            self._shared = None
+        else:
+            task: asyncio.Task[None] = asyncio.create_task(self._session.close())
+            await asyncio.shield(task)
         self._session = None
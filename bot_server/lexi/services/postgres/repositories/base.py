@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Optional, TypeVar, Union, cast
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, TypeVar, Union, cast
 
 from sqlalchemy import ColumnExpressionArgument, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -56,6 +57,33 @@ class BaseRepository:
         await self.session.commit()
         return result.scalar_one_or_none() if load_result else None
 
+    @asynccontextmanager
+    async def _copy_transaction(self) -> AsyncIterator[Any]:
+        """
+        Driver connection for :meth:`_copy` inside a transaction of its own.
+        COPY bypasses the SQLAlchemy adapter, which only begins its transaction lazily
+        on the first statement, so the adapter would not roll it back.
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+        async with driver_connection.transaction():
+            yield driver_connection
+
+    @staticmethod
+    async def _copy(
+        driver_connection: Any,
+        model: type[Any],
+        columns: tuple[str, ...],
+        records: list[tuple[Any, ...]],
+    ) -> None:
+        """Bulk insert with COPY on a connection from :meth:`_copy_transaction`"""
+        if not records:
+            return
+        await driver_connection.copy_records_to_table(
+            model.__tablename__, records=records, columns=columns
+        )
+
     async def _delete(
         self,
         model: ColumnClauseType[T],
@@ -3,12 +3,18 @@ from __future__ import annotations
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseRepository
+from .stories import StoriesRepository
+from .story_archives import StoryArchivesRepository
 from .users import UsersRepository
 
 
 class Repository(BaseRepository):
     users: UsersRepository
+    stories: StoriesRepository
+    story_archives: StoryArchivesRepository
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session=session)
         self.users = UsersRepository(session=session)
+        self.stories = StoriesRepository(session=session)
+        self.story_archives = StoryArchivesRepository(session=session)
@@ -0,0 +1,58 @@
+from typing import Any, Final
+from uuid import UUID
+
+from sqlalchemy import select
+
+from lexi.models.sql import Story, StoryKeyWord, StorySegment
+from lexi.services.postgres.repositories.base import BaseRepository
+
+STORY_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "user_id",
+    "target_language_code",
+    "native_language_code",
+    "protagonist",
+    "setting",
+    "model",
+    "turn_count",
+    "started_at",
+    "finished_at",
+)
+STORY_SEGMENT_COLUMNS: Final[tuple[str, ...]] = ("story_id", "position", "text", "chosen_choice")
+STORY_KEY_WORD_COLUMNS: Final[tuple[str, ...]] = ("story_id", "word", "user_id", "language_code")
+
+
+# noinspection PyTypeChecker
+class StoriesRepository(BaseRepository):
+    async def copy(
+        self,
+        stories: list[tuple[Any, ...]],
+        segments: list[tuple[Any, ...]],
+        key_words: list[tuple[Any, ...]],
+    ) -> None:
+        """Write finished stories in one transaction, records follow the ``*_COLUMNS`` order"""
+        async with self._copy_transaction() as connection:
+            await self._copy(connection, Story, STORY_COLUMNS, stories)
+            await self._copy(connection, StorySegment, STORY_SEGMENT_COLUMNS, segments)
+            await self._copy(connection, StoryKeyWord, STORY_KEY_WORD_COLUMNS, key_words)
+        await self.session.commit()
+
+    async def get_history(self, user_id: int, limit: int = 20) -> list[Story]:
+        """Latest finished stories of the user"""
+        return list(
+            await self.session.scalars(
+                select(Story)
+                .where(Story.user_id == user_id)
+                .order_by(Story.finished_at.desc())
+                .limit(limit)
+            )
+        )
+
+    async def get_segments(self, story_id: UUID) -> list[StorySegment]:
+        return list(
+            await self.session.scalars(
+                select(StorySegment)
+                .where(StorySegment.story_id == story_id)
+                .order_by(StorySegment.position)
+            )
+        )
@@ -0,0 +1,52 @@
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from lexi.enums.story import StorySessionStatus
+from lexi.models.sql import StorySessionArchive
+from lexi.services.postgres.repositories.base import BaseRepository
+
+
+# noinspection PyTypeChecker
+class StoryArchivesRepository(BaseRepository):
+    async def upsert_many(self, rows: list[dict[str, Any]]) -> None:
+        """Insert archived sessions, replacing earlier archives of the same story"""
+        if not rows:
+            return
+        query = insert(StorySessionArchive).values(rows)
+        query = query.on_conflict_do_update(
+            index_elements=[StorySessionArchive.user_id, StorySessionArchive.started_at],
+            set_={
+                "status": query.excluded.status,
+                "last_active_at": query.excluded.last_active_at,
+                "session": query.excluded.session,
+            },
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def get_latest_abandoned(self, user_id: int) -> Optional[StorySessionArchive]:
+        return await self.session.scalar(
+            select(StorySessionArchive)
+            .where(
+                StorySessionArchive.user_id == user_id,
+                StorySessionArchive.status == StorySessionStatus.ABANDONED,
+            )
+            .order_by(StorySessionArchive.started_at.desc())
+            .limit(1)
+        )
+
+    async def delete(self, user_id: int, status: StorySessionStatus) -> bool:
+        return await self._delete(
+            StorySessionArchive,
+            StorySessionArchive.user_id == user_id,
+            StorySessionArchive.status == status,
+        )
+
+    async def delete_many(self, user_ids: list[int], status: StorySessionStatus) -> bool:
+        return await self._delete(
+            StorySessionArchive,
+            StorySessionArchive.user_id.in_(user_ids),
+            StorySessionArchive.status == status,
+        )
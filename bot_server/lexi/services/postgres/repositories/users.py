@@ -1,9 +1,11 @@
 from typing import Any, Optional, cast
 
-from sqlalchemy import select
+from sqlalchemy import false, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.functions import count
 
 from lexi.models.sql import User
+from lexi.models.sql.mixins.timestamp import NowFunc
 from lexi.services.postgres.repositories.base import BaseRepository
 
 
@@ -12,6 +14,32 @@ class UsersRepository(BaseRepository):
     async def get(self, user_id: int) -> Optional[User]:
         return await self._get(User, User.id == user_id)
 
+    async def upsert(self, refresh: tuple[str, ...] = (), **data: Any) -> User:
+        """
+        Insert the user or, if it exists, overwrite the ``refresh`` fields.
+        An existing row is only written when one of them actually changed.
+
+        :return: The stored user
+        """
+        query = insert(User).values(**data)
+        query = query.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={**{field: query.excluded[field] for field in refresh}, "updated_at": NowFunc},
+            where=or_(
+                false(),
+                *(
+                    getattr(User, field).is_distinct_from(query.excluded[field])
+                    for field in refresh
+                ),
+            ),
+        )
+        user = (await self.session.scalars(query.returning(User))).one_or_none()
+        await self.session.commit()
+        if user is None:
+            # The row is up to date, so the statement did not return it
+            user = await self.get(user_id=data["id"])
+        return cast(User, user)
+
     async def update(self, user_id: int, **data: Any) -> Optional[User]:
         return await self._update(
             model=User,
@@ -1,4 +1,4 @@
-from .cache_wrapper import redis_cache
+from .cache_wrapper import read_cache, redis_cache, single_flight, write_cache
 from .repository import RedisRepository
 
-__all__ = ["RedisRepository", "redis_cache"]
+__all__ = ["RedisRepository", "read_cache", "redis_cache", "single_flight", "write_cache"]
@@ -1,24 +1,73 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from datetime import timedelta
 from functools import wraps
-from typing import Any, Awaitable, Callable, Optional, ParamSpec, get_type_hints
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Final,
+    NamedTuple,
+    Optional,
+    ParamSpec,
+    get_type_hints,
+)
 
+import msgspec
 from pydantic import TypeAdapter
+from redis.asyncio import Redis
 from redis.typing import ExpiryT
 from typing_extensions import TypeVar
 
 from lexi.services.redis.repository import RedisRepository
+from lexi.services.redis.serializers import get_type_adapter
 from lexi.utils import mjson
+from lexi.utils.compression import PayloadCodec
 
 T = TypeVar("T", bound=Any)
 P = ParamSpec("P")
 
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# How often processes waiting for another one to load a value check the cache
+LOCK_POLL_INTERVAL: Final[float] = 0.05
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    # Seconds it took to load the value
+    delta: float
+    expires_at: Optional[float]
+
 
 def redis_cache(
     prefix: Optional[str] = None,
     ttl: Optional[ExpiryT] = None,
+    negative_ttl: Optional[ExpiryT] = None,
+    lock_timeout: Optional[float] = None,
+    early_refresh: float = 0.0,
 ) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Cache results of a service method in Redis.
+    The service must have ``redis`` (a client or a ``RedisRepository``) and ``codec`` attributes.
+
+    Concurrent misses of the same key in a process share a single call of the method.
+
+    :param ttl: Expiry of cached results
+    :param negative_ttl: Expiry of ``None`` results, they are not cached without it
+    :param lock_timeout: Take a Redis lock while loading a missing value, so that other
+        processes wait up to this many seconds for it instead of loading it too
+    :param early_refresh: With a positive value, entries are refreshed in the background
+        at a random moment shortly before they expire, larger values refresh earlier
+    """
+
     def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
         return_type: Any = get_type_hints(func)["return"]
         type_adapter: TypeAdapter[T] = TypeAdapter(return_type)
+        in_flight: dict[str, asyncio.Task[Any]] = {}
 
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
@@ -32,23 +81,144 @@ def redis_cache(
                 ]
             )
 
-            redis = self.redis
-            if isinstance(self.redis, RedisRepository):
-                redis = redis.client
+            redis, codec = _get_storage(self)
 
-            cached_value: Any = await redis.get(key)
+            async def load() -> T:
+                result, delta = await _timed(func(*args, **kwargs))
+                expiry = ttl if result is not None else negative_ttl
+                # None results are only cached with their own TTL
+                if result is not None or expiry is not None:
+                    dumped = type_adapter.dump_python(result)
+                    await _store(redis, codec, key, value=dumped, delta=delta, ttl=expiry)
+                return result
 
-            if isinstance(cached_value, bytes):
-                cached_value = cached_value.decode()
+            async def load_once() -> T:
+                if lock_timeout is None:
+                    return await load()
+                return await _load_locked(redis, codec, key, lock_timeout, load, type_adapter)
 
-            if cached_value is not None:
-                return type_adapter.validate_python(mjson.decode(cached_value))
+            entry = _decode_entry(codec, await redis.get(key))
+            if entry is None:
+                return await asyncio.shield(single_flight(in_flight, key, load_once))
 
-            result: T = await func(*args, **kwargs)
-            cached_result: str = mjson.encode(type_adapter.dump_python(result))
-            await redis.setex(key, ttl, cached_result)
-            return result
+            if _should_refresh(entry, early_refresh):
+                # The current value is served while one caller refreshes it
+                single_flight(in_flight, key, load)
+            return type_adapter.validate_python(entry.value)
 
         return wrapper
 
     return decorator
+
+
+async def read_cache(service: Any, key: str, validator: Any) -> Optional[Any]:
+    """
+    Read an entry written by a method decorated with :func:`redis_cache` without calling it.
+
+    :return: Cached value, ``None`` on a miss or a cached ``None``
+    """
+    redis, codec = _get_storage(service)
+    entry = _decode_entry(codec, await redis.get(key))
+    if entry is None:
+        return None
+    return get_type_adapter(validator).validate_python(entry.value)
+
+
+async def write_cache(service: Any, key: str, value: Any, ttl: Optional[ExpiryT] = None) -> None:
+    """Replace an entry of a method decorated with :func:`redis_cache` by a fresh value"""
+    redis, codec = _get_storage(service)
+    dumped = get_type_adapter(type(value)).dump_python(value)
+    await _store(redis, codec, key, value=dumped, delta=0.0, ttl=ttl)
+
+
+def single_flight(
+    in_flight: dict[str, asyncio.Task[Any]], key: str, load: Callable[[], Awaitable[T]]
+) -> asyncio.Task[T]:
+    """Task loading the key, shared by every caller until it is done"""
+    task = in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(load())  # type: ignore[arg-type]
+        in_flight[key] = task
+        task.add_done_callback(lambda done: _forget(in_flight, key, done))
+    return task
+
+
+async def _timed(call: Awaitable[T]) -> tuple[T, float]:
+    started_at = time.monotonic()
+    result = await call
+    return result, time.monotonic() - started_at
+
+
+def _get_storage(service: Any) -> tuple[Redis, PayloadCodec]:
+    if isinstance(service.redis, RedisRepository):
+        return service.redis.client, service.redis.codec
+    return service.redis, service.codec
+
+
+async def _store(
+    redis: Redis,
+    codec: PayloadCodec,
+    key: str,
+    value: Any,
+    delta: float,
+    ttl: Optional[ExpiryT],
+) -> None:
+    entry = CacheEntry(
+        value=value,
+        delta=delta,
+        expires_at=time.time() + _seconds(ttl) if ttl is not None else None,
+    )
+    await redis.set(key, codec.encode(mjson.bytes_encode(entry)), ex=ttl)
+
+
+async def _load_locked(
+    redis: Redis,
+    codec: PayloadCodec,
+    key: str,
+    lock_timeout: float,
+    load: Callable[[], Awaitable[T]],
+    type_adapter: TypeAdapter[T],
+) -> T:
+    lock_key = f"{key}:lock"
+    if await redis.set(lock_key, 1, nx=True, px=int(lock_timeout * 1000)):
+        try:
+            return await load()
+        finally:
+            await redis.delete(lock_key)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        entry = _decode_entry(codec, await redis.get(key))
+        if entry is not None:
+            return type_adapter.validate_python(entry.value)
+    # The process holding the lock is too slow or gone
+    return await load()
+
+
+def _decode_entry(codec: PayloadCodec, cached_value: Any) -> Optional[CacheEntry]:
+    if cached_value is None:
+        return None
+    data = msgspec.json.decode(codec.decode(cached_value))
+    if not isinstance(data, list) or len(data) != len(CacheEntry._fields):
+        # Written before entries had metadata
+        return None
+    return CacheEntry(*data)
+
+
+def _should_refresh(entry: CacheEntry, beta: float) -> bool:
+    """Probabilistic early expiration (XFetch), more likely the closer the expiry is"""
+    if beta <= 0 or entry.expires_at is None:
+        return False
+    return time.time() - entry.delta * beta * math.log(random.random()) >= entry.expires_at
+
+
+def _seconds(expiry: ExpiryT) -> float:
+    return expiry.total_seconds() if isinstance(expiry, timedelta) else float(expiry)
+
+
+def _forget(in_flight: dict[str, asyncio.Task[Any]], key: str, task: asyncio.Task[Any]) -> None:
+    if in_flight.get(key) is task:
+        del in_flight[key]
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.debug("Failed to load cache entry %s: %s", key, error)
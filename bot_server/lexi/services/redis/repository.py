@@ -3,11 +3,11 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any, Final, Optional, TypeVar, cast
 
-from pydantic import BaseModel, TypeAdapter
 from redis.asyncio import Redis
 from redis.typing import ExpiryT
 
-from lexi.utils import mjson
+from lexi.services.redis.serializers import SerializerRegistry
+from lexi.utils.compression import PayloadCodec
 from lexi.utils.key_builder import StorageKey
 
 if TYPE_CHECKING:
@@ -22,10 +22,20 @@ TX_QUEUE_KEY: Final[str] = "tx_queue"
 class RedisRepository:
     client: Redis
     config: AppConfig
+    codec: PayloadCodec
+    serializers: SerializerRegistry
 
-    def __init__(self, client: Redis, config: AppConfig) -> None:
+    def __init__(
+        self,
+        client: Redis,
+        config: AppConfig,
+        codec: PayloadCodec,
+        serializers: Optional[SerializerRegistry] = None,
+    ) -> None:
         self.client = client
         self.config = config
+        self.codec = codec
+        self.serializers = serializers or SerializerRegistry()
 
     async def get(
         self,
@@ -36,19 +46,21 @@ class RedisRepository:
         value: Optional[Any] = await self.client.get(key.pack())
         if value is None:
             return default
-        value = mjson.decode(value)
-        return TypeAdapter[T](validator).validate_python(value)
+        return cast(T, self.serializers.get(validator).decode(self.codec.decode(value)))
 
     async def set(self, key: StorageKey, value: Any, ex: Optional[ExpiryT] = None) -> None:
-        if isinstance(value, BaseModel):
-            value = value.model_dump(exclude_defaults=True)
-        await self.client.set(name=key.pack(), value=mjson.encode(value), ex=ex)
+        await self.client.set(
+            name=key.pack(), value=self.codec.encode(self.serializers.encode(value)), ex=ex
+        )
 
     async def exists(self, key: StorageKey) -> bool:
         return cast(bool, await self.client.exists(key.pack()))
 
-    async def delete(self, key: StorageKey) -> None:
-        await self.client.delete(key.pack())
+    async def delete(self, key: StorageKey) -> bool:
+        return cast(bool, await self.client.delete(key.pack()))
+
+    async def increment(self, key: StorageKey, field: str, amount: int = 1) -> int:
+        return await self.client.hincrby(key.pack(), field, amount)
 
     async def close(self) -> None:
         await self.client.aclose(close_connection_pool=True)  # type: ignore
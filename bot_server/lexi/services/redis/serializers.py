@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import Any, Final, Generic, Protocol, TypeAlias, TypeVar, cast
+
+import msgspec
+from pydantic import BaseModel, TypeAdapter
+
+from lexi.models.dto.story import StorySession, VocabularyWord
+from lexi.models.dto.structs import StorySessionStruct, VocabularyWordStruct
+from lexi.utils import mjson
+
+T = TypeVar("T", bound=Any)
+T_co = TypeVar("T_co", covariant=True)
+M = TypeVar("M", bound=BaseModel)
+# Model to build and the plans of its fields holding nested models
+_ConstructPlan: TypeAlias = tuple[type[BaseModel], dict[str, "_ConstructPlan"]]
+
+# Hot DTOs decoded with msgspec instead of pydantic validation
+DEFAULT_STRUCTS: Final[dict[type[BaseModel], type[msgspec.Struct]]] = {
+    StorySession: StorySessionStruct,
+    VocabularyWord: VocabularyWordStruct,
+}
+
+
+class Serializer(Protocol[T_co]):
+    def decode(self, data: bytes) -> T_co: ...
+
+    def convert(self, data: Any) -> T_co:
+        """Build the value from already decoded builtins"""
+
+
+class AdapterSerializer(Generic[T]):
+    adapter: TypeAdapter[T]
+
+    __slots__ = ("adapter",)
+
+    def __init__(self, validator: Any) -> None:
+        self.adapter = get_type_adapter(validator)
+
+    def decode(self, data: bytes) -> T:
+        return self.adapter.validate_json(data)
+
+    def convert(self, data: Any) -> T:
+        return self.adapter.validate_python(data)
+
+
+class StructSerializer(Generic[M]):
+    """
+    Decodes JSON into a msgspec ``Struct`` mirroring the model and builds the model
+    from it without a second validation pass. Nested models are supported as direct fields.
+    """
+
+    model: type[M]
+    struct: type[msgspec.Struct]
+    _plan: _ConstructPlan
+    _decoder: msgspec.json.Decoder[Any]
+
+    __slots__ = ("model", "struct", "_plan", "_decoder")
+
+    def __init__(self, model: type[M], struct: type[msgspec.Struct]) -> None:
+        self.model = model
+        self.struct = struct
+        self._plan = _build_plan(model)
+        self._decoder = msgspec.json.Decoder(struct)
+
+    def decode(self, data: bytes) -> M:
+        return cast(M, _construct(self._plan, self._decoder.decode(data)))
+
+    def convert(self, data: Any) -> M:
+        return cast(M, _construct(self._plan, msgspec.convert(data, self.struct)))
+
+
+class SerializerRegistry:
+    """Serializers of the values stored in Redis, built once per type"""
+
+    _structs: dict[Any, type[msgspec.Struct]]
+    _serializers: dict[Any, Serializer[Any]]
+
+    __slots__ = ("_structs", "_serializers")
+
+    def __init__(self, structs: dict[type[BaseModel], type[msgspec.Struct]] | None = None) -> None:
+        self._structs = dict(DEFAULT_STRUCTS if structs is None else structs)
+        self._serializers = {}
+
+    def get(self, validator: Any) -> Serializer[Any]:
+        try:
+            return self._serializers[validator]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable type hints can not be cached
+            return AdapterSerializer(validator)
+
+        serializer: Serializer[Any]
+        if validator in self._structs:
+            serializer = StructSerializer(validator, self._structs[validator])
+        else:
+            serializer = AdapterSerializer(validator)
+        self._serializers[validator] = serializer
+        return serializer
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.__pydantic_serializer__.to_json(value, exclude_defaults=True)
+        return mjson.bytes_encode(value)
+
+
+def get_type_adapter(validator: Any) -> TypeAdapter[Any]:
+    try:
+        return _get_cached_type_adapter(validator)
+    except TypeError:
+        # Unhashable type hints can not be cached
+        return TypeAdapter(validator)
+
+
+@cache
+def _get_cached_type_adapter(validator: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(validator)
+
+
+def _build_plan(model: type[BaseModel]) -> _ConstructPlan:
+    if model.__private_attributes__:
+        raise TypeError(f"{model.__name__} has private attributes, it can not use a struct")
+    nested: dict[str, _ConstructPlan] = {}
+    for name, field in model.model_fields.items():
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel):
+            nested[name] = _build_plan(field.annotation)
+    return model, nested
+
+
+def _construct(plan: _ConstructPlan, struct: msgspec.Struct) -> BaseModel:
+    """Same as ``model_construct`` for a complete set of fields, without its per-call overhead"""
+    model, nested = plan
+    values = msgspec.structs.asdict(struct)
+    for name, nested_plan in nested.items():
+        values[name] = _construct(nested_plan, values[name])
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
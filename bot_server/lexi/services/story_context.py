@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Final, Optional
+
+from lexi.models.dto.story import StorySession, StorySummary
+from lexi.prompts import format_compacted_story, get_story_summary_prompt
+from lexi.services.llm_gateway import LLMGateway
+from lexi.services.redis.repository import RedisRepository
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import CompactionConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+
+class StorySummaryKey(StorageKey, prefix="story_summary"):
+    user_id: str
+
+
+class StoryContextCompactor:
+    """
+    Keeps the story context sent to the LLM bounded.
+    The last segments are sent verbatim, earlier ones are replaced by a running
+    summary that is refreshed in the background after each turn.
+    """
+
+    config: CompactionConfig
+    redis_repo: RedisRepository
+    llm_gateway: LLMGateway
+    ttl: Optional[int]
+    _refresh_tasks: dict[int, asyncio.Task[Any]]
+
+    def __init__(
+        self,
+        config: CompactionConfig,
+        redis_repo: RedisRepository,
+        llm_gateway: LLMGateway,
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.config = config
+        self.redis_repo = redis_repo
+        self.llm_gateway = llm_gateway
+        # Summaries of abandoned stories expire together with the session
+        self.ttl = ttl
+        self._refresh_tasks = {}
+
+    async def get_story_so_far(self, session: StorySession) -> str:
+        """Story context for prompts: summary of earlier segments plus the latest ones"""
+        segments = session.segments
+        if len(segments) <= self.config.keep_last_segments:
+            return session.story_text
+
+        summary = await self.get_summary(session.user_id)
+        if summary is None or not summary.segments_count:
+            return session.story_text
+        return format_compacted_story(
+            summary=summary.text,
+            recent_scenes=segments[summary.segments_count :],
+        )
+
+    async def get_summary(self, user_id: int) -> StorySummary | None:
+        return await self.redis_repo.get(self._get_key(user_id), StorySummary)
+
+    async def delete_summary(self, user_id: int) -> None:
+        task = self._refresh_tasks.pop(user_id, None)
+        if task is not None:
+            task.cancel()
+        await self.redis_repo.delete(self._get_key(user_id))
+
+    def schedule_refresh(self, session: StorySession) -> None:
+        """Refresh the summary off the request path once segments fall out of the window"""
+        if len(session.segments) <= self.config.keep_last_segments:
+            return
+        task = self._refresh_tasks.get(session.user_id)
+        if task is not None and not task.done():
+            # The next turn will pick up whatever this refresh does not cover
+            return
+        task = asyncio.create_task(self._refresh(session.model_copy(deep=True)))
+        self._refresh_tasks[session.user_id] = task
+        task.add_done_callback(lambda _: self._forget(session.user_id, task))
+
+    async def _refresh(self, session: StorySession) -> None:
+        segments = session.segments
+        summarize_until = len(segments) - self.config.keep_last_segments
+        summary = await self.get_summary(session.user_id) or StorySummary()
+        if summary.segments_count >= summarize_until:
+            return
+
+        prompt = get_story_summary_prompt(
+            target_language=session.params.target_language_code,
+            previous_summary=summary.text,
+            new_scenes="\n\n".join(segments[summary.segments_count : summarize_until]),
+        )
+        try:
+            response = await self.llm_gateway.complete(
+                model=self.config.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=self.config.max_tokens,
+                temperature=0.2,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to refresh story summary for user %d: %s", session.user_id, e)
+            return
+
+        text = (response.choices[0].message.content or "").strip()
+        if not text:
+            return
+        await self.redis_repo.set(
+            self._get_key(session.user_id),
+            StorySummary(text=text, segments_count=summarize_until),
+            ex=self.ttl,
+        )
+
+    def _forget(self, user_id: int, task: asyncio.Task[Any]) -> None:
+        if self._refresh_tasks.get(user_id) is task:
+            del self._refresh_tasks[user_id]
+
+    def _get_key(self, user_id: int) -> StorageKey:
+        return StorySummaryKey(user_id=str(user_id))
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from openai import AsyncOpenAI
-
 from lexi.models.dto.story_creation_params import StoryCreationParams
 from lexi.services.base import BaseService
+from lexi.services.content_moderation import ContentModerator
 from lexi.services.crud.user import UserService
 
 if TYPE_CHECKING:
@@ -19,13 +18,16 @@ class ContentModerationError(Exception):
 class StoryCreatorService(BaseService):
     """Service for story creation business logic"""
 
-    def __init__(self, config: AppConfig, user_service: UserService) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        user_service: UserService,
+        moderator: ContentModerator,
+    ) -> None:
         super().__init__()
         self.config = config
         self.user_service = user_service
-        self.openai_client = AsyncOpenAI(
-            api_key=config.content_moderation.openai_api_key.get_secret_value()
-        )
+        self.moderator = moderator
 
     async def get_default_language_for_user(self, user_id: int) -> str | None:
         """Get the default language for story creation based on user's story language"""
@@ -47,7 +49,7 @@ class StoryCreatorService(BaseService):
 
     async def validate_content_moderation(self, text: str) -> bool:
         """
-        Validate text content using OpenAI Moderation API.
+        Validate text content with the local prefilter and OpenAI Moderation API.
         Returns True if content is appropriate, False otherwise.
         """
         # If content moderation is disabled, always return True
@@ -55,12 +57,8 @@ class StoryCreatorService(BaseService):
             return True
 
         try:
-            response = await self.openai_client.moderations.create(input=text)
-            result = response.results[0]
-
-            # Check for any flagged categories
-            if result.flagged:
-                self.logger.warning("Content flagged by moderation API: %s", text)
+            if not await self.moderator.is_appropriate(text):
+                self.logger.warning("Content flagged by moderation: %s", text)
                 return False
 
             return True
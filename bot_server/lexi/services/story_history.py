@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, Optional
+from uuid import uuid4
+
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lexi.models.dto.story import StorySession
+from lexi.services.postgres import SQLSessionContext
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import StoryHistoryConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Errors caused by the rows themselves, writing the same stories again fails the same way
+REJECTED_ERRORS: Final[tuple[type[Exception], ...]] = (
+    asyncpg.DataError,
+    asyncpg.IntegrityConstraintViolationError,
+)
+
+
+class StoryRecords(NamedTuple):
+    """Rows of a finished story in the column order of ``StoriesRepository``"""
+
+    story: tuple[Any, ...]
+    segments: list[tuple[Any, ...]]
+    key_words: list[tuple[Any, ...]]
+
+
+class StoryHistoryWriter:
+    """
+    Persists finished stories off the request path.
+
+    Stories are turned into rows right away and buffered in memory. The buffer is
+    written with COPY once ``batch_size`` stories are pending or every ``flush_interval``,
+    and on shutdown. A batch that failed is kept for the next flush, unless the database
+    rejected its rows: then the stories are written one by one and the rejected ones dropped.
+    """
+
+    config: StoryHistoryConfig
+    session_pool: async_sessionmaker[AsyncSession]
+    _pending: list[StoryRecords]
+    _flush_lock: asyncio.Lock
+    _wakeup: asyncio.Event
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        config: StoryHistoryConfig,
+        session_pool: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self.config = config
+        self.session_pool = session_pool
+        self._pending = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, session: StorySession) -> None:
+        if len(self._pending) >= self.config.max_pending:
+            logger.warning(
+                "Story history buffer is full, dropping story of user %d", session.user_id
+            )
+            return
+        self._pending.append(build_story_records(session))
+        if len(self._pending) >= self.config.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Lost %d finished stories on shutdown: %s", len(self._pending), e)
+
+    async def flush(self) -> int:
+        """
+        Write everything pending in batches.
+
+        :return: Number of written stories
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[: self.config.batch_size]
+                del self._pending[: self.config.batch_size]
+                try:
+                    written += await self._write_batch(batch)
+                except Exception:
+                    self._pending[:0] = batch
+                    raise
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Failed to write %d finished stories: %s", len(self._pending), e)
+
+    async def _write_batch(self, batch: list[StoryRecords]) -> int:
+        try:
+            await self._write(batch)
+        except REJECTED_ERRORS as e:
+            if len(batch) == 1:
+                logger.error("Dropping finished story rejected by the database: %s", e)
+                return 0
+            return sum([await self._write_batch([records]) for records in batch])
+        return len(batch)
+
+    async def _write(self, batch: list[StoryRecords]) -> None:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
+            await repository.stories.copy(
+                stories=[records.story for records in batch],
+                segments=[segment for records in batch for segment in records.segments],
+                key_words=[word for records in batch for word in records.key_words],
+            )
+
+
+def build_story_records(session: StorySession) -> StoryRecords:
+    story_id = uuid4()
+    params = session.params
+    story = (
+        story_id,
+        session.user_id,
+        params.target_language_code,
+        params.native_language_code,
+        params.protagonist,
+        params.setting,
+        params.openai_model,
+        session.turn_count,
+        _as_utc(session.created_at),
+        datetime.now(UTC),
+    )
+    # The opening segment was not picked by the user
+    chosen_choices: list[Optional[str]] = [None, *session.chosen_choices]
+    segments = [
+        (
+            story_id,
+            position,
+            text,
+            chosen_choices[position] if position < len(chosen_choices) else None,
+        )
+        for position, text in enumerate(session.segments)
+    ]
+    key_words = [
+        (story_id, word, session.user_id, params.target_language_code)
+        for word in dict.fromkeys(session.key_words)
+    ]
+    return StoryRecords(story=story, segments=segments, key_words=key_words)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Older sessions stored naive UTC timestamps
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Final, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lexi.enums.story import StorySessionStatus
+from lexi.models.dto.story import StorySession
+from lexi.services.postgres import SQLSessionContext
+from lexi.services.story_session_store import StorySessionStore
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import SessionLifecycleConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Release the sweeper lock only while it is still held by this pass
+RELEASE_LOCK_SCRIPT: Final[str] = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class StoryArchiveQueueKey(StorageKey, prefix="story_archive_queue"):
+    """Finished sessions waiting to be written to Postgres"""
+
+
+class StorySweeperLockKey(StorageKey, prefix="story_sweeper_lock"):
+    pass
+
+
+class StorySessionLifecycle:
+    """
+    Keeps Redis memory proportional to the users who are telling a story right now.
+
+    Finished sessions are queued when the story ends, sessions without a turn for
+    ``archive_after`` seconds are found through the activity index of the store.
+    A background sweeper writes both to Postgres in batches and removes them from Redis.
+    An abandoned session is restored from the archive when its user comes back.
+    """
+
+    config: SessionLifecycleConfig
+    session_pool: async_sessionmaker[AsyncSession]
+    store: StorySessionStore
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        config: SessionLifecycleConfig,
+        session_pool: async_sessionmaker[AsyncSession],
+        store: StorySessionStore,
+    ) -> None:
+        self.config = config
+        self.session_pool = session_pool
+        self.store = store
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def queue_finished(self, session: StorySession) -> None:
+        """Queue a finished session for the next sweep"""
+        await self.store.redis_repo.client.rpush(
+            StoryArchiveQueueKey.build(),
+            self.store.redis_repo.codec.encode(session.model_dump_json()),
+        )
+
+    async def rehydrate(self, user_id: int) -> Optional[StorySession]:
+        """Move the latest abandoned session of the user back to Redis"""
+        async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
+            archive = await repository.story_archives.get_latest_abandoned(user_id=user_id)
+            if archive is None:
+                return None
+            session = archive.dto()
+            await self.store.save(session)
+            await repository.story_archives.delete(
+                user_id=user_id, status=StorySessionStatus.ABANDONED
+            )
+        logger.info("Restored archived story session of user %d", user_id)
+        return session
+
+    async def discard_archived(self, user_id: int) -> None:
+        """Forget abandoned sessions of the user, e.g. once a new story was started"""
+        await self._discard_archived([user_id])
+
+    async def sweep(self) -> int:
+        """
+        Archive queued and idle sessions.
+        Only one instance sweeps at a time, the others skip the pass.
+
+        :return: Number of archived sessions
+        """
+        lock_key = StorySweeperLockKey.build()
+        client = self.store.redis_repo.client
+        # A pass outliving the lock must not release the lock of the next sweeper
+        token = secrets.token_hex(16)
+        if not await client.set(lock_key, token, nx=True, ex=self.config.sweep_interval):
+            return 0
+        try:
+            return await self._archive_finished() + await self._archive_idle()
+        finally:
+            await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await self.sweep()
+                if archived:
+                    logger.info("Archived %d story sessions", archived)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Failed to sweep story sessions: %s", e)
+            await asyncio.sleep(self.config.sweep_interval)
+
+    async def _archive_finished(self) -> int:
+        client = self.store.redis_repo.client
+        queue_key = StoryArchiveQueueKey.build()
+        archived = 0
+        while values := await client.lrange(queue_key, 0, self.config.batch_size - 1):
+            sessions = [
+                StorySession.model_validate_json(self.store.redis_repo.codec.decode(value))
+                for value in values
+            ]
+            await self._archive(sessions, StorySessionStatus.FINISHED)
+            # Sessions are removed only once they are safely in Postgres
+            await client.ltrim(queue_key, len(values), -1)
+            archived += len(sessions)
+        return archived
+
+    async def _archive_idle(self) -> int:
+        archived = 0
+        while idle := await self.store.get_idle(self.config.archive_after, self.config.batch_size):
+            sessions = await asyncio.gather(*(self.store.get(user_id) for user_id, _ in idle))
+            # Keys of some sessions may have already expired
+            await self.store.forget(
+                *(user_id for (user_id, _), session in zip(idle, sessions) if session is None)
+            )
+            found = [
+                (session, last_active)
+                for (_, last_active), session in zip(idle, sessions)
+                if session is not None
+            ]
+            if found:
+                await self._archive([session for session, _ in found], StorySessionStatus.ABANDONED)
+                evicted = await asyncio.gather(
+                    *(
+                        self.store.evict_if_idle(session.user_id, last_active)
+                        for session, last_active in found
+                    )
+                )
+                # Users who took a turn meanwhile keep their session in Redis
+                active = [
+                    session.user_id
+                    for (session, _), is_evicted in zip(found, evicted)
+                    if not is_evicted
+                ]
+                if active:
+                    await self._discard_archived(active)
+                archived += len(found) - len(active)
+            if len(idle) < self.config.batch_size:
+                break
+        return archived
+
+    async def _discard_archived(self, user_ids: list[int]) -> None:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
+            await repository.story_archives.delete_many(
+                user_ids=user_ids, status=StorySessionStatus.ABANDONED
+            )
+
+    async def _archive(self, sessions: list[StorySession], status: StorySessionStatus) -> None:
+        # A story can be queued twice by a double tap, one upsert can not touch a row twice
+        rows: dict[tuple[int, Any], dict[str, Any]] = {
+            (session.user_id, session.created_at): {
+                "user_id": session.user_id,
+                "started_at": session.created_at,
+                "status": status,
+                "last_active_at": session.last_updated,
+                "session": session.model_dump(mode="json"),
+            }
+            for session in sessions
+        }
+        async with SQLSessionContext(session_pool=self.session_pool) as (repository, _):
+            await repository.story_archives.upsert_many(list(rows.values()))
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Final, NamedTuple, Optional
+
+import msgspec
+
+CHOICE_LINE_PATTERN: Final[re.Pattern[str]] = re.compile(r"^\d+\.")
+CHOICE_PREFIX_PATTERN: Final[re.Pattern[str]] = re.compile(r"^\d+(\.|$)")
+GROWTH_MARKER: Final[str] = "GROWTH:"
+JSON_TEXT_FIELD_PATTERN: Final[re.Pattern[str]] = re.compile(r'"text"\s*:\s*"')
+
+STORY_RESPONSE_FORMAT: Final[dict[str, Any]] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "story_bit",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string"},
+                "choices": {"type": "array", "items": {"type": "string"}},
+                "key_words": {"type": "array", "items": {"type": "string"}},
+                "growth_moment": {"type": ["string", "null"]},
+            },
+            "required": ["text", "choices", "key_words", "growth_moment"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class ParsedStory(NamedTuple):
+    text: str
+    choices: list[str]
+    growth_moment: Optional[str] = None
+    key_words: tuple[str, ...] = ()
+
+
+class StoryPayload(msgspec.Struct):
+    """Story bit returned by the LLM as structured output"""
+
+    text: str
+    choices: list[str]
+    key_words: list[str] = []
+    growth_moment: Optional[str] = None
+
+
+story_payload_decoder: Final[msgspec.json.Decoder[StoryPayload]] = msgspec.json.Decoder(
+    StoryPayload
+)
+
+
+class StoryStreamParser:
+    """
+    Incremental parser for story responses.
+    Splits streamed text into story lines and numbered choices as chunks arrive.
+    A line starting with ``GROWTH:`` is told as part of the story and
+    remembered as the character growth moment.
+    """
+
+    _buffer: str
+    _story_lines: list[str]
+    _choices: list[str]
+    _growth_moment: Optional[str]
+
+    __slots__ = ("_buffer", "_story_lines", "_choices", "_growth_moment")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._story_lines = []
+        self._choices = []
+        self._growth_moment = None
+
+    @property
+    def in_choices(self) -> bool:
+        """Whether the numbered choices section has started"""
+        return bool(self._choices)
+
+    @property
+    def story_text(self) -> str:
+        """Story text received so far, without the choices section"""
+        lines = list(self._story_lines)
+        pending = self._buffer.strip()
+        # Hold back a partial line that may turn out to be the first choice or a marker
+        if (
+            pending
+            and not self.in_choices
+            and not CHOICE_PREFIX_PATTERN.match(pending)
+            and not GROWTH_MARKER.startswith(pending)
+        ):
+            lines.append(pending.removeprefix(GROWTH_MARKER).strip())
+        return "\n".join(line for line in lines if line)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the response"""
+        self._buffer += chunk
+        *complete_lines, self._buffer = self._buffer.split("\n")
+        for line in complete_lines:
+            self._consume_line(line)
+
+    def finish(self) -> ParsedStory:
+        """Consume the rest of the buffer and return the parsed story"""
+        if self._buffer:
+            self._consume_line(self._buffer)
+            self._buffer = ""
+        return ParsedStory(
+            text="\n".join(self._story_lines),
+            choices=list(self._choices),
+            growth_moment=self._growth_moment,
+        )
+
+    def _consume_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+
+        # Check if we've reached the choices section
+        if CHOICE_LINE_PATTERN.match(line):
+            self._choices.append(line.split(".", 1)[1].strip())
+        elif self.in_choices:
+            # Continue parsing choices
+            self._choices.append(line)
+        elif line.startswith(GROWTH_MARKER):
+            self._growth_moment = line.removeprefix(GROWTH_MARKER).strip()
+            if self._growth_moment:
+                self._story_lines.append(self._growth_moment)
+        else:
+            # Still in story text
+            self._story_lines.append(line)
+
+
+def parse_story_response(content: str) -> ParsedStory:
+    """Parse story response to extract text, choices and the growth moment"""
+    parser = StoryStreamParser()
+    parser.feed(content)
+    return parser.finish()
+
+
+def format_growth_moment(text: str) -> str:
+    """Format a separately generated growth moment as a marked response line"""
+    return f"{GROWTH_MARKER} {' '.join(text.split())}\n"
+
+
+class StoryJsonStreamParser:
+    """
+    Incremental parser for structured story responses.
+    Exposes the partially received ``text`` field while the JSON is streamed.
+    """
+
+    _buffer: str
+    _text_start: Optional[int]
+    _text_closed: bool
+    _story_text: str
+
+    __slots__ = ("_buffer", "_text_start", "_text_closed", "_story_text")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._text_start = None
+        self._text_closed = False
+        self._story_text = ""
+
+    @property
+    def in_choices(self) -> bool:
+        """Whether the story text is complete and the rest of the object is being received"""
+        return self._text_closed
+
+    @property
+    def story_text(self) -> str:
+        """Story text received so far"""
+        return self._story_text
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the response"""
+        self._buffer += chunk
+        if self._text_closed:
+            return
+        if self._text_start is None:
+            match = JSON_TEXT_FIELD_PATTERN.search(self._buffer)
+            if match is None:
+                return
+            self._text_start = match.end()
+
+        end, self._text_closed = _scan_json_string(self._buffer, self._text_start)
+        try:
+            self._story_text = msgspec.json.decode(
+                f'"{self._buffer[self._text_start : end]}"', type=str
+            ).strip()
+        except msgspec.DecodeError:
+            # A split surrogate pair, the next chunk will complete it
+            pass
+
+    def finish(self) -> ParsedStory:
+        """Decode the complete response, falling back to the line parser"""
+        return parse_structured_story_response(self._buffer)
+
+
+def _scan_json_string(buffer: str, start: int) -> tuple[int, bool]:
+    """
+    Find the end of a JSON string body starting at ``start``.
+    :return: Index up to which the body can be decoded and whether the string is closed
+    """
+    index = safe_end = start
+    while index < len(buffer):
+        char = buffer[index]
+        if char == '"':
+            return index, True
+        if char == "\\":
+            step = 6 if buffer[index + 1 : index + 2] == "u" else 2
+            if index + step > len(buffer):
+                break
+            index += step
+        else:
+            index += 1
+        safe_end = index
+    return safe_end, False
+
+
+def parse_structured_story_response(content: str) -> ParsedStory:
+    """Decode a structured story response, falling back to the line parser"""
+    try:
+        payload = story_payload_decoder.decode(content)
+    except msgspec.DecodeError:
+        return parse_story_response(content)
+
+    text = "\n".join(line.strip() for line in payload.text.strip().split("\n") if line.strip())
+    growth_moment = (payload.growth_moment or "").strip() or None
+    if growth_moment and growth_moment not in text:
+        text = f"{growth_moment}\n{text}"
+    return ParsedStory(
+        text=text,
+        choices=[choice.strip() for choice in payload.choices if choice.strip()],
+        growth_moment=growth_moment,
+        key_words=tuple(word.strip().lower() for word in payload.key_words if word.strip()),
+    )
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Final, NamedTuple, Optional, cast
+
+import msgspec
+
+from lexi.models.dto.story import StoryParams, StorySession
+from lexi.services.redis.repository import RedisRepository
+from lexi.utils import mjson
+from lexi.utils.key_builder import StorageKey
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+SEGMENT_SEPARATOR: Final[str] = "\n\n"
+# Fields of the session stored in their own lists instead of the state hash
+LIST_FIELDS: Final[set[str]] = {"story_text", "key_words", "chosen_choices"}
+# Left out of the state hash, growth moments of the logic have a list too
+STATE_EXCLUDE: Final[dict[str, Any]] = {
+    **dict.fromkeys(LIST_FIELDS, True),
+    "logic": {"growth_moments"},
+}
+# State fields that change between turns
+TURN_FIELDS: Final[set[str]] = {
+    "logic",
+    "choices",
+    "turn_count",
+    "last_updated",
+}
+# Deletes the session only if it was not touched since it was read by the sweeper
+EVICT_IF_IDLE_SCRIPT: Final[str] = """
+if tonumber(redis.call("ZSCORE", KEYS[1], ARGV[1])) ~= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call("DEL", unpack(KEYS, 2))
+redis.call("ZREM", KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class StorySessionKey(StorageKey, prefix="story_session"):
+    """Whole session as a single JSON value, read only to migrate old sessions"""
+
+    user_id: str
+
+
+class StorySessionStateKey(StorageKey, prefix="story_session_state"):
+    user_id: str
+
+
+class StorySegmentsKey(StorageKey, prefix="story_session_segments"):
+    user_id: str
+
+
+class StoryKeyWordsKey(StorageKey, prefix="story_session_key_words"):
+    user_id: str
+
+
+class StoryChosenChoicesKey(StorageKey, prefix="story_session_chosen_choices"):
+    user_id: str
+
+
+class StoryGrowthMomentsKey(StorageKey, prefix="story_session_growth_moments"):
+    user_id: str
+
+
+class StorySessionActivityKey(StorageKey, prefix="story_session_activity"):
+    """Sorted set of user ids scored by the time of their last turn"""
+
+
+class StorySessionKeys(NamedTuple):
+    state: str
+    segments: str
+    key_words: str
+    chosen_choices: str
+    growth_moments: str
+
+
+class StorySessionStore:
+    """
+    Stores story sessions in an append-only layout.
+
+    Scalar state (params, logic counters, choices, counters) lives in a hash with one JSON
+    value per field. Story segments, key words, chosen choices and growth moments are
+    Redis lists. A turn only appends to the lists and overwrites the small state fields,
+    so the bytes written per turn do not grow with the story.
+
+    With ``idle_ttl`` set, every write slides the expiry of the session keys and
+    records the time of the turn in an activity index used to find idle sessions.
+    """
+
+    redis_repo: RedisRepository
+    idle_ttl: Optional[int]
+
+    def __init__(self, redis_repo: RedisRepository, idle_ttl: Optional[int] = None) -> None:
+        self.redis_repo = redis_repo
+        self.idle_ttl = idle_ttl
+
+    async def save(self, session: StorySession) -> None:
+        """Replace the whole session"""
+        keys = self._get_keys(session.user_id)
+        async with self.redis_repo.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            pipe.hset(keys.state, mapping=self._dump_state(session))
+            if session.segments:
+                pipe.rpush(keys.segments, *map(self.redis_repo.codec.encode, session.segments))
+            for key, values in (
+                (keys.key_words, session.key_words),
+                (keys.chosen_choices, session.chosen_choices),
+                (keys.growth_moments, session.logic.growth_moments),
+            ):
+                if values:
+                    pipe.rpush(key, *values)
+            self._touch(pipe, session.user_id)
+            await pipe.execute()
+
+    async def append_turn(
+        self,
+        session: StorySession,
+        segment: str,
+        key_words: list[str],
+        chosen_choice: str,
+        growth_moment: Optional[str] = None,
+    ) -> None:
+        """Store a new story segment and the state after it in one transaction"""
+        keys = self._get_keys(session.user_id)
+        async with self.redis_repo.client.pipeline(transaction=True) as pipe:
+            pipe.hset(keys.state, mapping=self._dump_state(session, TURN_FIELDS))
+            pipe.rpush(keys.segments, self.redis_repo.codec.encode(segment))
+            pipe.rpush(keys.chosen_choices, chosen_choice)
+            if key_words:
+                pipe.rpush(keys.key_words, *key_words)
+            if growth_moment is not None:
+                pipe.rpush(keys.growth_moments, growth_moment)
+            self._touch(pipe, session.user_id)
+            await pipe.execute()
+
+    async def get(self, user_id: int) -> Optional[StorySession]:
+        keys = self._get_keys(user_id)
+        async with self.redis_repo.client.pipeline(transaction=True) as pipe:
+            pipe.hgetall(keys.state)
+            for key in keys[1:]:
+                pipe.lrange(key, 0, -1)
+            state, segments, key_words, chosen_choices, growth_moments = await pipe.execute()
+        if not state:
+            return await self._migrate(user_id)
+
+        data: dict[str, Any] = {
+            _decode_str(field): msgspec.json.decode(value) for field, value in state.items()
+        }
+        # Written before chosen choices and growth moments had lists of their own
+        legacy = "chosen_choices" in data
+        data["story_text"] = SEGMENT_SEPARATOR.join(map(self._decode_segment, segments))
+        data["key_words"] = [_decode_str(word) for word in key_words]
+        if not legacy:
+            data["chosen_choices"] = [_decode_str(choice) for choice in chosen_choices]
+            data["logic"]["growth_moments"] = [_decode_str(moment) for moment in growth_moments]
+        session = cast(StorySession, self.redis_repo.serializers.get(StorySession).convert(data))
+        if legacy:
+            await self.save(session)
+        return session
+
+    async def get_params(self, user_id: int) -> Optional[StoryParams]:
+        """Story params without loading the story itself"""
+        value: Any = await self.redis_repo.client.hget(self._get_keys(user_id).state, "params")
+        if value is None:
+            session = await self.get(user_id)
+            return session.params if session is not None else None
+        return StoryParams.model_validate_json(value)
+
+    async def get_segments(self, user_id: int, last: Optional[int] = None) -> list[str]:
+        """Story segments, optionally only the last ones"""
+        start = -last if last else 0
+        segments = await self.redis_repo.client.lrange(self._get_keys(user_id).segments, start, -1)
+        return [self._decode_segment(segment) for segment in segments]
+
+    async def delete(self, user_id: int) -> None:
+        async with self.redis_repo.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._get_keys(user_id), StorySessionKey.build(user_id=str(user_id)))
+            pipe.zrem(StorySessionActivityKey.build(), str(user_id))
+            await pipe.execute()
+
+    async def get_idle(self, idle_for: int, limit: int) -> list[tuple[int, float]]:
+        """Users with their last activity whose sessions were not touched for ``idle_for`` seconds"""
+        entries = await self.redis_repo.client.zrangebyscore(
+            StorySessionActivityKey.build(),
+            "-inf",
+            time.time() - idle_for,
+            start=0,
+            num=limit,
+            withscores=True,
+        )
+        return [(int(user_id), score) for user_id, score in entries]
+
+    async def evict_if_idle(self, user_id: int, last_active: float) -> bool:
+        """
+        Delete the session unless a turn was made after ``last_active``.
+
+        :return: Whether the session was deleted
+        """
+        keys = self._get_keys(user_id)
+        evicted = await self.redis_repo.client.eval(
+            EVICT_IF_IDLE_SCRIPT,
+            len(keys) + 1,
+            StorySessionActivityKey.build(),
+            *keys,
+            str(user_id),
+            repr(last_active),
+        )
+        return bool(evicted)
+
+    async def forget(self, *user_ids: int) -> None:
+        """Drop users from the activity index, e.g. once their keys expired"""
+        if user_ids:
+            await self.redis_repo.client.zrem(StorySessionActivityKey.build(), *map(str, user_ids))
+
+    async def _migrate(self, user_id: int) -> Optional[StorySession]:
+        """Move a session stored as a single JSON value into the new layout"""
+        legacy_key = StorySessionKey(user_id=str(user_id))
+        session = await self.redis_repo.get(legacy_key, StorySession)
+        if session is None:
+            return None
+        await self.save(session)
+        await self.redis_repo.delete(legacy_key)
+        logger.info("Migrated story session of user %d", user_id)
+        return session
+
+    def _touch(self, pipe: Any, user_id: int) -> None:
+        if self.idle_ttl is None:
+            return
+        for key in self._get_keys(user_id):
+            pipe.expire(key, self.idle_ttl)
+        pipe.zadd(StorySessionActivityKey.build(), {str(user_id): time.time()})
+
+    def _get_keys(self, user_id: int) -> StorySessionKeys:
+        return StorySessionKeys(
+            state=StorySessionStateKey.build(user_id=str(user_id)),
+            segments=StorySegmentsKey.build(user_id=str(user_id)),
+            key_words=StoryKeyWordsKey.build(user_id=str(user_id)),
+            chosen_choices=StoryChosenChoicesKey.build(user_id=str(user_id)),
+            growth_moments=StoryGrowthMomentsKey.build(user_id=str(user_id)),
+        )
+
+    def _decode_segment(self, segment: str | bytes) -> str:
+        return self.redis_repo.codec.decode(segment).decode()
+
+    @staticmethod
+    def _dump_state(
+        session: StorySession, fields: Optional[set[str]] = None
+    ) -> dict[str | bytes, str]:
+        data = session.model_dump(mode="json", include=fields, exclude=STATE_EXCLUDE)
+        return {field: mjson.encode(value) for field, value in data.items()}
+
+
+def _decode_str(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Final, Optional
+
+from lexi.models.dto.story import StoryContinuation, StorySession
+from lexi.services.redis.repository import RedisRepository
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import SpeculationConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+ContinuationGenerator = Callable[[StorySession, str], Awaitable[StoryContinuation]]
+
+
+class StorySpeculationKey(StorageKey, prefix="story_speculation"):
+    user_id: str
+    turn: int
+    choice_id: str
+
+
+class StorySpeculationStatsKey(StorageKey, prefix="story_speculation_stats"):
+    pass
+
+
+class StorySpeculator:
+    """
+    Pre-generates continuations for every choice of the latest story bit,
+    so the branch picked by the user can be served without waiting for the LLM.
+
+    Hits, misses, skipped and wasted branches are counted in a Redis hash.
+    """
+
+    config: SpeculationConfig
+    redis_repo: RedisRepository
+    generate: ContinuationGenerator
+    _jobs: dict[int, dict[str, asyncio.Task[Any]]]
+
+    def __init__(
+        self,
+        config: SpeculationConfig,
+        redis_repo: RedisRepository,
+        generate: ContinuationGenerator,
+    ) -> None:
+        self.config = config
+        self.redis_repo = redis_repo
+        self.generate = generate
+        self._jobs = {}
+
+    @property
+    def active_jobs(self) -> int:
+        return sum(
+            not task.done() for user_jobs in self._jobs.values() for task in user_jobs.values()
+        )
+
+    async def speculate(self, session: StorySession) -> None:
+        """Start background generation for the choices of the current turn"""
+        await self.discard(session.user_id)
+        snapshot = session.model_copy(deep=True)
+        user_jobs = self._jobs[session.user_id] = {}
+        for choice_id, choice_text in enumerate(session.choices, 1):
+            if (
+                len(user_jobs) >= self.config.max_jobs_per_user
+                or self.active_jobs >= self.config.max_concurrent_jobs
+            ):
+                await self._track("skipped")
+                continue
+            user_jobs[str(choice_id)] = asyncio.create_task(
+                self._run(snapshot, str(choice_id), choice_text)
+            )
+            await self._track("started")
+
+    async def consume(self, session: StorySession, choice_id: str) -> Optional[StoryContinuation]:
+        """
+        Take the pre-generated continuation for the chosen branch.
+        The other branches of the turn are cancelled or discarded.
+        """
+        user_jobs = self._jobs.pop(session.user_id, {})
+        task = user_jobs.pop(choice_id, None)
+        for other_task in user_jobs.values():
+            if other_task.cancel():
+                await self._track("wasted")
+
+        if task is not None:
+            # Serve the in-flight generation instead of starting a new one
+            await asyncio.wait([task])
+
+        continuation: Optional[StoryContinuation] = None
+        for other_id in range(1, len(session.choices) + 1):
+            key = self._get_key(session, str(other_id))
+            if str(other_id) == choice_id:
+                continuation = await self.redis_repo.get(key, StoryContinuation)
+                await self.redis_repo.delete(key)
+            elif await self.redis_repo.delete(key):
+                await self._track("wasted")
+
+        await self._track("hits" if continuation is not None else "misses")
+        return continuation
+
+    async def discard(self, user_id: int) -> None:
+        """Cancel speculative jobs that are still running for the user"""
+        for task in self._jobs.pop(user_id, {}).values():
+            if task.cancel():
+                await self._track("wasted")
+
+    async def _run(self, session: StorySession, choice_id: str, choice_text: str) -> None:
+        try:
+            continuation = await self.generate(session, choice_text)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Speculative generation failed for user %d: %s", session.user_id, e)
+            return
+        await self.redis_repo.set(
+            self._get_key(session, choice_id), continuation, ex=self.config.result_ttl
+        )
+
+    def _get_key(self, session: StorySession, choice_id: str) -> StorageKey:
+        return StorySpeculationKey(
+            user_id=str(session.user_id), turn=session.turn_count, choice_id=choice_id
+        )
+
+    async def _track(self, counter: str) -> None:
+        try:
+            await self.redis_repo.increment(StorySpeculationStatsKey(), field=counter)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to update speculation stats: %s", e)
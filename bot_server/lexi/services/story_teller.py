@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import random
 import re
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Final, List, Optional, Tuple
-
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Any, AsyncIterator, Final, List, Optional, Tuple, Union
 
 from lexi.models.dto.story import (
     StoryBit,
     StoryChoice,
+    StoryContinuation,
+    StoryDraft,
     StoryLogic,
     StoryParams,
     StorySession,
@@ -22,10 +23,29 @@ from lexi.prompts import (
     get_continue_story_prompt,
     get_initial_story_prompt,
     get_story_conclusion_prompt,
+    get_structured_output_instructions,
     get_vocabulary_definition_prompt,
+    get_vocabulary_definitions_prompt,
 )
 from lexi.services.base import BaseService
+from lexi.services.llm_cache import LLMResponseCache
+from lexi.services.llm_gateway import LLMGateway
 from lexi.services.redis.repository import RedisRepository
+from lexi.services.story_context import StoryContextCompactor
+from lexi.services.story_history import StoryHistoryWriter
+from lexi.services.story_lifecycle import StorySessionLifecycle
+from lexi.services.story_parser import (
+    STORY_RESPONSE_FORMAT,
+    ParsedStory,
+    StoryJsonStreamParser,
+    StoryStreamParser,
+    format_growth_moment,
+    parse_story_response,
+    parse_structured_story_response,
+)
+from lexi.services.story_session_store import StorySessionStore
+from lexi.services.story_speculation import StorySpeculator
+from lexi.services.story_turns import StoryTurnGuard
 from lexi.utils.key_builder import StorageKey
 
 if TYPE_CHECKING:
@@ -33,9 +53,10 @@ if TYPE_CHECKING:
 
 logger: Final = logging.getLogger(__name__)
 
+SENTENCE_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^.!?\n]+[.!?]*")
+VOCABULARY_CACHE_TTL: Final[int] = 3600
 
-class StorySessionKey(StorageKey, prefix="story_session"):
-    user_id: str
+StoryParser = Union[StoryStreamParser, StoryJsonStreamParser]
 
 
 class VocabularyCacheKey(StorageKey, prefix="vocabulary"):
@@ -47,17 +68,45 @@ class VocabularyCacheKey(StorageKey, prefix="vocabulary"):
 class StoryTellerService(BaseService):
     """Service for story generation and management"""
 
-    def __init__(self, config: AppConfig, redis_repo: RedisRepository) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        redis_repo: RedisRepository,
+        llm_gateway: LLMGateway,
+        llm_cache: Optional[LLMResponseCache] = None,
+        session_store: Optional[StorySessionStore] = None,
+        lifecycle: Optional[StorySessionLifecycle] = None,
+        history_writer: Optional[StoryHistoryWriter] = None,
+    ) -> None:
         super().__init__()
         self.config = config
         self.redis_repo = redis_repo
-        self.openai_client = AsyncOpenAI(
-            api_key=config.story_teller.openai.api_key.get_secret_value()
-        )
-
-    def _get_story_session_key(self, user_id: int) -> StorageKey:
-        """Get Redis key for story session"""
-        return StorySessionKey(user_id=str(user_id))
+        self.llm_gateway = llm_gateway
+        self.llm_cache = llm_cache
+        self.session_store = session_store or StorySessionStore(redis_repo=redis_repo)
+        self.lifecycle = lifecycle
+        self.history_writer = history_writer
+        self._prefetch_tasks: set[asyncio.Task[None]] = set()
+        self.compactor: Optional[StoryContextCompactor] = None
+        if config.story_teller.compaction.is_enabled:
+            self.compactor = StoryContextCompactor(
+                config=config.story_teller.compaction,
+                redis_repo=redis_repo,
+                llm_gateway=llm_gateway,
+                ttl=self.session_store.idle_ttl,
+            )
+        self.speculator: Optional[StorySpeculator] = None
+        if config.story_teller.speculation.is_enabled:
+            self.speculator = StorySpeculator(
+                config=config.story_teller.speculation,
+                redis_repo=redis_repo,
+                generate=self._generate_continuation,
+            )
+        self.turn_guard: Optional[StoryTurnGuard] = None
+        if config.story_teller.turn_guard.is_enabled:
+            self.turn_guard = StoryTurnGuard(
+                config=config.story_teller.turn_guard, redis_repo=redis_repo
+            )
 
     def _get_vocabulary_cache_key(
         self, word: str, target_language: str, native_language: str
@@ -91,87 +140,167 @@ class StoryTellerService(BaseService):
             last_updated=datetime.now(UTC),
         )
 
-        key = self._get_story_session_key(user_id)
-        await self.redis_repo.set(key, session)
+        # The new story replaces the one the user abandoned
+        await self._discard_story_state(user_id)
+        await self.session_store.save(session)
+        if self.lifecycle is not None:
+            await self.lifecycle.discard_archived(user_id)
 
         return session
 
     async def get_story_session(self, user_id: int) -> Optional[StorySession]:
-        """Get existing story session"""
-        key = self._get_story_session_key(user_id)
-        return await self.redis_repo.get(key, StorySession)
+        """Get existing story session, restoring it from the archive if it was abandoned"""
+        session = await self.session_store.get(user_id)
+        if session is None and self.lifecycle is not None:
+            session = await self.lifecycle.rehydrate(user_id)
+        return session
+
+    async def get_story_params(self, user_id: int) -> Optional[StoryParams]:
+        """Get story params of the existing session without loading the story"""
+        params = await self.session_store.get_params(user_id)
+        if params is None and self.lifecycle is not None:
+            session = await self.lifecycle.rehydrate(user_id)
+            params = session.params if session is not None else None
+        return params
 
     async def update_story_session(self, session: StorySession) -> None:
-        """Update story session in Redis"""
+        """Rewrite the whole story session in Redis"""
         session.last_updated = datetime.utcnow()
-        key = self._get_story_session_key(session.user_id)
-        await self.redis_repo.set(key, session)
+        await self.session_store.save(session)
+
+    async def finish_story_session(self, session: StorySession) -> None:
+        """Queue the finished story for archiving and remove it from Redis"""
+        if self.history_writer is not None:
+            self.history_writer.add(session)
+        elif self.lifecycle is not None:
+            # Without the history tables the session is kept in the JSON archive
+            await self.lifecycle.queue_finished(session)
+        if self.lifecycle is not None:
+            # The story may have been archived as abandoned while it was idle
+            await self.lifecycle.discard_archived(session.user_id)
+        await self.delete_story_session(session.user_id)
 
     async def delete_story_session(self, user_id: int) -> None:
         """Delete story session"""
-        key = self._get_story_session_key(user_id)
-        await self.redis_repo.delete(key)
+        await self._discard_story_state(user_id)
+        await self.session_store.delete(user_id)
+
+    async def _discard_story_state(self, user_id: int) -> None:
+        """Drop the summary and speculated continuations kept next to the user's story"""
+        if self.speculator is not None:
+            await self.speculator.discard(user_id)
+        if self.compactor is not None:
+            await self.compactor.delete_summary(user_id)
 
     async def generate_initial_story(self, session: StorySession) -> StoryBit:
         """Generate the initial story bit"""
-        prompt = get_initial_story_prompt(
-            target_language=session.params.target_language_code,
-            native_language=session.params.native_language_code,
-            protagonist=session.params.protagonist,
-            setting=session.params.setting,
-        )
-
-        response = await self.openai_client.chat.completions.create(
-            model=session.params.openai_model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=session.params.max_tokens,
-            temperature=session.params.temperature,
-        )
+        prompt = self._get_initial_story_prompt(session)
+        content = await self._complete_story(session, prompt)
+        return await self._apply_initial_story(session, self._parse_story_response(content))
 
-        content = response.choices[0].message.content or ""
-        story_text, choices = self._parse_story_response(content)
-        key_words = self._extract_key_words(story_text)
-
-        # Update session
-        session.story_text = story_text
-        session.choices = choices
-        session.key_words = key_words
-        session.turn_count = 1
-        await self.update_story_session(session)
+    async def stream_initial_story(self, session: StorySession) -> AsyncIterator[StoryDraft]:
+        """Generate the initial story bit, yielding drafts while the response is streamed"""
+        prompt = self._get_initial_story_prompt(session)
+        parser = self._new_parser()
+        async for draft in self._stream_story(session, prompt, parser):
+            yield draft
 
-        return StoryBit(
-            text=story_text,
-            choices=[
-                StoryChoice(text=choice, choice_id=str(i)) for i, choice in enumerate(choices, 1)
-            ],
-            key_words=key_words,
-        )
+        story_bit = await self._apply_initial_story(session, parser.finish())
+        yield StoryDraft(text=story_bit.text, story_bit=story_bit)
 
     async def continue_story(self, session: StorySession, choice_text: str) -> StoryBit:
         """Continue the story based on user choice"""
-        key_words = []
-        content = ""
+        continuation = await self._consume_speculation(session, choice_text)
+        if continuation is None:
+            continuation = await self._generate_continuation(session, choice_text)
+        return await self._apply_continuation(
+            session, self._parse_story_response(continuation.content), choice_text
+        )
 
-        if session.logic.character_growths_moments_left > 0 and random.random() < 0.25:
-            prompt = get_character_development_prompt(
-                target_language=session.params.target_language_code,
-                native_language=session.params.native_language_code,
-                protagonist=session.params.protagonist,
-                story_so_far=session.story_text,
+    async def stream_continue_story(
+        self, session: StorySession, choice_text: str
+    ) -> AsyncIterator[StoryDraft]:
+        """Continue the story, yielding drafts while the response is streamed"""
+        continuation = await self._consume_speculation(session, choice_text)
+        if continuation is not None:
+            story_bit = await self._apply_continuation(
+                session, self._parse_story_response(continuation.content), choice_text
             )
-            response = await self.openai_client.chat.completions.create(
-                model=session.params.openai_model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=session.params.max_tokens,
-                temperature=session.params.temperature,
-            )
-            content = response.choices[0].message.content or ""
-            key_words = self._extract_key_words(content)
-            session.logic.character_growths_moments_left -= 1
-            await self.update_story_session(session)
+            yield StoryDraft(text=story_bit.text, story_bit=story_bit)
+            return
+
+        parser = self._new_parser()
+        character_growth = self._should_develop_character(session)
+        growth_moment = await self._get_character_development(session, character_growth)
+        if growth_moment:
+            parser.feed(growth_moment)
+        prompt = await self._get_continue_story_prompt(session, choice_text, character_growth)
+        async for draft in self._stream_story(session, prompt, parser):
+            yield draft
+
+        story_bit = await self._apply_continuation(session, parser.finish(), choice_text)
+        yield StoryDraft(text=story_bit.text, story_bit=story_bit)
+
+    async def _generate_continuation(
+        self, session: StorySession, choice_text: str
+    ) -> StoryContinuation:
+        """Generate the continuation for a choice without touching the session"""
+        character_growth = self._should_develop_character(session)
+        content = await self._get_character_development(session, character_growth)
+        prompt = await self._get_continue_story_prompt(session, choice_text, character_growth)
+        content += await self._complete_story(session, prompt)
+        return StoryContinuation(content=content)
+
+    async def _consume_speculation(
+        self, session: StorySession, choice_text: str
+    ) -> Optional[StoryContinuation]:
+        if self.speculator is None or choice_text not in session.choices:
+            return None
+        choice_id = str(session.choices.index(choice_text) + 1)
+        return await self.speculator.consume(session, choice_id)
+
+    @property
+    def _structured_output(self) -> bool:
+        return self.config.story_teller.structured_output
+
+    @property
+    def _fold_character_growth(self) -> bool:
+        # A separate growth line cannot be prepended to a JSON response
+        return self.config.story_teller.fold_character_growth or self._structured_output
+
+    def _new_parser(self) -> StoryParser:
+        if self._structured_output:
+            return StoryJsonStreamParser()
+        return StoryStreamParser()
+
+    def _with_output_format(self, session: StorySession, prompt: str) -> str:
+        if not self._structured_output:
+            return prompt
+        return prompt + get_structured_output_instructions(session.params.target_language_code)
+
+    def _get_initial_story_prompt(self, session: StorySession) -> str:
+        prompt = get_initial_story_prompt(
+            target_language=session.params.target_language_code,
+            native_language=session.params.native_language_code,
+            protagonist=session.params.protagonist,
+            setting=session.params.setting,
+        )
+        return self._with_output_format(session, prompt)
+
+    async def _get_story_so_far(self, session: StorySession) -> str:
+        if self.compactor is None:
+            return session.story_text
+        return await self.compactor.get_story_so_far(session)
 
+    async def _get_continue_story_prompt(
+        self,
+        session: StorySession,
+        choice_text: str,
+        character_growth: bool = False,
+    ) -> str:
         # Check if we should conclude the story
         should_conclude = session.turn_count >= 8  # After 8 turns, consider concluding
+        story_so_far = await self._get_story_so_far(session)
 
         if should_conclude:
             prompt = get_story_conclusion_prompt(
@@ -179,46 +308,150 @@ class StoryTellerService(BaseService):
                 native_language=session.params.native_language_code,
                 protagonist=session.params.protagonist,
                 setting=session.params.setting,
-                story_so_far=session.story_text,
-                user_choice=choice_text,
-            )
-        else:
-            prompt = get_continue_story_prompt(
-                target_language=session.params.target_language_code,
-                native_language=session.params.native_language_code,
-                protagonist=session.params.protagonist,
-                setting=session.params.setting,
-                story_so_far=session.story_text,
+                story_so_far=story_so_far,
                 user_choice=choice_text,
-                turn_count=session.turn_count,
             )
+            return self._with_output_format(session, prompt)
+        prompt = get_continue_story_prompt(
+            target_language=session.params.target_language_code,
+            native_language=session.params.native_language_code,
+            protagonist=session.params.protagonist,
+            setting=session.params.setting,
+            story_so_far=story_so_far,
+            user_choice=choice_text,
+            turn_count=session.turn_count,
+            # The growth moment is folded into this request instead of a separate call
+            character_growth=character_growth and self._fold_character_growth,
+            structured_output=self._structured_output,
+        )
+        return self._with_output_format(session, prompt)
+
+    def _should_develop_character(self, session: StorySession) -> bool:
+        return session.logic.character_growths_moments_left > 0 and random.random() < 0.25
+
+    async def _get_character_development(
+        self, session: StorySession, character_growth: bool
+    ) -> str:
+        """Generate a character development moment with a separate request"""
+        if not character_growth or self._fold_character_growth:
+            return ""
+
+        prompt = get_character_development_prompt(
+            target_language=session.params.target_language_code,
+            native_language=session.params.native_language_code,
+            protagonist=session.params.protagonist,
+            story_so_far=await self._get_story_so_far(session),
+        )
+        content = await self._complete_story(session, prompt, structured=False)
+        return format_growth_moment(content) if content.strip() else ""
+
+    async def _complete_story(
+        self, session: StorySession, prompt: str, structured: Optional[bool] = None
+    ) -> str:
+        if structured is None:
+            structured = self._structured_output
+        response = await self.llm_gateway.complete(
+            hedge=True,
+            model=session.params.openai_model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=session.params.max_tokens,
+            temperature=session.params.temperature,
+            **({"response_format": STORY_RESPONSE_FORMAT} if structured else {}),
+        )
+        return response.choices[0].message.content or ""
 
-        response = await self.openai_client.chat.completions.create(
+    async def _stream_story(
+        self,
+        session: StorySession,
+        prompt: str,
+        parser: StoryParser,
+    ) -> AsyncIterator[StoryDraft]:
+        """Feed streamed completion into the parser, yielding drafts until choices begin"""
+        stream = self.llm_gateway.stream(
+            hedge=True,
             model=session.params.openai_model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=session.params.max_tokens,
             temperature=session.params.temperature,
+            **({"response_format": STORY_RESPONSE_FORMAT} if self._structured_output else {}),
         )
+        story_text = parser.story_text
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            parser.feed(chunk.choices[0].delta.content)
+            if parser.in_choices or parser.story_text == story_text:
+                continue
+            story_text = parser.story_text
+            yield StoryDraft(text=story_text)
+
+    async def _apply_initial_story(self, session: StorySession, story: ParsedStory) -> StoryBit:
+        key_words = self._get_key_words(story)
 
-        content += response.choices[0].message.content or ""
-        story_text, choices = self._parse_story_response(content)
-        key_words = self._extract_key_words(story_text)
+        # Update session
+        session.story_text = story.text
+        session.choices = story.choices
+        session.key_words = key_words
+        session.turn_count = 1
+        await self.update_story_session(session)
+        self._schedule_vocabulary_prefetch(session, story.text, key_words)
+        if self.speculator is not None and story.choices:
+            await self.speculator.speculate(session)
+
+        return self._build_story_bit(session, story.text, story.choices, key_words)
+
+    async def _apply_continuation(
+        self, session: StorySession, story: ParsedStory, choice_text: str
+    ) -> StoryBit:
+        key_words = self._get_key_words(story)
 
         # Update session
-        session.story_text += "\n\n" + story_text
-        session.choices = choices
+        growth_moment = None
+        if story.growth_moment and session.logic.character_growths_moments_left > 0:
+            growth_moment = story.growth_moment
+            session.logic.character_growths_moments_left -= 1
+            session.logic.growth_moments.append(growth_moment)
+        session.story_text += "\n\n" + story.text
+        session.choices = story.choices
+        session.chosen_choices.append(choice_text)
         session.key_words.extend(key_words)
         session.turn_count += 1
-        await self.update_story_session(session)
+        session.last_updated = datetime.utcnow()
+        await self.session_store.append_turn(
+            session,
+            story.text,
+            key_words,
+            chosen_choice=choice_text,
+            growth_moment=growth_moment,
+        )
+        self._schedule_vocabulary_prefetch(session, story.text, key_words)
+        if self.compactor is not None:
+            self.compactor.schedule_refresh(session)
+        if self.speculator is not None and story.choices:
+            await self.speculator.speculate(session)
+
+        return self._build_story_bit(session, story.text, story.choices, key_words)
 
+    def _build_story_bit(
+        self, session: StorySession, story_text: str, choices: list[str], key_words: list[str]
+    ) -> StoryBit:
         return StoryBit(
             text=story_text,
             choices=[
                 StoryChoice(text=choice, choice_id=str(i)) for i, choice in enumerate(choices, 1)
             ],
             key_words=key_words,
+            turn=session.turn_count,
+            story_id=session.story_id,
         )
 
+    async def get_cached_vocabulary_definition(
+        self, word: str, target_language: str, native_language: str
+    ) -> Optional[VocabularyWord]:
+        """Get vocabulary definition if it was already generated"""
+        cache_key = self._get_vocabulary_cache_key(word, target_language, native_language)
+        return await self.redis_repo.get(cache_key, VocabularyWord)
+
     async def get_vocabulary_definition(
         self,
         word: str,
@@ -228,22 +461,28 @@ class StoryTellerService(BaseService):
     ) -> VocabularyWord:
         """Get vocabulary definition and translation"""
         # Check cache first
-        cache_key = self._get_vocabulary_cache_key(word, target_language, native_language)
-        cached = await self.redis_repo.get(cache_key, VocabularyWord)
+        cached = await self.get_cached_vocabulary_definition(word, target_language, native_language)
         if cached:
             return cached
 
         # Generate definition
         prompt = get_vocabulary_definition_prompt(word, target_language, native_language, context)
 
-        response = await self.openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=150,
-            temperature=0.3,
-        )
+        request: dict[str, Any] = {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 150,
+            "temperature": 0.3,
+        }
+
+        async def fetch() -> str:
+            response = await self.llm_gateway.complete(**request)
+            return response.choices[0].message.content or ""
 
-        content = response.choices[0].message.content or ""
+        if self.llm_cache is not None:
+            content = await self.llm_cache.get_or_fetch("vocabulary", request, fetch, str)
+        else:
+            content = await fetch()
         definition, translation = self._parse_vocabulary_response(content)
 
         vocab_word = VocabularyWord(
@@ -254,35 +493,83 @@ class StoryTellerService(BaseService):
         )
 
         # Cache the result
-        await self.redis_repo.set(cache_key, vocab_word, ex=3600)  # Cache for 1 hour
+        await self.redis_repo.set(
+            self._get_vocabulary_cache_key(word, target_language, native_language),
+            vocab_word,
+            ex=VOCABULARY_CACHE_TTL,
+        )
 
         return vocab_word
 
-    def _parse_story_response(self, content: str) -> Tuple[str, List[str]]:
-        """Parse story response to extract text and choices"""
-        lines = content.strip().split("\n")
-        story_lines = []
-        choices = []
+    async def get_word_context(self, user_id: int, word: str) -> str:
+        """The sentence of the story containing the word, latest segments first"""
+        for segment in reversed(await self.session_store.get_segments(user_id)):
+            if sentence := _find_sentence(segment, word):
+                return sentence
+        return word
+
+    async def prefetch_vocabulary(
+        self, session: StorySession, text: str, key_words: list[str]
+    ) -> None:
+        """Define the key words of a story bit in one request and cache the definitions"""
+        target_language = session.params.target_language_code
+        native_language = session.params.native_language_code
+        word_contexts = {
+            word: _find_sentence(text, word) or word
+            for word in key_words
+            if not await self.redis_repo.exists(
+                self._get_vocabulary_cache_key(word, target_language, native_language)
+            )
+        }
+        if not word_contexts:
+            return
 
-        in_choices = False
-        for line in lines:
-            line = line.strip()
-            if not line:
+        prompt = get_vocabulary_definitions_prompt(word_contexts, target_language, native_language)
+        response = await self.llm_gateway.complete(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=100 * len(word_contexts),
+            temperature=0.3,
+        )
+        definitions = self._parse_vocabulary_definitions(response.choices[0].message.content or "")
+        for word in word_contexts:
+            if word.lower() not in definitions:
                 continue
+            definition, translation = definitions[word.lower()]
+            await self.redis_repo.set(
+                self._get_vocabulary_cache_key(word, target_language, native_language),
+                VocabularyWord(
+                    word=word,
+                    definition=definition,
+                    translation=translation,
+                    language_code=target_language,
+                ),
+                ex=VOCABULARY_CACHE_TTL,
+            )
 
-            # Check if we've reached the choices section
-            if re.match(r"^\d+\.", line):
-                in_choices = True
-                choices.append(line.split(".", 1)[1].strip())
-            elif in_choices:
-                # Continue parsing choices
-                choices.append(line)
-            else:
-                # Still in story text
-                story_lines.append(line)
-
-        story_text = "\n".join(story_lines)
-        return story_text, choices
+    def _schedule_vocabulary_prefetch(
+        self, session: StorySession, text: str, key_words: list[str]
+    ) -> None:
+        if not self.config.story_teller.prefetch_vocabulary or not key_words:
+            return
+        task = asyncio.create_task(self._prefetch_vocabulary(session, text, key_words))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch_vocabulary(
+        self, session: StorySession, text: str, key_words: list[str]
+    ) -> None:
+        try:
+            await self.prefetch_vocabulary(session, text, key_words)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A tap falls back to defining the word on demand
+            logger.warning("Failed to prefetch vocabulary for user %d: %s", session.user_id, e)
+
+    def _parse_story_response(self, content: str) -> ParsedStory:
+        """Parse story response to extract text, choices and the growth moment"""
+        if self._structured_output:
+            return parse_structured_story_response(content)
+        return parse_story_response(content)
 
     def _parse_vocabulary_response(self, content: str) -> Tuple[str, str]:
         """Parse vocabulary response to extract definition and translation"""
@@ -299,6 +586,22 @@ class StoryTellerService(BaseService):
 
         return definition, translation
 
+    def _parse_vocabulary_definitions(self, content: str) -> dict[str, Tuple[str, str]]:
+        """Parse batched vocabulary response into definition and translation per word"""
+        definitions: dict[str, Tuple[str, str]] = {}
+        for block in re.split(r"^\s*Word:", content, flags=re.MULTILINE)[1:]:
+            word, _, rest = block.partition("\n")
+            word = word.strip().strip('"').lower()
+            if word:
+                definitions[word] = self._parse_vocabulary_response(rest)
+        return definitions
+
+    def _get_key_words(self, story: ParsedStory) -> List[str]:
+        """Key words picked by the LLM, when they really occur in the story text"""
+        text = story.text.lower()
+        key_words = [word for word in story.key_words if word in text][:2]
+        return key_words or self._extract_key_words(story.text)
+
     def _extract_key_words(self, text: str) -> List[str]:
         """Extract key words from story text (MVP: random words longer than threshold)"""
         # Simple MVP implementation: extract words longer than 5 characters
@@ -317,3 +620,12 @@ class StoryTellerService(BaseService):
             formatted_text = pattern.sub(f"<u>{word}</u>", formatted_text)
 
         return formatted_text
+
+
+def _find_sentence(text: str, word: str) -> str:
+    pattern = re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+    sentences: list[str] = SENTENCE_PATTERN.findall(text)
+    for sentence in sentences:
+        if pattern.search(sentence):
+            return sentence.strip()
+    return ""
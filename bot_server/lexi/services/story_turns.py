@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Final, Optional
+
+from lexi.models.dto.story import StoryBit
+from lexi.services.redis.repository import RedisRepository
+from lexi.utils.key_builder import StorageKey
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import TurnGuardConfig
+
+# Value of a turn while its story bit is being generated
+PENDING: Final[bytes] = b"pending"
+POLL_INTERVAL: Final[float] = 0.2
+
+
+class StoryTurnKey(StorageKey, prefix="story_turn"):
+    user_id: int
+    # Tells turns of a new story from those of the story the user abandoned
+    story_id: int
+    turn: int
+
+
+class StoryTurnGuard:
+    """
+    Makes story turns idempotent.
+
+    Keyboards carry the story and the turn they were rendered for. The first tap claims the turn
+    with SET NX and generates the next story bit, which is then stored for
+    ``result_ttl``. Repeated taps on the same keyboard, however many processes they
+    reach, wait for that story bit instead of asking the LLM again.
+    """
+
+    config: TurnGuardConfig
+    redis_repo: RedisRepository
+
+    def __init__(self, config: TurnGuardConfig, redis_repo: RedisRepository) -> None:
+        self.config = config
+        self.redis_repo = redis_repo
+
+    async def claim(self, turn: StoryTurnKey) -> bool:
+        """:return: Whether the caller is the first to continue the story from this turn"""
+        claimed = await self.redis_repo.client.set(
+            turn.pack(), PENDING, nx=True, ex=self.config.lock_ttl
+        )
+        return bool(claimed)
+
+    async def complete(self, turn: StoryTurnKey, story_bit: StoryBit) -> None:
+        await self.redis_repo.client.set(
+            turn.pack(),
+            self.redis_repo.codec.encode(story_bit.model_dump_json()),
+            ex=self.config.result_ttl,
+        )
+
+    async def release(self, turn: StoryTurnKey) -> None:
+        """Let the user retry a turn whose generation failed"""
+        await self.redis_repo.client.delete(turn.pack())
+
+    async def get_result(self, turn: StoryTurnKey) -> Optional[StoryBit]:
+        """
+        Story bit generated for the turn, waiting for a generation in progress.
+
+        :return: ``None`` if there is none or it took longer than ``wait_timeout``
+        """
+        key = turn.pack()
+        deadline = time.monotonic() + self.config.wait_timeout
+        while True:
+            value = await self.redis_repo.client.get(key)
+            if value is None:
+                return None
+            if value != PENDING:
+                return StoryBit.model_validate_json(self.redis_repo.codec.decode(value))
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(POLL_INTERVAL)
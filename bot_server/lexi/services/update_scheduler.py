@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Final, Hashable
+
+from lexi.errors.scheduler import UpdateQueueFullError, UserQueueFullError
+from lexi.models.dto.update_scheduler import UpdateSchedulerStats
+
+if TYPE_CHECKING:
+    from lexi.config.env.update_scheduler import UpdateSchedulerConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class UpdateScheduler:
+    """
+    Handles webhook updates in the background with bounded memory and concurrency.
+
+    Updates of one user run one after another in the order they arrived, so two quick
+    taps never work on the same story session at once. At most ``max_concurrency``
+    updates run at the same time. Updates over ``max_pending`` in total or over
+    ``max_pending_per_user`` for one user are rejected, Telegram delivers them again later.
+    """
+
+    config: UpdateSchedulerConfig
+    _semaphore: asyncio.Semaphore
+    _queues: dict[Hashable, deque[Job]]
+    _tasks: set[asyncio.Task[None]]
+    _stats: dict[str, int]
+
+    def __init__(self, config: UpdateSchedulerConfig) -> None:
+        self.config = config
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+        self._queues = {}
+        self._tasks = set()
+        self._stats = {"pending": 0, "running": 0, "processed": 0, "failed": 0, "rejected": 0}
+
+    def submit(self, key: Hashable, job: Job) -> None:
+        """
+        Queue a job after the other jobs of the same key.
+
+        :raise UpdateQueueFullError: Too many jobs are pending
+        :raise UserQueueFullError: Too many jobs of the key are pending
+        """
+        queue = self._queues.get(key)
+        if self._stats["pending"] >= self.config.max_pending:
+            self._stats["rejected"] += 1
+            raise UpdateQueueFullError()
+        if queue is not None and len(queue) >= self.config.max_pending_per_user:
+            self._stats["rejected"] += 1
+            raise UserQueueFullError()
+
+        self._stats["pending"] += 1
+        if queue is not None:
+            queue.append(job)
+            return
+        queue = self._queues[key] = deque([job])
+        task = asyncio.create_task(self._drain(key, queue))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_stats(self) -> UpdateSchedulerStats:
+        return UpdateSchedulerStats(
+            pending=self._stats["pending"],
+            running=self._stats["running"],
+            users=len(self._queues),
+            max_user_queue=max(map(len, self._queues.values()), default=0),
+            processed=self._stats["processed"],
+            failed=self._stats["failed"],
+            rejected=self._stats["rejected"],
+        )
+
+    async def close(self) -> None:
+        """Wait for accepted jobs, cancelling those still running after ``shutdown_timeout``"""
+        if not self._tasks:
+            return
+        _, running = await asyncio.wait(self._tasks, timeout=self.config.shutdown_timeout)
+        for task in running:
+            task.cancel()
+        if running:
+            logger.warning("Cancelled updates of %d users on shutdown", len(running))
+
+    async def _drain(self, key: Hashable, queue: deque[Job]) -> None:
+        try:
+            while queue:
+                # The running job stays queued, so it counts towards the limit of its key
+                await self._run(queue[0])
+                queue.popleft()
+                self._stats["pending"] -= 1
+        finally:
+            self._stats["pending"] -= len(queue)
+            del self._queues[key]
+
+    async def _run(self, job: Job) -> None:
+        async with self._semaphore:
+            self._stats["running"] += 1
+            try:
+                await job()
+                self._stats["processed"] += 1
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._stats["failed"] += 1
+                logger.error("Failed to handle update: %s", e)
+            finally:
+                self._stats["running"] -= 1
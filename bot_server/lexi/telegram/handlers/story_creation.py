@@ -13,14 +13,15 @@ from pydantic import ValidationError
 
 from lexi.services.story_creator import ContentModerationError, StoryCreatorService
 from lexi.services.story_teller import StoryTellerService
+from lexi.telegram.helpers import MessageHelper, StoryStreamRenderer
 from lexi.telegram.keyboards.callback_data.menu import (
     CDCreateStory,
     CDMenu,
     CDStoryBack,
     CDStoryLanguageSelect,
 )
-from lexi.telegram.keyboards.callback_data.story import CDStoryChoice, CDVocabularyWord
 from lexi.telegram.keyboards.common import back_keyboard
+from lexi.telegram.keyboards.story import story_bit_keyboard
 
 if TYPE_CHECKING:
     from lexi.config import AppConfig
@@ -131,6 +132,8 @@ async def handle_setting_input(
     message: Message,
     state: FSMContext,
     i18n: I18nContext,
+    helper: MessageHelper,
+    config: AppConfig,
     story_teller: StoryTellerService,
     story_creator: StoryCreatorService,
 ) -> Any:
@@ -165,34 +168,26 @@ async def handle_setting_input(
     # Create story session
     session = await story_teller.create_story_session(message.from_user.id, story_creation_params)
 
-    # Generate initial story
-    story_bit = await story_teller.generate_initial_story(session)
-
-    # Format story text with key words
-    formatted_text = story_teller.format_story_text_with_key_words(
-        story_bit.text, story_bit.key_words
-    )
-
-    # Create keyboard with choices and vocabulary words
-    keyboard_builder = InlineKeyboardBuilder()
-
-    # Add story choices
-    for choice in story_bit.choices:
-        keyboard_builder.button(
-            text=choice.text, callback_data=CDStoryChoice(choice_id=choice.choice_id)
+    if config.story_teller.streaming.is_enabled:
+        renderer = StoryStreamRenderer(helper=helper, config=config.story_teller.streaming)
+        await renderer.render(
+            drafts=story_teller.stream_initial_story(session),
+            format_text=story_teller.format_story_text_with_key_words,
+            i18n=i18n,
         )
+    else:
+        # Generate initial story
+        story_bit = await story_teller.generate_initial_story(session)
 
-    # Add vocabulary word buttons
-    for word in story_bit.key_words:
-        keyboard_builder.button(text=f"📖 {word}", callback_data=CDVocabularyWord(word=word))
-
-    # Arrange buttons: choices in one row, vocabulary words in another
-    keyboard_builder.adjust(1, len(story_bit.key_words))
+        # Format story text with key words
+        formatted_text = story_teller.format_story_text_with_key_words(
+            story_bit.text, story_bit.key_words
+        )
 
-    await message.reply(
-        text=formatted_text,
-        reply_markup=keyboard_builder.as_markup(),
-    )
+        await message.reply(
+            text=formatted_text,
+            reply_markup=story_bit_keyboard(story_bit=story_bit, i18n=i18n),
+        )
 
     # Clear the FSM state
     await state.clear()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, Optional
 
 from aiogram import Router
 from aiogram.fsm.context import FSMContext
@@ -10,10 +10,14 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram_i18n import I18nContext
 
 from lexi.services.story_teller import StoryTellerService
+from lexi.services.story_turns import StoryTurnGuard, StoryTurnKey
+from lexi.telegram.helpers import MessageHelper, StoryStreamRenderer
 from lexi.telegram.keyboards.callback_data.story import CDStoryChoice, CDStoryEnd, CDVocabularyWord
+from lexi.telegram.keyboards.story import story_bit_keyboard
 
 if TYPE_CHECKING:
     from lexi.config import AppConfig
+    from lexi.models.dto.story import StoryBit, StorySession
     from lexi.models.dto.user import UserDto
 
 logger: Final[logging.Logger] = logging.getLogger(__name__)
@@ -26,6 +30,8 @@ async def handle_story_choice(
     callback: CallbackQuery,
     state: FSMContext,
     i18n: I18nContext,
+    helper: MessageHelper,
+    config: AppConfig,
     story_teller: StoryTellerService,
 ) -> Any:
     """Handle story choice selection"""
@@ -33,58 +39,123 @@ async def handle_story_choice(
         return
 
     choice_data = CDStoryChoice.unpack(callback.data)
-    choice_id = choice_data.choice_id
+    user_id = callback.from_user.id
 
     # Get story session
-    session = await story_teller.get_story_session(callback.from_user.id)
+    session = await story_teller.get_story_session(user_id)
     if not session:
         await callback.answer(i18n.messages.story_session_expired())
         return
 
+    turn_guard = story_teller.turn_guard
+    if turn_guard is None or choice_data.turn is None or choice_data.story_id is None:
+        # Keyboards sent before turns were tracked continue the story unguarded
+        await _choose(callback, session, choice_data.choice_id, i18n, helper, config, story_teller)
+        return
+
+    turn = StoryTurnKey(user_id=user_id, story_id=choice_data.story_id, turn=choice_data.turn)
+    if (session.story_id, session.turn_count) != (turn.story_id, turn.turn) or not (
+        await turn_guard.claim(turn)
+    ):
+        # A repeated tap shows the story bit of the first one instead of generating another
+        await _replay_turn(callback, turn, turn_guard, i18n, helper, story_teller)
+        return
+
+    story_bit = await _choose(
+        callback, session, choice_data.choice_id, i18n, helper, config, story_teller
+    )
+    if story_bit is None:
+        await turn_guard.release(turn)
+    else:
+        await turn_guard.complete(turn, story_bit)
+
+
+async def _choose(
+    callback: CallbackQuery,
+    session: StorySession,
+    choice_id: str,
+    i18n: I18nContext,
+    helper: MessageHelper,
+    config: AppConfig,
+    story_teller: StoryTellerService,
+) -> Optional[StoryBit]:
+    """:return: The next story bit, ``None`` if the choice could not be continued"""
     # Find the selected choice
     if not session.choices or int(choice_id) > len(session.choices):
         await callback.answer(i18n.messages.invalid_choice())
-        return
+        return None
 
     selected_choice = session.choices[int(choice_id) - 1]
 
     # Continue the story
     try:
-        story_bit = await story_teller.continue_story(session, selected_choice)
-
-        # Format story text with key words
-        formatted_text = story_teller.format_story_text_with_key_words(
-            story_bit.text, story_bit.key_words
+        return await _continue_story(
+            callback=callback,
+            session=session,
+            selected_choice=selected_choice,
+            i18n=i18n,
+            helper=helper,
+            config=config,
+            story_teller=story_teller,
         )
+    except Exception as e:
+        logger.error(f"Error continuing story: {e}")
+        await callback.answer(i18n.messages.story_generation_error())
+        return None
 
-        # Create keyboard
-        keyboard_builder = InlineKeyboardBuilder()
 
-        # Add story choices
-        for choice in story_bit.choices:
-            keyboard_builder.button(
-                text=choice.text, callback_data=CDStoryChoice(choice_id=choice.choice_id)
-            )
+async def _replay_turn(
+    callback: CallbackQuery,
+    turn: StoryTurnKey,
+    turn_guard: StoryTurnGuard,
+    i18n: I18nContext,
+    helper: MessageHelper,
+    story_teller: StoryTellerService,
+) -> None:
+    story_bit = await turn_guard.get_result(turn)
+    if story_bit is not None:
+        await helper.answer(
+            message_id=callback.message.message_id,  # type: ignore
+            text=story_teller.format_story_text_with_key_words(story_bit.text, story_bit.key_words),
+            reply_markup=story_bit_keyboard(story_bit=story_bit, i18n=i18n),
+            force_edit=True,
+        )
+    await callback.answer()
 
-        # Add vocabulary word buttons
-        for word in story_bit.key_words:
-            keyboard_builder.button(text=f"📖 {word}", callback_data=CDVocabularyWord(word=word))
 
-        # Check if story is complete (no more choices)
-        if not story_bit.choices:
-            keyboard_builder.button(text=i18n.buttons.end_story(), callback_data=CDStoryEnd())
+async def _continue_story(
+    callback: CallbackQuery,
+    session: StorySession,
+    selected_choice: str,
+    i18n: I18nContext,
+    helper: MessageHelper,
+    config: AppConfig,
+    story_teller: StoryTellerService,
+) -> StoryBit:
+    if config.story_teller.streaming.is_enabled:
+        renderer = StoryStreamRenderer(
+            helper=helper,
+            config=config.story_teller.streaming,
+            message_id=callback.message.message_id,  # type: ignore
+        )
+        return await renderer.render(
+            drafts=story_teller.stream_continue_story(session, selected_choice),
+            format_text=story_teller.format_story_text_with_key_words,
+            i18n=i18n,
+        )
 
-        # Arrange buttons
-        keyboard_builder.adjust(1, len(story_bit.key_words))
+    story_bit = await story_teller.continue_story(session, selected_choice)
 
-        await callback.message.edit_text(  # type: ignore
-            text=formatted_text,
-            reply_markup=keyboard_builder.as_markup(),
-        )
+    # Format story text with key words
+    formatted_text = story_teller.format_story_text_with_key_words(
+        story_bit.text, story_bit.key_words
+    )
 
-    except Exception as e:
-        logger.error(f"Error continuing story: {e}")
-        await callback.answer(i18n.messages.story_generation_error())
+    await callback.message.edit_text(  # type: ignore
+        text=formatted_text,
+        reply_markup=story_bit_keyboard(story_bit=story_bit, i18n=i18n),
+    )
+    return story_bit
 
 
 @router.callback_query(CDVocabularyWord.filter())
@@ -100,20 +171,26 @@ async def handle_vocabulary_word(
     vocab_data = CDVocabularyWord.unpack(callback.data)
     word = vocab_data.word
 
-    # Get story session for context
-    session = await story_teller.get_story_session(callback.from_user.id)
-    if not session:
+    # Only the params are needed, the story is read for context on a cache miss
+    params = await story_teller.get_story_params(callback.from_user.id)
+    if not params:
         await callback.answer(i18n.messages.story_session_expired())
         return
 
     try:
         # Get vocabulary definition
-        vocab_word = await story_teller.get_vocabulary_definition(
+        vocab_word = await story_teller.get_cached_vocabulary_definition(
             word=word,
-            target_language=session.params.target_language_code,
-            native_language=session.params.native_language_code,
-            context=session.story_text,
+            target_language=params.target_language_code,
+            native_language=params.native_language_code,
         )
+        if vocab_word is None:
+            vocab_word = await story_teller.get_vocabulary_definition(
+                word=word,
+                target_language=params.target_language_code,
+                native_language=params.native_language_code,
+                context=await story_teller.get_word_context(callback.from_user.id, word),
+            )
 
         # Create alert text
         alert_text = f"📖 <b>{word}</b>\n\n"
@@ -160,5 +237,5 @@ async def handle_story_end(
         reply_markup=keyboard_builder.as_markup(),
     )
 
-    # Clean up session
-    await story_teller.delete_story_session(callback.from_user.id)
+    # Archive and clean up session
+    await story_teller.finish_story_session(session)
@@ -1,4 +1,6 @@
+from .edits import EditCoalescer
 from .errors import silent_bot_request
 from .messages import MessageHelper
+from .story import StoryStreamRenderer
 
-__all__ = ["silent_bot_request", "MessageHelper"]
+__all__ = ["silent_bot_request", "EditCoalescer", "MessageHelper", "StoryStreamRenderer"]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from lexi.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from lexi.config.env.telegram import MessageEditsConfig
+
+EditSender = Callable[..., Awaitable[Message | bool]]
+
+
+class _PendingEdit:
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup]
+    kwargs: dict[str, Any]
+    content_hash: int
+    send: EditSender
+    waiters: list[asyncio.Future[Message | bool]]
+
+    __slots__ = ("text", "reply_markup", "kwargs", "content_hash", "send", "waiters")
+
+    def __init__(self) -> None:
+        self.waiters = []
+
+
+class _MessageEdits:
+    last_hash: Optional[int]
+    last_sent_at: float
+    pending: Optional[_PendingEdit]
+    task: Optional[asyncio.Task[None]]
+
+    __slots__ = ("last_hash", "last_sent_at", "pending", "task")
+
+    def __init__(self) -> None:
+        self.last_hash = None
+        self.last_sent_at = float("-inf")
+        self.pending = None
+        self.task = None
+
+
+class EditCoalescer:
+    """
+    Throttles edits of the same message.
+
+    A message is edited at most every ``min_interval`` seconds. An edit arriving in
+    between replaces the one still waiting, and the callers of both get the result of
+    the edit that is sent. Edits that would leave the message as it is are skipped
+    without a request.
+    """
+
+    config: MessageEditsConfig
+    _messages: TTLCache[tuple[int, int], _MessageEdits]
+
+    def __init__(self, config: MessageEditsConfig) -> None:
+        self.config = config
+        self._messages = TTLCache(max_size=config.max_messages, ttl=config.ttl)
+
+    async def edit(
+        self,
+        *,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup],
+        send: EditSender,
+        **kwargs: Any,
+    ) -> Message | bool:
+        """
+        :param send: Sends the edit, called with ``text``, ``reply_markup`` and ``kwargs``
+        """
+        key = (chat_id, message_id)
+        state = self._messages.get(key) or _MessageEdits()
+        self._messages.set(key, state)
+
+        content_hash = hash(
+            (
+                text,
+                reply_markup.model_dump_json() if reply_markup is not None else None,
+                repr(sorted(kwargs.items())),
+            )
+        )
+        if state.pending is None and content_hash == state.last_hash:
+            return True
+
+        edit = state.pending = state.pending or _PendingEdit()
+        edit.text, edit.reply_markup, edit.kwargs = text, reply_markup, kwargs
+        edit.content_hash, edit.send = content_hash, send
+        future: asyncio.Future[Message | bool] = asyncio.get_running_loop().create_future()
+        edit.waiters.append(future)
+        if state.task is None:
+            state.task = asyncio.create_task(self._flush(state))
+        return await future
+
+    async def _flush(self, state: _MessageEdits) -> None:
+        try:
+            while state.pending is not None:
+                delay = state.last_sent_at + self.config.min_interval - time.monotonic()
+                if delay > 0:
+                    # Newer edits keep replacing the content of the pending one meanwhile
+                    await asyncio.sleep(delay)
+                edit, state.pending = state.pending, None
+                await self._send(state, edit)
+        finally:
+            state.task = None
+
+    @staticmethod
+    async def _send(state: _MessageEdits, edit: _PendingEdit) -> None:
+        if edit.content_hash == state.last_hash:
+            _resolve(edit, True)
+            return
+        try:
+            result = await edit.send(text=edit.text, reply_markup=edit.reply_markup, **edit.kwargs)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # The message may be in any state now
+            state.last_hash = None
+            for waiter in edit.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        finally:
+            state.last_sent_at = time.monotonic()
+        state.last_hash = edit.content_hash
+        _resolve(edit, result)
+
+
+def _resolve(edit: _PendingEdit, result: Message | bool) -> None:
+    for waiter in edit.waiters:
+        if not waiter.done():
+            waiter.set_result(result)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from typing import Any, Optional, cast
 
 from aiogram import Bot
@@ -18,6 +19,7 @@ from aiogram.types import (
 from lexi.utils.custom_types import AnyKeyboard
 from lexi.utils.time import datetime_now
 
+from .edits import EditCoalescer
 from .errors import silent_bot_request
 
 
@@ -28,6 +30,7 @@ class MessageHelper:
     message_id: Optional[int] = None
     bot: Bot
     fsm_context: Optional[FSMContext] = None
+    edit_coalescer: Optional[EditCoalescer] = None
     last_updated: datetime = field(default_factory=datetime_now)
 
     @property
@@ -49,6 +52,7 @@ class MessageHelper:
             message_id=message_id or self.message_id,
             bot=self.bot,
             fsm_context=self.fsm_context,
+            edit_coalescer=self.edit_coalescer,
         )
 
     def resolve_message_id(
@@ -156,16 +160,24 @@ class MessageHelper:
 
         if force_edit or (edit and can_be_edited and message_id):
             try:
-                return await self.bot.edit_message_text(
+                if self.edit_coalescer is None or message_id is None:
+                    return await self._edit_message_text(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        text=text,
+                        reply_markup=reply_markup,
+                        **kwargs,
+                    )
+                return await self.edit_coalescer.edit(
                     chat_id=chat_id,
                     message_id=message_id,
                     text=text,
                     reply_markup=reply_markup,
+                    send=partial(self._edit_message_text, chat_id=chat_id, message_id=message_id),
                     **kwargs,
                 )
-            except (TelegramBadRequest, TelegramForbiddenError) as error:
-                if "exactly the same as a current content" in str(error):
-                    return True
+            except (TelegramBadRequest, TelegramForbiddenError):
+                pass
             finally:
                 self.last_updated = datetime_now()
 
@@ -184,6 +196,28 @@ class MessageHelper:
         finally:
             self.last_updated = datetime_now()
 
+    async def _edit_message_text(
+        self,
+        *,
+        chat_id: int,
+        message_id: Optional[int],
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        **kwargs: Any,
+    ) -> Message | bool:
+        try:
+            return await self.bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                reply_markup=reply_markup,
+                **kwargs,
+            )
+        except TelegramBadRequest as error:
+            if "exactly the same as a current content" in str(error):
+                return True
+            raise
+
     async def answer_current_message(
         self,
         *,
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional
+
+from aiogram import html
+from aiogram.types import InlineKeyboardMarkup, Message
+from aiogram_i18n import I18nContext
+
+from lexi.telegram.keyboards.story import story_bit_keyboard
+
+from .messages import MessageHelper
+
+if TYPE_CHECKING:
+    from lexi.config.env.story_teller import StreamingConfig
+    from lexi.models.dto.story import StoryBit, StoryDraft
+
+
+class StoryStreamRenderer:
+    """
+    Shows a streamed story bit in a single message.
+    Drafts are edited in at a throttled cadence; the keyboard is attached
+    only once the final story bit with complete choices arrives.
+    """
+
+    helper: MessageHelper
+    config: StreamingConfig
+    message_id: Optional[int]
+    _last_text: str
+    _last_edit: float
+
+    def __init__(
+        self,
+        helper: MessageHelper,
+        config: StreamingConfig,
+        message_id: Optional[int] = None,
+    ) -> None:
+        """
+        :param message_id: Message to edit, a new reply is sent when not provided
+        """
+        self.helper = helper
+        self.config = config
+        self.message_id = message_id
+        self._last_text = ""
+        self._last_edit = float("-inf")
+
+    async def render(
+        self,
+        drafts: AsyncIterator[StoryDraft],
+        format_text: Callable[[str, list[str]], str],
+        i18n: I18nContext,
+    ) -> StoryBit:
+        async for draft in drafts:
+            if (story_bit := draft.story_bit) is not None:
+                await self._show(
+                    text=format_text(story_bit.text, story_bit.key_words),
+                    reply_markup=story_bit_keyboard(story_bit=story_bit, i18n=i18n),
+                )
+                return story_bit
+            if self._should_edit(draft.text):
+                await self._show(text=html.quote(draft.text) + " ✍️")
+                self._last_text = draft.text
+                self._last_edit = time.monotonic()
+        raise RuntimeError("Story stream ended without a complete story bit.")
+
+    def _should_edit(self, text: str) -> bool:
+        if time.monotonic() - self._last_edit < self.config.edit_interval:
+            return False
+        # The first draft is shown right away to cut time to first visible text
+        return not self._last_text or len(text) - len(self._last_text) >= self.config.min_edit_chars
+
+    async def _show(self, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+        if self.message_id is not None:
+            await self.helper.answer(
+                message_id=self.message_id,
+                text=text,
+                reply_markup=reply_markup,
+                force_edit=True,
+            )
+            return
+        message = await self.helper.answer(
+            text=text,
+            reply_markup=reply_markup,
+            edit=False,
+            reply=True,
+        )
+        if isinstance(message, Message):
+            self.message_id = message.message_id
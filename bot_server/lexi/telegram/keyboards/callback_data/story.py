@@ -1,8 +1,21 @@
+from __future__ import annotations
+
+from typing import Optional
+
 from aiogram.filters.callback_data import CallbackData
 
 
 class CDStoryChoice(CallbackData, prefix="story_choice"):
     choice_id: str
+    # Turn and story the keyboard was rendered for, repeated taps of it continue the story once
+    turn: Optional[int] = None
+    story_id: Optional[int] = None
+
+    @classmethod
+    def unpack(cls, value: str) -> CDStoryChoice:
+        # Keyboards sent by older versions lack the trailing fields
+        missing = len(cls.model_fields) - value.count(cls.__separator__)
+        return super().unpack(value + cls.__separator__ * max(missing, 0))
 
 
 class CDVocabularyWord(CallbackData, prefix="vocab_word"):
@@ -0,0 +1,32 @@
+from aiogram.types import InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram_i18n import I18nContext
+
+from lexi.models.dto.story import StoryBit
+
+from .callback_data.story import CDStoryChoice, CDStoryEnd, CDVocabularyWord
+
+
+def story_bit_keyboard(story_bit: StoryBit, i18n: I18nContext) -> InlineKeyboardMarkup:
+    builder: InlineKeyboardBuilder = InlineKeyboardBuilder()
+
+    # Add story choices
+    for choice in story_bit.choices:
+        builder.button(
+            text=choice.text,
+            callback_data=CDStoryChoice(
+                choice_id=choice.choice_id, turn=story_bit.turn, story_id=story_bit.story_id
+            ),
+        )
+
+    # Add vocabulary word buttons
+    for word in story_bit.key_words:
+        builder.button(text=f"📖 {word}", callback_data=CDVocabularyWord(word=word))
+
+    # Check if story is complete (no more choices)
+    if not story_bit.choices:
+        builder.button(text=i18n.buttons.end_story(), callback_data=CDStoryEnd())
+
+    # Arrange buttons: choices in one row, vocabulary words in another
+    builder.adjust(1, len(story_bit.key_words))
+    return builder.as_markup()
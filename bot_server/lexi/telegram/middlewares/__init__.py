@@ -1,5 +1,15 @@
 from .error_logger import ErrorLoggerMiddleware
 from .message_helper import MessageHelperMiddleware
+from .rate_limit import OutboundRateLimitMiddleware
+from .sql_session import SQLSessionMiddleware
 from .user import UserMiddleware
+from .webhook_reply import WebhookReplyMiddleware
 
-__all__ = ["ErrorLoggerMiddleware", "MessageHelperMiddleware", "UserMiddleware"]
+__all__ = [
+    "ErrorLoggerMiddleware",
+    "MessageHelperMiddleware",
+    "OutboundRateLimitMiddleware",
+    "SQLSessionMiddleware",
+    "UserMiddleware",
+    "WebhookReplyMiddleware",
+]
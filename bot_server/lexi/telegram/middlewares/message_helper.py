@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable, cast
+from typing import Any, Awaitable, Callable, Optional, cast
 
 from aiogram.types import CallbackQuery, ErrorEvent, Message, TelegramObject, Update
 
-from lexi.telegram.helpers import MessageHelper
+from lexi.telegram.helpers import EditCoalescer, MessageHelper
 from lexi.telegram.middlewares.event_typed import EventTypedMiddleware
 
 
 class MessageHelperMiddleware(EventTypedMiddleware):
+    edit_coalescer: Optional[EditCoalescer]
+
+    def __init__(self, edit_coalescer: Optional[EditCoalescer] = None) -> None:
+        super().__init__()
+        self.edit_coalescer = edit_coalescer
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -24,5 +30,6 @@ class MessageHelperMiddleware(EventTypedMiddleware):
             update=cast(Message | CallbackQuery, update),
             bot=data["bot"],
             fsm_context=data.get("state"),
+            edit_coalescer=self.edit_coalescer,
         )
         return await handler(event, data)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import time
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Final, Iterator, Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    AnswerCallbackQuery,
+    DeleteMessage,
+    DeleteMessages,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    Response,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+
+from lexi.enums.telegram import OutboundPriority
+from lexi.models.dto.telegram import OutboundQueueStats
+
+if TYPE_CHECKING:
+    from lexi.config.env.telegram import OutboundRateLimitConfig
+
+EDIT_METHODS: Final[tuple[type[TelegramMethod[Any]], ...]] = (
+    DeleteMessage,
+    DeleteMessages,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+)
+# Chat buckets are dropped once there are more of them, starting with full ones
+MAX_CHAT_BUCKETS: Final[int] = 10_000
+
+outbound_priority: Final[ContextVar[Optional[OutboundPriority]]] = ContextVar(
+    "outbound_priority", default=None
+)
+
+
+@contextmanager
+def send_with_priority(priority: OutboundPriority) -> Iterator[None]:
+    """Send the requests made inside, e.g. by a broadcast, with the given priority"""
+    token = outbound_priority.set(priority)
+    try:
+        yield
+    finally:
+        outbound_priority.reset(token)
+
+
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    blocked_until: float
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+        self.blocked_until = 0.0
+
+    def get_delay(self, now: float) -> float:
+        """:return: Seconds until a token is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        return self.get_delay(now) == 0.0 and self.tokens >= self.capacity
+
+
+class _QueueStats:
+    queued: int = 0
+    sent: int = 0
+    retried: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def to_dto(self, priority: OutboundPriority) -> OutboundQueueStats:
+        return OutboundQueueStats(
+            priority=priority.name.lower(),
+            queued=self.queued,
+            sent=self.sent,
+            retried=self.retried,
+            wait_avg=self.wait_total / self.sent if self.sent else 0.0,
+            wait_max=self.wait_max,
+        )
+
+
+class OutboundRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Queues Bot API requests to stay within the limits of Telegram.
+
+    Every request takes a token from the global bucket and, when it targets a chat,
+    from the bucket of that chat. Queued requests are sent by priority, so a callback
+    answer overtakes a backlog of edits and messages, but a request waiting for a busy
+    chat does not hold back requests to other chats. A flood control error blocks the
+    chat (or every chat) for ``retry_after`` and the request is queued again.
+    """
+
+    config: OutboundRateLimitConfig
+    _global: TokenBucket
+    _chats: dict[int | str, TokenBucket]
+    _waiters: list[tuple[int, int, Optional[int | str], asyncio.Future[None]]]
+    _sequence: Iterator[int]
+    _stats: dict[OutboundPriority, _QueueStats]
+    _wakeup: asyncio.Event
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(self, config: OutboundRateLimitConfig) -> None:
+        self.config = config
+        self._global = TokenBucket(config.global_rate, config.global_burst, time.monotonic())
+        self._chats = {}
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._stats = {priority: _QueueStats() for priority in OutboundPriority}
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        priority = outbound_priority.get()
+        if priority is None:
+            priority = _get_priority(method)
+        chat_id: Optional[int | str] = getattr(method, "chat_id", None)
+        retries = 0
+        while True:
+            await self.acquire(priority, chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self.block(chat_id, e.retry_after)
+                if retries >= self.config.max_retries:
+                    raise
+                retries += 1
+                self._stats[priority].retried += 1
+
+    async def acquire(self, priority: OutboundPriority, chat_id: Optional[int | str]) -> None:
+        """Wait for a token of the chat and a global one"""
+        stats = self._stats[priority]
+        queued_at = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        bisect.insort(self._waiters, (priority, next(self._sequence), chat_id, future))
+        stats.queued += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        try:
+            await future
+        finally:
+            stats.queued -= 1
+        wait = time.monotonic() - queued_at
+        stats.sent += 1
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+
+    def block(self, chat_id: Optional[int | str], retry_after: float) -> None:
+        now = time.monotonic()
+        bucket = self._global if chat_id is None else self._get_bucket(chat_id, now)
+        bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+        self._wakeup.set()
+
+    def get_stats(self) -> list[OutboundQueueStats]:
+        return [stats.to_dto(priority) for priority, stats in self._stats.items()]
+
+    async def _run(self) -> None:
+        # Ends once the queue is empty, the next request starts it again
+        while True:
+            delay = self._grant()
+            self._wakeup.clear()
+            if delay is None:
+                return
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+
+    def _grant(self) -> Optional[float]:
+        """
+        Let through every waiter that has tokens, in priority order.
+
+        :return: Seconds until the next waiter may get tokens, ``None`` if nobody waits
+        """
+        now = time.monotonic()
+        delay: Optional[float] = None
+        waiting = []
+        for waiter in self._waiters:
+            *_, chat_id, future = waiter
+            if future.done():
+                # Cancelled by the caller
+                continue
+            global_delay = self._global.get_delay(now)
+            chat_bucket = self._get_bucket(chat_id, now) if chat_id is not None else None
+            chat_delay = chat_bucket.get_delay(now) if chat_bucket is not None else 0.0
+            if not global_delay and not chat_delay:
+                self._global.take()
+                if chat_bucket is not None:
+                    chat_bucket.take()
+                future.set_result(None)
+                continue
+            waiting.append(waiter)
+            waiter_delay = max(global_delay, chat_delay)
+            delay = waiter_delay if delay is None else min(delay, waiter_delay)
+        self._waiters = waiting
+        return delay
+
+    def _get_bucket(self, chat_id: int | str, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_CHAT_BUCKETS:
+                self._chats = {
+                    key: value for key, value in self._chats.items() if not value.is_full(now)
+                }
+            bucket = self._chats[chat_id] = TokenBucket(
+                self.config.chat_rate, self.config.chat_burst, now
+            )
+        return bucket
+
+
+def _get_priority(method: TelegramMethod[Any]) -> OutboundPriority:
+    if isinstance(method, AnswerCallbackQuery):
+        return OutboundPriority.CALLBACK_ANSWER
+    if isinstance(method, EDIT_METHODS):
+        return OutboundPriority.EDIT
+    return OutboundPriority.MESSAGE
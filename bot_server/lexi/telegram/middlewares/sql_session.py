@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lexi.services.postgres import SharedSQLSession, shared_sql_session
+
+
+class SQLSessionMiddleware(BaseMiddleware):
+    """
+    Shares one database session between the middlewares and the handler of an update.
+    ``SQLSessionContext`` picks it up on its own, it is also available as ``sql_session``.
+    """
+
+    session_pool: async_sessionmaker[AsyncSession]
+    idle_timeout: float
+
+    def __init__(self, session_pool: async_sessionmaker[AsyncSession], idle_timeout: float) -> None:
+        super().__init__()
+        self.session_pool = session_pool
+        self.idle_timeout = idle_timeout
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Optional[Any]:
+        session = SharedSQLSession(session_pool=self.session_pool, idle_timeout=self.idle_timeout)
+        token = shared_sql_session.set(session)
+        data["sql_session"] = session
+        try:
+            return await handler(event, data)
+        finally:
+            shared_sql_session.reset(token)
+            await session.close()
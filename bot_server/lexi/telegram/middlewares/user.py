@@ -8,7 +8,6 @@ from aiogram_i18n import I18nMiddleware
 
 from lexi.services.crud.user import UserService
 from lexi.telegram.middlewares.event_typed import EventTypedMiddleware
-from lexi.utils.logging import database as logger
 
 if TYPE_CHECKING:
     from lexi.models.dto.user import UserDto
@@ -28,15 +27,10 @@ class UserMiddleware(EventTypedMiddleware):
             return await handler(event, data)
 
         user_service: UserService = data["user_service"]
-        user: Optional[UserDto] = await user_service.get(user_id=aiogram_user.id)
-        if user is None:
-            i18n: I18nMiddleware = data["i18n_middleware"]
-            user = await user_service.create(aiogram_user=aiogram_user, i18n_core=i18n.core)
-            logger.info(
-                "New user in database: %s (%d)",
-                aiogram_user.full_name,
-                aiogram_user.id,
-            )
+        i18n: I18nMiddleware = data["i18n_middleware"]
+        user: UserDto = await user_service.get_or_create(
+            aiogram_user=aiogram_user, i18n_core=i18n.core
+        )
 
         data["user"] = user
         return await handler(event, data)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from contextvars import ContextVar
+from typing import Any, Final, Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import AnswerCallbackQuery, Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+# Methods whose result callers can do without, Telegram does not report the result
+# of a method sent in the webhook response. The reply is applied while the handler
+# keeps running, so it must not matter in which order it lands among later calls.
+REPLY_METHODS: Final[tuple[type[TelegramMethod[Any]], ...]] = (AnswerCallbackQuery,)
+
+
+class WebhookReply:
+    """Holds the Bot API call of an update that is sent back in the webhook response"""
+
+    method: Optional[TelegramMethod[Any]]
+    is_closed: bool
+    _ready: asyncio.Event
+
+    __slots__ = ("method", "is_closed", "_ready")
+
+    def __init__(self) -> None:
+        self.method = None
+        self.is_closed = False
+        self._ready = asyncio.Event()
+
+    def offer(self, method: TelegramMethod[Any]) -> bool:
+        """:return: Whether the method was taken, otherwise the caller sends it"""
+        if self.is_closed:
+            return False
+        if isinstance(method, REPLY_METHODS):
+            self.method = method
+        # Only the first call of the update may go into the response
+        self.close()
+        return self.method is not None
+
+    def close(self) -> None:
+        """Stop taking methods, e.g. once the update is handled"""
+        self.is_closed = True
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> Optional[TelegramMethod[Any]]:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        # Later calls go out as usual
+        self.close()
+        return self.method
+
+
+webhook_reply: Final[ContextVar[Optional[WebhookReply]]] = ContextVar("webhook_reply", default=None)
+
+
+class WebhookReplyMiddleware(BaseRequestMiddleware):
+    """
+    Hands the callback query answer of the current update over to the webhook response
+    instead of sending it, saving a request to the Bot API. Only the first call of the
+    update is taken, a call sent before it closes the response.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        reply = webhook_reply.get()
+        if reply is not None and reply.offer(method):
+            return Response[TelegramType](ok=True, result=True)  # type: ignore[arg-type]
+        return await make_request(bot, method)
+
+
+def build_webhook_reply(bot: Bot, method: TelegramMethod[Any]) -> Optional[dict[str, Any]]:
+    """:return: Body of the webhook response, ``None`` if the method uploads files"""
+    files: dict[str, Any] = {}
+    body: dict[str, Any] = {"method": method.__api_method__}
+    for key, value in method.model_dump(warnings=False).items():
+        prepared = bot.session.prepare_value(value, bot=bot, files=files, _dumps_json=False)
+        if prepared is not None:
+            body[key] = prepared
+    return None if files else body
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton for finding any of many words in a text in a single pass.
+    Matches are reported only on word boundaries, so "ass" is not found in "class".
+    """
+
+    _goto: list[dict[str, int]]
+    _fail: list[int]
+    _output: list[list[str]]
+
+    __slots__ = ("_goto", "_fail", "_output")
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for word in words:
+            if word:
+                self._add(word)
+        self._build_links()
+
+    def find(self, text: str) -> Optional[str]:
+        """First word found in the text"""
+        return next(self.iter_matches(text), None)
+
+    def iter_matches(self, text: str) -> Iterator[str]:
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for word in self._output[state]:
+                start = index - len(word) + 1
+                if _is_boundary(text, start - 1) and _is_boundary(text, index + 1):
+                    yield word
+
+    def _add(self, word: str) -> None:
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(word)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Final, Optional
+
+from lexi.models.dto.redis import CompressionStats
+
+if TYPE_CHECKING:
+    from lexi.config.env.redis import RedisCompressionConfig
+
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Plain JSON and story text never start with a NUL byte
+COMPRESSED_MARKER: Final[bytes] = b"\x00zst"
+
+
+class PayloadCodec:
+    """
+    Transparent zstd compression of values stored in Redis.
+
+    Values above ``min_size`` are compressed with an optional trained dictionary and
+    prefixed with :data:`COMPRESSED_MARKER`. Values without the marker are returned
+    as they are, so uncompressed values written earlier stay readable.
+    """
+
+    config: RedisCompressionConfig
+    _compressor: Any
+    _decompressor: Any
+    _values: int
+    _raw_bytes: int
+    _stored_bytes: int
+
+    def __init__(self, config: RedisCompressionConfig) -> None:
+        self.config = config
+        self._compressor = None
+        self._decompressor = None
+        self._values = self._raw_bytes = self._stored_bytes = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.config.is_enabled
+
+    def encode(self, data: str | bytes) -> bytes:
+        raw = data.encode() if isinstance(data, str) else data
+        if not self.is_enabled or len(raw) < self.config.min_size:
+            return raw
+        compressed: bytes = COMPRESSED_MARKER + self._get_compressor().compress(raw)
+        self._values += 1
+        self._raw_bytes += len(raw)
+        if len(compressed) >= len(raw):
+            self._stored_bytes += len(raw)
+            return raw
+        self._stored_bytes += len(compressed)
+        return compressed
+
+    def decode(self, value: str | bytes) -> bytes:
+        raw = value.encode() if isinstance(value, str) else value
+        if not raw.startswith(COMPRESSED_MARKER):
+            return raw
+        decompressed: bytes = self._get_decompressor().decompress(raw[len(COMPRESSED_MARKER) :])
+        return decompressed
+
+    def get_stats(self) -> CompressionStats:
+        return CompressionStats(
+            is_enabled=self.is_enabled,
+            values=self._values,
+            raw_bytes=self._raw_bytes,
+            stored_bytes=self._stored_bytes,
+            ratio=self._raw_bytes / self._stored_bytes if self._stored_bytes else 1.0,
+        )
+
+    def _get_compressor(self) -> Any:
+        if self._compressor is None:
+            self._compressor = _zstandard().ZstdCompressor(
+                level=self.config.level,
+                dict_data=self._load_dictionary(),
+                write_content_size=True,
+            )
+        return self._compressor
+
+    def _get_decompressor(self) -> Any:
+        if self._decompressor is None:
+            self._decompressor = _zstandard().ZstdDecompressor(dict_data=self._load_dictionary())
+        return self._decompressor
+
+    def _load_dictionary(self) -> Optional[Any]:
+        if self.config.dictionary_path is None:
+            return None
+        return _zstandard().ZstdCompressionDict(self.config.dictionary_path.read_bytes())
+
+
+def train_dictionary(samples: list[bytes], size: int) -> bytes:
+    """Train a zstd dictionary on sample values"""
+    dictionary: bytes = _zstandard().train_dictionary(size, samples).as_bytes()
+    return dictionary
+
+
+def _zstandard() -> Any:
+    # Imported on first use, so that the package is only needed with compression enabled
+    import zstandard  # pylint: disable=import-outside-toplevel
+
+    return zstandard
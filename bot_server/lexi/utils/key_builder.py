@@ -1,9 +1,52 @@
 from enum import Enum
-from typing import TYPE_CHECKING, Any, ClassVar, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Final, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
 
+# Field types packed with a format string, without dumping the model
+FAST_FIELD_TYPES: Final[tuple[type[Any], ...]] = (str, int)
+
+
+class KeyFormat:
+    """Precompiled packing of a key whose fields are all strings or integers"""
+
+    name: str
+    template: str
+    separator: str
+    fields: tuple[tuple[str, type[Any]], ...]
+
+    __slots__ = ("name", "template", "separator", "fields")
+
+    def __init__(
+        self,
+        name: str,
+        prefix: Optional[str],
+        separator: str,
+        fields: tuple[tuple[str, type[Any]], ...],
+    ) -> None:
+        parts = [_escape(prefix)] if prefix else []
+        parts.extend("{}" for _ in fields)
+        self.name = name
+        self.template = _escape(separator).join(parts)
+        self.separator = separator
+        self.fields = fields
+
+    def pack(self, values: dict[str, Any], check_types: bool = False) -> str:
+        separator = self.separator
+        ordered = []
+        for field, annotation in self.fields:
+            value = values[field]
+            # bool is an int, but would be packed as "1"
+            if check_types and type(value) is not annotation:  # pylint: disable=C0123
+                raise TypeError(f"{self.name}.{field} must be {annotation.__name__}, got {value!r}")
+            if annotation is str and separator in value:
+                raise ValueError(
+                    f"Separator symbol {separator!r} can not be used in value {field}={value!r}"
+                )
+            ordered.append(value)
+        return self.template.format(*ordered)
+
 
 def build_key(prefix: str, /, *parts: Any, **kw_parts: Any) -> str:
     return ":".join([prefix, *map(str, parts), *map(str, kw_parts.values())])
@@ -15,6 +58,8 @@ class StorageKey(BaseModel):
         """Data separator (default is :code:`:`)"""
         __prefix__: ClassVar[Optional[str]]
         """Storage key prefix"""
+        __key_format__: ClassVar[Optional[KeyFormat]]
+        """Compiled packing, only when every field is a str or an int"""
 
     # noinspection PyMethodOverriding
     def __init_subclass__(cls, **kwargs: Any) -> None:
@@ -27,6 +72,35 @@ class StorageKey(BaseModel):
             )
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        fields = tuple((name, field.annotation) for name, field in cls.model_fields.items())
+        cls.__key_format__ = None
+        if all(annotation in FAST_FIELD_TYPES for _, annotation in fields):
+            cls.__key_format__ = KeyFormat(
+                name=cls.__name__,
+                prefix=cls.__prefix__,
+                separator=cls.__separator__,
+                fields=fields,  # type: ignore[arg-type]
+            )
+
+    @classmethod
+    def build(cls, **values: Any) -> str:
+        """
+        Pack a key without creating the model, for keys built on every Redis access.
+        Values are not coerced, so they must already have the field types.
+        """
+        key_format = cls.__key_format__
+        if key_format is None:
+            return cls(**values).pack()
+        if len(values) != len(key_format.fields):
+            raise ValueError(
+                f"{cls.__name__} expects fields {[name for name, _ in key_format.fields]}, "
+                f"got {list(values)}"
+            )
+        return key_format.pack(values, check_types=True)
+
     @classmethod
     def encode_value(cls, value: Any) -> str:
         if value is None:
@@ -40,6 +114,8 @@ class StorageKey(BaseModel):
         return str(value)
 
     def pack(self) -> str:
+        if self.__key_format__ is not None:
+            return self.__key_format__.pack(self.__dict__)
         result = [self.__prefix__] if self.__prefix__ else []
         for key, value in self.model_dump(mode="json").items():
             encoded = self.encode_value(value)
@@ -50,3 +126,7 @@ class StorageKey(BaseModel):
                 )
             result.append(encoded)
         return self.__separator__.join(result)
+
+
+def _escape(value: str) -> str:
+    return value.replace("{", "{{").replace("}", "}}")
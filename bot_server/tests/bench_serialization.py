@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of RedisRepository value encoding and decoding.
+
+Compares the former path (``model_dump`` + msgspec on write, msgspec + a new
+``TypeAdapter`` on read) with the serializer registry. Run with::
+
+    python -m tests.bench_serialization
+"""
+
+import timeit
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+
+from lexi.models.dto.story import StorySession, VocabularyWord
+from lexi.services.redis.serializers import SerializerRegistry
+from lexi.utils import mjson
+from tests.test_story_teller import create_session
+
+NUMBER = 5_000
+
+
+def encode_before(value: BaseModel) -> bytes:
+    return mjson.bytes_encode(value.model_dump(exclude_defaults=True))
+
+
+def decode_before(data: bytes, validator: type[Any]) -> Any:
+    return TypeAdapter[Any](validator).validate_python(mjson.decode(data))
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Microseconds per call, best of five runs"""
+    return min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    registry = SerializerRegistry()
+    session = create_session("The forest was quiet. The fox slept.\n\n" * 10 + "The fox woke.")
+    session.key_words = ["quiet", "slept", "woke"] * 10
+    word = VocabularyWord(word="fox", definition="animal", translation="лиса", language_code="en")
+
+    print(f"{'':<30}{'before, us':>12}{'after, us':>12}")
+    for name, value in (("StorySession", session), ("VocabularyWord", word)):
+        data = encode_before(value)
+        serializer = registry.get(type(value))
+        rows = (
+            ("encode", lambda: encode_before(value), lambda: registry.encode(value)),
+            ("decode", lambda: decode_before(data, type(value)), lambda: serializer.decode(data)),
+        )
+        for operation, before, after in rows:
+            print(f"{name + ' ' + operation:<30}{measure(before):>12.2f}{measure(after):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis payload compression
+"""
+
+import pytest
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.utils import mjson
+from lexi.utils.compression import COMPRESSED_MARKER, PayloadCodec
+
+PAYLOAD = mjson.bytes_encode(
+    {"word": "forest", "definition": "a large area covered with trees " * 20}
+)
+
+
+def test_disabled_codec_stores_values_as_they_are():
+    """Test that values are written uncompressed while compression is off"""
+    codec = PayloadCodec(config=RedisCompressionConfig())
+
+    assert codec.encode(PAYLOAD) == PAYLOAD
+    assert codec.decode(PAYLOAD) == PAYLOAD
+
+
+def test_compressed_values_round_trip():
+    """Test that large values are compressed and earlier plain values stay readable"""
+    pytest.importorskip("zstandard")
+    codec = PayloadCodec(config=RedisCompressionConfig(is_enabled=True, min_size=64))
+
+    stored = codec.encode(PAYLOAD)
+
+    assert stored.startswith(COMPRESSED_MARKER)
+    assert codec.decode(stored) == PAYLOAD
+    assert codec.decode(PAYLOAD.decode()) == PAYLOAD
+    assert codec.encode(b'{"a":1}') == b'{"a":1}'
+    assert codec.get_stats().ratio > 2
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the content moderation prefilter and batching
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.assets import Assets
+from lexi.config.env.content_moderation import ContentModerationConfig
+from lexi.services.content_moderation import ContentModerator
+from lexi.utils.aho_corasick import AhoCorasick
+
+
+def test_aho_corasick_matches_whole_words():
+    """Test that blocklisted words are found only on word boundaries"""
+    automaton = AhoCorasick(["ass", "sex", "секс"])
+
+    assert automaton.find("a classic sextant") is None
+    assert automaton.find("a kick-ass fox") == "ass"
+    assert automaton.find("лиса и секс") == "секс"
+
+
+def test_blocklist_spares_harmless_learner_text():
+    """Test that words which are only inappropriate in some contexts are left to the API"""
+    assets = Assets()  # type: ignore
+    automaton = AhoCorasick(
+        word for words in assets.moderation_blocklist.values() for word in words
+    )
+
+    for text in ("a naked mole rat", "голый король", "leśna droga", "una pelada"):
+        assert automaton.find(text) is None, text
+    assert automaton.find("a nazi spy") == "nazi"
+
+
+def create_moderator(flagged_texts=()):
+    redis_repo = MagicMock()
+    redis_repo.exists = AsyncMock(return_value=False)
+    llm_gateway = MagicMock()
+
+    async def moderate(text, model):
+        return SimpleNamespace(
+            results=[SimpleNamespace(flagged=item in flagged_texts) for item in text]
+        )
+
+    llm_gateway.moderate = AsyncMock(side_effect=moderate)
+    moderator = ContentModerator(
+        config=ContentModerationConfig(),
+        redis_repo=redis_repo,
+        llm_gateway=llm_gateway,
+        blocklist=["Nazi"],
+    )
+    moderator._allow = AsyncMock()
+    return moderator, llm_gateway
+
+
+@pytest.mark.asyncio
+async def test_blocklisted_text_skips_api():
+    """Test that the local blocklist rejects text without an API call"""
+    moderator, llm_gateway = create_moderator()
+
+    assert await moderator.is_appropriate("A NAZI fox") is False
+    llm_gateway.moderate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_are_batched():
+    """Test that concurrent unknown inputs are sent in one API call"""
+    moderator, llm_gateway = create_moderator(flagged_texts={"a scary knife"})
+
+    results = await asyncio.gather(
+        moderator.is_appropriate("A clever   fox"),
+        moderator.is_appropriate("a clever fox"),
+        moderator.is_appropriate("A scary knife"),
+    )
+
+    assert results == [True, True, False]
+    llm_gateway.moderate.assert_awaited_once()
+    assert llm_gateway.moderate.await_args.kwargs["text"] == ["a clever fox", "a scary knife"]
+
+
+@pytest.mark.asyncio
+async def test_allowlisted_phrases_expire_separately():
+    """Test that every approved phrase is stored under its own key with the allowlist TTL"""
+    moderator, _ = create_moderator()
+    del moderator._allow
+    moderator.redis_repo.client.set = AsyncMock()
+
+    await moderator.is_appropriate("A brave fox")
+    await moderator.is_appropriate("A dark forest")
+
+    keys = [call.args[0] for call in moderator.redis_repo.client.set.await_args_list]
+    assert len(set(keys)) == 2
+    for call in moderator.redis_repo.client.set.await_args_list:
+        assert call.kwargs["ex"] == moderator.config.allowlist_ttl
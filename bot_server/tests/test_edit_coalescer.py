@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for coalescing of message edits
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+
+from lexi.config.env.telegram import MessageEditsConfig
+from lexi.telegram.helpers import EditCoalescer
+
+
+def create_coalescer(min_interval: float = 0.05) -> EditCoalescer:
+    return EditCoalescer(config=MessageEditsConfig(is_enabled=True, min_interval=min_interval))
+
+
+@pytest.mark.asyncio
+async def test_edits_within_interval_send_latest_text():
+    """Test that edits arriving during the interval are replaced by the latest one"""
+    coalescer = create_coalescer()
+    send = AsyncMock(return_value=True)
+
+    async def edit(text: str, delay: float) -> bool:
+        await asyncio.sleep(delay)
+        return await coalescer.edit(
+            chat_id=1, message_id=2, text=text, reply_markup=None, send=send
+        )
+
+    results = await asyncio.gather(edit("a", 0), edit("b", 0.01), edit("c", 0.02))
+
+    assert results == [True, True, True]
+    assert [call.kwargs["text"] for call in send.await_args_list] == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_not_sent():
+    """Test that an edit repeating the last sent content is skipped"""
+    coalescer = create_coalescer(min_interval=0)
+    send = AsyncMock(return_value=True)
+
+    for _ in range(3):
+        await coalescer.edit(chat_id=1, message_id=2, text="a", reply_markup=None, send=send)
+    await coalescer.edit(chat_id=1, message_id=3, text="a", reply_markup=None, send=send)
+
+    assert send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_edit_is_raised_and_retried():
+    """Test that a failed edit raises to its caller and does not mark the content as sent"""
+    coalescer = create_coalescer(min_interval=0)
+    error = TelegramBadRequest(method=AsyncMock(), message="Bad Request: message to edit not found")
+    send = AsyncMock(side_effect=[error, True])
+
+    with pytest.raises(TelegramBadRequest):
+        await coalescer.edit(chat_id=1, message_id=2, text="a", reply_markup=None, send=send)
+    assert await coalescer.edit(chat_id=1, message_id=2, text="a", reply_markup=None, send=send)
+
+    assert send.await_count == 2
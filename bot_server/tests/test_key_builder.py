@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for storage key packing
+"""
+
+from uuid import UUID
+
+import pytest
+
+from lexi.services.story_session_store import StorySessionKey
+from lexi.services.story_speculation import StorySpeculationKey
+from lexi.services.story_teller import VocabularyCacheKey
+from lexi.utils.key_builder import StorageKey
+
+
+class MixedKey(StorageKey, prefix="mixed"):
+    flag: bool
+    token: UUID
+
+
+def pack_generic(key: StorageKey) -> str:
+    """Packing as it was done before the format string path"""
+    result = [key.__prefix__] if key.__prefix__ else []
+    result.extend(key.encode_value(value) for value in key.model_dump(mode="json").values())
+    return key.__separator__.join(result)
+
+
+def test_fast_path_packs_like_the_generic_one():
+    """Test that precompiled keys keep the format of the stored keys"""
+    keys = [
+        VocabularyCacheKey(word="fox", target_language="en", native_language="ru"),
+        StorySpeculationKey(user_id="1", turn=2, choice_id="3"),
+    ]
+
+    for key in keys:
+        assert key.__key_format__ is not None
+        assert key.pack() == pack_generic(key)
+        assert type(key).build(**dict(key)) == key.pack()
+    assert MixedKey.__key_format__ is None
+    mixed = MixedKey(flag=True, token=UUID(int=1))
+    assert MixedKey.build(**dict(mixed)) == mixed.pack() == pack_generic(mixed)
+
+
+def test_fast_path_keeps_validation():
+    """Test that separators and wrong types are still rejected"""
+    with pytest.raises(ValueError, match="Separator"):
+        VocabularyCacheKey(word="a:b", target_language="en", native_language="ru").pack()
+    with pytest.raises(ValueError, match="Separator"):
+        VocabularyCacheKey.build(word="a:b", target_language="en", native_language="ru")
+    with pytest.raises(TypeError):
+        StorySpeculationKey.build(user_id="1", turn="2", choice_id="3")
+    with pytest.raises(ValueError):
+        StorySessionKey.build()
+
+
+def test_session_key_packs_like_the_generic_one():
+    """Test that every way of building a session key gives the same key"""
+    key = StorySessionKey(user_id="42")
+
+    assert StorySessionKey.build(user_id="42") == key.pack() == pack_generic(key)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM response cache
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.env.llm_cache import LLMCacheConfig
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.services.llm_cache import LLMResponseCache
+from lexi.services.redis.serializers import SerializerRegistry
+from lexi.utils.compression import PayloadCodec
+
+REQUEST = {
+    "model": "gpt-4o-mini",
+    "messages": [{"role": "user", "content": "Define 'fox'"}],
+    "max_tokens": 150,
+    "temperature": 0.3,
+}
+
+
+def test_cache_key_ignores_param_order():
+    """Test that the same request always maps to the same key"""
+    cache = LLMResponseCache(config=LLMCacheConfig(is_enabled=True), redis_repo=MagicMock())
+    reordered = dict(reversed(list(REQUEST.items())))
+
+    assert cache._get_key("vocabulary", REQUEST) == cache._get_key("vocabulary", reordered)
+    assert cache._get_key("vocabulary", REQUEST) != cache._get_key(
+        "vocabulary", {**REQUEST, "max_tokens": 200}
+    )
+
+
+@pytest.mark.asyncio
+async def test_high_temperature_calls_bypass_cache():
+    """Test that creative calls go straight to the API"""
+    redis_repo = MagicMock()
+    redis_repo.client.get = AsyncMock()
+    cache = LLMResponseCache(config=LLMCacheConfig(is_enabled=True), redis_repo=redis_repo)
+    fetch = AsyncMock(return_value="Once upon a time")
+
+    result = await cache.get_or_fetch("story", {**REQUEST, "temperature": 0.9}, fetch, str)
+
+    assert result == "Once upon a time"
+    fetch.assert_awaited_once()
+    redis_repo.client.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_response_is_served_without_fetch():
+    """Test that a cache hit does not call the API"""
+    redis_repo = MagicMock()
+    redis_repo.codec = PayloadCodec(config=RedisCompressionConfig())
+    redis_repo.serializers = SerializerRegistry()
+    redis_repo.client.get = AsyncMock(return_value=b'"a small wild animal"')
+    redis_repo.client.zadd = AsyncMock()
+    redis_repo.increment = AsyncMock()
+    cache = LLMResponseCache(config=LLMCacheConfig(is_enabled=True), redis_repo=redis_repo)
+    fetch = AsyncMock()
+
+    result = await cache.get_or_fetch("vocabulary", REQUEST, fetch, str)
+
+    assert result == "a small wild animal"
+    fetch.assert_not_awaited()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared LLM gateway
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from lexi.config.env.llm_gateway import LLMGatewayConfig
+from lexi.services.llm_gateway import LLMGateway
+
+
+def create_gateway(**kwargs):
+    config = MagicMock()
+    config.llm_gateway = LLMGatewayConfig(**kwargs)
+    config.story_teller.openai.api_key.get_secret_value.return_value = "test-key"
+    config.content_moderation.openai_api_key.get_secret_value.return_value = "test-key"
+    return LLMGateway(config=config)
+
+
+def rate_limit_error(retry_after: str) -> RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_retry_delay_honours_retry_after():
+    """Test that the server-provided delay wins over a shorter backoff"""
+    gateway = create_gateway(retry_base_delay=0.1, retry_max_delay=20)
+
+    assert gateway._get_retry_delay(rate_limit_error("7"), attempt=0) == 7
+    assert gateway._get_retry_delay(rate_limit_error("60"), attempt=0) == 20
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_per_model():
+    """Test that requests over the model limit wait for a free slot"""
+    gateway = create_gateway(default_concurrency=2)
+    active = peak = 0
+
+    async def create(**_):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "done"
+
+    gateway.client = MagicMock()
+    gateway.client.chat.completions.create = create
+
+    results = await asyncio.gather(*(gateway.complete(model="gpt-4o-mini") for _ in range(6)))
+
+    assert results == ["done"] * 6
+    assert peak == 2
+    [stats] = gateway.get_stats()
+    assert stats.requests == 6
+    assert stats.queue_wait_max > 0
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged LLM requests against a local fake OpenAI server
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+
+from lexi.config.env.llm_gateway import HedgingConfig, LLMGatewayConfig
+from lexi.services.llm_gateway import LLMGateway
+from lexi.services.llm_hedging import HedgeBudget, HedgingPolicy
+
+# Latency injected before the first token, per model
+FIRST_TOKEN_LATENCY = {"slow-model": 5.0, "fast-model": 0.01}
+
+
+async def handle_chat_completions(request: web.Request) -> web.StreamResponse:
+    body = await request.json()
+    model = body["model"]
+    await asyncio.sleep(FIRST_TOKEN_LATENCY[model])
+
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await response.prepare(request)
+    for text in (f"Hello from {model}", "!"):
+        chunk = {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+        }
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+
+@pytest.fixture
+async def fake_openai_url():
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handle_chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1"
+    await runner.cleanup()
+
+
+def create_gateway(base_url: str, **hedging) -> LLMGateway:
+    config = MagicMock()
+    config.llm_gateway = LLMGatewayConfig(
+        base_url=base_url, hedging=HedgingConfig(is_enabled=True, **hedging)
+    )
+    config.story_teller.openai.api_key.get_secret_value.return_value = "test-key"
+    config.content_moderation.openai_api_key.get_secret_value.return_value = "test-key"
+    return LLMGateway(config=config)
+
+
+async def collect(gateway: LLMGateway, model: str) -> str:
+    text = ""
+    async for chunk in gateway.stream(
+        hedge=True, model=model, messages=[{"role": "user", "content": "Hi"}]
+    ):
+        text += chunk.choices[0].delta.content or ""
+    return text
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_is_hedged_to_fallback_model(fake_openai_url):
+    """Test that a stream without a first token is raced by the fallback model"""
+    gateway = create_gateway(fake_openai_url, max_delay=0.2, fallback_model="fast-model")
+    started_at = time.monotonic()
+
+    text = await collect(gateway, "slow-model")
+
+    assert text == "Hello from fast-model!"
+    assert time.monotonic() - started_at < 2
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_hedging_respects_budget(fake_openai_url):
+    """Test that the slow request is awaited once the hedge budget is spent"""
+    FIRST_TOKEN_LATENCY["slow-model"] = 0.5
+    gateway = create_gateway(fake_openai_url, max_delay=0.1, fallback_model="fast-model", burst=0)
+
+    text = await collect(gateway, "slow-model")
+
+    assert text == "Hello from slow-model!"
+    FIRST_TOKEN_LATENCY["slow-model"] = 5.0
+    await gateway.close()
+
+
+def test_hedge_budget_limits_ratio():
+    """Test that only a share of requests may be hedged"""
+    budget = HedgeBudget(ratio=0.1, burst=1)
+    hedges = 0
+    for _ in range(100):
+        budget.on_request()
+        hedges += budget.try_acquire()
+
+    assert hedges == 10
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_request():
+    """Test that cancelling the caller while it waits for the first token stops the request"""
+    policy = HedgingPolicy(config=HedgingConfig(is_enabled=True))
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def start(model: str) -> str:
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return model
+
+    caller = asyncio.create_task(policy.run("story", "slow-model", start))
+    await started.wait()
+    caller.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
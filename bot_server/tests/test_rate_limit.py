@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the outbound Bot API rate limiter
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import AnswerCallbackQuery, EditMessageText, SendMessage
+
+from lexi.config.env.telegram import OutboundRateLimitConfig
+from lexi.telegram.middlewares import OutboundRateLimitMiddleware
+
+
+def create_limiter(**kwargs) -> OutboundRateLimitMiddleware:
+    return OutboundRateLimitMiddleware(config=OutboundRateLimitConfig(is_enabled=True, **kwargs))
+
+
+@pytest.mark.asyncio
+async def test_burst_is_queued_by_priority():
+    """Test that requests over the global limit wait and callback answers go first"""
+    limiter = create_limiter(global_rate=50.0, global_burst=1, chat_rate=100.0, chat_burst=100)
+    sent: list[str] = []
+
+    async def make_request(bot, method):
+        sent.append(type(method).__name__)
+        return MagicMock()
+
+    requests = [
+        SendMessage(chat_id=1, text="Hi"),
+        SendMessage(chat_id=2, text="Hi"),
+        EditMessageText(chat_id=3, message_id=1, text="Hi"),
+        AnswerCallbackQuery(callback_query_id="1"),
+    ]
+    await asyncio.gather(*(limiter(make_request, MagicMock(), method) for method in requests))
+
+    # One token at a time, the queue is drained by priority and then by arrival
+    assert sent == ["AnswerCallbackQuery", "EditMessageText", "SendMessage", "SendMessage"]
+    stats = {stats.priority: stats for stats in limiter.get_stats()}
+    assert stats["message"].sent == 2 and stats["message"].wait_max > 0
+
+
+@pytest.mark.asyncio
+async def test_busy_chat_does_not_block_others():
+    """Test that a chat over its limit only delays its own requests"""
+    limiter = create_limiter(chat_rate=5.0, chat_burst=1)
+    make_request = AsyncMock()
+    started = time.monotonic()
+
+    await limiter(make_request, MagicMock(), SendMessage(chat_id=1, text="Hi"))
+    slow = asyncio.create_task(
+        limiter(make_request, MagicMock(), SendMessage(chat_id=1, text="Hi"))
+    )
+    await limiter(make_request, MagicMock(), SendMessage(chat_id=2, text="Hi"))
+
+    assert not slow.done()
+    await slow
+    assert time.monotonic() - started >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_flood_control_is_retried():
+    """Test that a request hitting flood control waits for retry_after and is sent again"""
+    limiter = create_limiter()
+    method = SendMessage(chat_id=1, text="Hi")
+    make_request = AsyncMock(
+        side_effect=[TelegramRetryAfter(method=method, message="Flood", retry_after=0), "ok"]
+    )
+
+    assert await limiter(make_request, MagicMock(), method) == "ok"
+    assert make_request.await_count == 2
+    assert {stats.priority: stats.retried for stats in limiter.get_stats()}["message"] == 1
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis cache decorator
+"""
+
+import asyncio
+import time
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.services.redis import redis_cache
+from lexi.services.redis.cache_wrapper import CacheEntry, _should_refresh
+from lexi.utils.compression import PayloadCodec
+
+
+def create_redis(storage: dict[str, bytes]) -> MagicMock:
+    async def set_value(key, value, ex=None, px=None, nx=False):
+        if nx and key in storage:
+            return None
+        storage[key] = value
+        return True
+
+    async def delete(*keys):
+        for key in keys:
+            storage.pop(key, None)
+
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=lambda key: storage.get(key))
+    redis.set = AsyncMock(side_effect=set_value)
+    redis.delete = AsyncMock(side_effect=delete)
+    return redis
+
+
+class Service:
+    def __init__(self, storage: dict[str, bytes]) -> None:
+        self.redis = create_redis(storage)
+        self.codec = PayloadCodec(config=RedisCompressionConfig())
+        self.loads = 0
+
+    @redis_cache(prefix="name", ttl=60, negative_ttl=10, lock_timeout=0.2)
+    async def get_name(self, user_id: int) -> Optional[str]:
+        self.loads += 1
+        await asyncio.sleep(0.01)
+        return f"user {user_id}" if user_id > 0 else None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once():
+    """Test that a burst of misses of one key calls the method once"""
+    service = Service({})
+
+    names = await asyncio.gather(*(service.get_name(user_id=1) for _ in range(10)))
+
+    assert names == ["user 1"] * 10
+    assert service.loads == 1
+    assert await service.get_name(user_id=1) == "user 1"
+    assert service.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_values_are_cached_with_own_ttl():
+    """Test that None results are cached with the negative TTL"""
+    service = Service({})
+
+    assert await service.get_name(user_id=0) is None
+    assert await service.get_name(user_id=0) is None
+
+    assert service.loads == 1
+    assert service.redis.set.await_args.kwargs["ex"] == 10
+
+
+@pytest.mark.asyncio
+async def test_waits_for_value_loaded_by_other_process():
+    """Test that a process finding the key locked reads the value loaded by the lock holder"""
+    storage: dict[str, bytes] = {}
+    holder, waiter = Service(storage), Service(storage)
+    await holder.get_name(user_id=1)
+    storage["cache:name:1:lock"] = b"1"
+    storage_value = storage.pop("cache:name:1")
+
+    async def release() -> None:
+        await asyncio.sleep(0.05)
+        storage["cache:name:1"] = storage_value
+
+    name, _ = await asyncio.gather(waiter.get_name(user_id=1), release())
+
+    assert name == "user 1"
+    assert waiter.loads == 0
+
+
+def test_refresh_probability_grows_towards_expiry():
+    """Test that entries are refreshed early only close to their expiry"""
+    now = time.time()
+    far = CacheEntry(value=None, delta=0.01, expires_at=now + 60)
+    close = CacheEntry(value=None, delta=10.0, expires_at=now + 0.001)
+
+    assert not any(_should_refresh(far, beta=1.0) for _ in range(100))
+    assert sum(_should_refresh(close, beta=1.0) for _ in range(100)) > 90
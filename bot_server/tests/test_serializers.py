@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the serializers of values stored in Redis
+"""
+
+import pytest
+
+from lexi.models.dto.story import StorySession, VocabularyWord
+from lexi.services.redis.serializers import (
+    DEFAULT_STRUCTS,
+    AdapterSerializer,
+    SerializerRegistry,
+    StructSerializer,
+)
+from tests.test_story_teller import create_session
+
+
+@pytest.mark.parametrize("model", list(DEFAULT_STRUCTS))
+def test_structs_mirror_their_models(model):
+    """Test that a msgspec struct has the same fields as the model it stands for"""
+    assert set(DEFAULT_STRUCTS[model].__struct_fields__) == set(model.model_fields)
+
+
+def test_hot_models_roundtrip_through_structs():
+    """Test that sessions and words decoded with msgspec equal the originals"""
+    registry = SerializerRegistry()
+    session = create_session("The forest was quiet.\n\nThe fox woke.")
+    session.chosen_choices = ["Wake up"]
+    word = VocabularyWord(word="fox", definition="animal", translation="лиса", language_code="en")
+
+    assert isinstance(registry.get(StorySession), StructSerializer)
+    assert registry.get(StorySession).decode(registry.encode(session)) == session
+    assert registry.get(StorySession).decode(registry.encode(session)).segments == session.segments
+    assert registry.get(VocabularyWord).decode(registry.encode(word)) == word
+
+
+def test_serializers_are_built_once_per_type():
+    """Test that other types fall back to a cached pydantic adapter"""
+    registry = SerializerRegistry()
+
+    serializer = registry.get(list[int])
+
+    assert isinstance(serializer, AdapterSerializer)
+    assert registry.get(list[int]) is serializer
+    assert serializer.decode(b"[1, 2]") == [1, 2]
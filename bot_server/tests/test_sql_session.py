@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for sharing one database session per update
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.services.postgres import SharedSQLSession, SQLSessionContext, shared_sql_session
+
+
+def create_session_pool() -> MagicMock:
+    def create_session() -> MagicMock:
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.close = AsyncMock()
+        session.rollback = AsyncMock()
+        session.in_transaction = MagicMock(return_value=True)
+        return session
+
+    return MagicMock(side_effect=create_session)
+
+
+@pytest.mark.asyncio
+async def test_update_reuses_one_session():
+    """Test that consecutive queries of an update share a session that is closed at the end"""
+    session_pool = create_session_pool()
+    shared = SharedSQLSession(session_pool=session_pool, idle_timeout=0.01)
+    token = shared_sql_session.set(shared)
+    try:
+        async with SQLSessionContext(session_pool=session_pool) as (first, _):
+            pass
+        async with SQLSessionContext(session_pool=session_pool) as (second, _):
+            pass
+        # Another task must not use the session concurrently
+        await asyncio.create_task(_query(session_pool))
+        await asyncio.sleep(0.05)
+    finally:
+        shared_sql_session.reset(token)
+        await shared.close()
+
+    assert session_pool.call_count == 2
+    assert first.session is second.session
+    # The connection was returned while the update was idle
+    first.session.rollback.assert_awaited_once()
+    first.session.close.assert_awaited_once()
+
+
+async def _query(session_pool: MagicMock) -> None:
+    async with SQLSessionContext(session_pool=session_pool):
+        pass
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for buffered persistence of finished stories
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from asyncpg.exceptions import UniqueViolationError
+
+from lexi.config.env.story_teller import StoryHistoryConfig
+from lexi.services.story_history import StoryHistoryWriter, build_story_records
+from tests.test_story_teller import create_session
+
+
+def test_segments_are_paired_with_the_choices_that_led_to_them():
+    """Test that the opening segment has no choice and the others have theirs"""
+    session = create_session("The forest was quiet.\n\nThe fox woke.\n\nThe fox ran.")
+    session.chosen_choices = ["Wake up", "Run"]
+    session.key_words = ["quiet", "woke", "quiet"]
+
+    records = build_story_records(session)
+
+    assert [(position, choice) for _, position, _, choice in records.segments] == [
+        (0, None),
+        (1, "Wake up"),
+        (2, "Run"),
+    ]
+    assert [word for _, word, _, _ in records.key_words] == ["quiet", "woke"]
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batches_and_keeps_failed_ones():
+    """Test that stories are copied in batches and a failed batch is retried later"""
+    writer = StoryHistoryWriter(
+        config=StoryHistoryConfig(is_enabled=True, batch_size=2), session_pool=MagicMock()
+    )
+    writer._write = AsyncMock(side_effect=[None, Exception("connection lost")])
+    for _ in range(3):
+        writer.add(create_session("The fox woke."))
+
+    with pytest.raises(Exception, match="connection lost"):
+        await writer.flush()
+
+    assert [len(call.args[0]) for call in writer._write.call_args_list] == [2, 1]
+    assert writer.pending == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_stories_are_dropped_from_batch():
+    """Test that stories the database rejects are dropped and the rest of the batch is written"""
+    writer = StoryHistoryWriter(
+        config=StoryHistoryConfig(is_enabled=True, batch_size=3), session_pool=MagicMock()
+    )
+    rejected = UniqueViolationError("duplicate key value violates unique constraint")
+    writer._write = AsyncMock(side_effect=[rejected, None, rejected, None])
+    for _ in range(3):
+        writer.add(create_session("The fox woke."))
+
+    assert await writer.flush() == 2
+
+    assert [len(call.args[0]) for call in writer._write.call_args_list] == [3, 1, 1, 1]
+    assert writer.pending == 0
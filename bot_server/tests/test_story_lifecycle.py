@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for story session expiry, archiving and restoring
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.env.story_teller import SessionLifecycleConfig
+from lexi.enums.story import StorySessionStatus
+from lexi.services.story_lifecycle import StorySessionLifecycle
+from tests.test_story_session_store import create_store
+from tests.test_story_teller import create_service, create_session
+
+
+def create_lifecycle(store=None) -> StorySessionLifecycle:
+    if store is None:
+        store = MagicMock()
+        store.redis_repo.client.set = AsyncMock(return_value=True)
+        store.redis_repo.client.delete = AsyncMock()
+        store.redis_repo.client.eval = AsyncMock()
+        store.redis_repo.client.lrange = AsyncMock(return_value=[])
+    lifecycle = StorySessionLifecycle(
+        config=SessionLifecycleConfig(is_enabled=True, batch_size=10),
+        session_pool=MagicMock(),
+        store=store,
+    )
+    lifecycle._archive = AsyncMock()
+    lifecycle._discard_archived = AsyncMock()
+    return lifecycle
+
+
+@pytest.mark.asyncio
+async def test_turn_slides_session_expiry():
+    """Test that every turn refreshes the TTL and the activity index"""
+    store, pipe = create_store()
+    store.idle_ttl = 3600
+
+    await store.append_turn(
+        create_session("The fox woke."), "The fox woke.", [], chosen_choice="Wake up"
+    )
+
+    assert {call.args for call in pipe.expire.call_args_list} == {
+        ("story_session_state:1", 3600),
+        ("story_session_segments:1", 3600),
+        ("story_session_key_words:1", 3600),
+        ("story_session_chosen_choices:1", 3600),
+        ("story_session_growth_moments:1", 3600),
+    }
+    assert pipe.zadd.call_args.args[0] == "story_session_activity"
+
+
+@pytest.mark.asyncio
+async def test_sweep_archives_idle_sessions_and_evicts_them():
+    """Test that idle sessions go to Postgres and only then leave Redis"""
+    lifecycle = create_lifecycle()
+    session = create_session("The fox woke.")
+    store = lifecycle.store
+    store.get_idle = AsyncMock(return_value=[(1, 100.0), (2, 100.0)])
+    store.get = AsyncMock(side_effect=[session, None])
+    store.forget = AsyncMock()
+    store.evict_if_idle = AsyncMock(return_value=True)
+
+    assert await lifecycle.sweep() == 1
+
+    lifecycle._archive.assert_awaited_once_with([session], StorySessionStatus.ABANDONED)
+    store.evict_if_idle.assert_awaited_once_with(1, 100.0)
+    store.forget.assert_awaited_once_with(2)
+    lifecycle._discard_archived.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_archive_of_sessions_resumed_meanwhile():
+    """Test that the archive row is removed when the session was not evicted"""
+    lifecycle = create_lifecycle()
+    store = lifecycle.store
+    store.get_idle = AsyncMock(return_value=[(1, 100.0)])
+    store.get = AsyncMock(return_value=create_session("The fox woke."))
+    store.forget = AsyncMock()
+    store.evict_if_idle = AsyncMock(return_value=False)
+
+    assert await lifecycle.sweep() == 0
+
+    lifecycle._discard_archived.assert_awaited_once_with([1])
+
+
+@pytest.mark.asyncio
+async def test_sweep_releases_only_its_own_lock():
+    """Test that the lock is released with the token it was taken with"""
+    lifecycle = create_lifecycle()
+    client = lifecycle.store.redis_repo.client
+    lifecycle._archive_finished = AsyncMock(return_value=0)
+    lifecycle._archive_idle = AsyncMock(return_value=0)
+
+    await lifecycle.sweep()
+
+    token = client.set.call_args.args[1]
+    client.eval.assert_awaited_once()
+    assert client.eval.call_args.args[1:] == (1, "story_sweeper_lock", token)
+    client.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_finished_story_clears_abandoned_archive():
+    """Test that finishing a story removes its abandoned archive with history enabled"""
+    service = create_service()
+    service.lifecycle = MagicMock()
+    service.lifecycle.discard_archived = AsyncMock()
+    service.history_writer = MagicMock()
+    service.session_store.delete = AsyncMock()
+    session = create_session("The fox woke.")
+
+    await service.finish_story_session(session)
+
+    service.history_writer.add.assert_called_once_with(session)
+    service.lifecycle.queue_finished.assert_not_called()
+    service.lifecycle.discard_archived.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_abandoned_session_is_restored_on_return():
+    """Test that a session missing from Redis is looked up in the archive"""
+    session = create_session("The fox woke.")
+    lifecycle = MagicMock()
+    lifecycle.rehydrate = AsyncMock(return_value=session)
+    service = create_service()
+    service.lifecycle = lifecycle
+    service.session_store.get = AsyncMock(return_value=None)
+
+    assert await service.get_story_session(1) == session
+    lifecycle.rehydrate.assert_awaited_once_with(1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental story response parser
+"""
+
+from lexi.services.story_parser import (
+    StoryJsonStreamParser,
+    StoryStreamParser,
+    parse_story_response,
+    parse_structured_story_response,
+)
+
+RESPONSE = (
+    "The fox heard a loud CRACK in the forest.\n"
+    "Something was moving behind the trees!\n"
+    "\n"
+    "1. Hide behind the big rock\n"
+    "2. Climb the tallest tree\n"
+)
+
+
+def test_parse_story_response():
+    """Test that a complete response is split into story text and choices"""
+    story_text, choices, growth_moment, _ = parse_story_response(RESPONSE)
+
+    assert growth_moment is None
+    assert story_text == (
+        "The fox heard a loud CRACK in the forest.\nSomething was moving behind the trees!"
+    )
+    assert choices == ["Hide behind the big rock", "Climb the tallest tree"]
+
+
+def test_stream_parser_matches_full_parse():
+    """Test that feeding the response in small chunks gives the same result"""
+    parser = StoryStreamParser()
+    for i in range(0, len(RESPONSE), 3):
+        parser.feed(RESPONSE[i : i + 3])
+
+    assert parser.finish() == parse_story_response(RESPONSE)
+
+
+def test_stream_parser_holds_back_choices():
+    """Test that partial choice lines never leak into the visible story text"""
+    parser = StoryStreamParser()
+    parser.feed("The fox ran.\n1")
+    assert parser.story_text == "The fox ran."
+    assert not parser.in_choices
+
+    parser.feed(". Hide")
+    assert parser.story_text == "The fox ran."
+
+    parser.feed("\n2. Climb")
+    assert parser.in_choices
+    assert parser.story_text == "The fox ran."
+    assert parser.finish() == ("The fox ran.", ["Hide", "Climb"], None, ())
+
+
+def test_stream_parser_shows_partial_story_line():
+    """Test that an unfinished story line is visible while streaming"""
+    parser = StoryStreamParser()
+    parser.feed("The fox ran into the da")
+
+    assert parser.story_text == "The fox ran into the da"
+
+
+def test_stream_parser_extracts_growth_moment():
+    """Test that the growth marker is stripped from the story and remembered"""
+    parser = StoryStreamParser()
+    parser.feed("GROW")
+    assert parser.story_text == ""
+
+    parser.feed("TH: The fox learned to be patient.\nThe wind howled.\n1. Wait\n2. Run")
+    story = parser.finish()
+
+    assert story.text == "The fox learned to be patient.\nThe wind howled."
+    assert story.growth_moment == "The fox learned to be patient."
+    assert story.choices == ["Wait", "Run"]
+
+
+JSON_RESPONSE = (
+    '{"text": "The fox heard a loud \\"CRACK\\".\\nSomething moved!", '
+    '"choices": ["Hide", "Climb"], "key_words": ["Loud"], "growth_moment": null}'
+)
+
+
+def test_json_stream_parser_shows_partial_text():
+    """Test that the text field is visible while the JSON object is streamed"""
+    parser = StoryJsonStreamParser()
+    parser.feed(JSON_RESPONSE[:38])
+    assert parser.story_text == 'The fox heard a loud "CRACK'
+    assert not parser.in_choices
+
+    parser.feed(JSON_RESPONSE[38:])
+    assert parser.in_choices
+    story = parser.finish()
+
+    assert story.text == 'The fox heard a loud "CRACK".\nSomething moved!'
+    assert story.choices == ["Hide", "Climb"]
+    assert story.key_words == ("loud",)
+    assert story.growth_moment is None
+
+
+def test_structured_response_falls_back_to_line_parser():
+    """Test that a plain text response is still parsed when JSON decoding fails"""
+    assert parse_structured_story_response(RESPONSE) == parse_story_response(RESPONSE)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only story session storage
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.services.redis.serializers import SerializerRegistry
+from lexi.services.story_session_store import StorySessionStore
+from lexi.utils.compression import PayloadCodec
+from tests.test_story_teller import create_session
+
+
+def create_store():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_repo = MagicMock()
+    redis_repo.codec = PayloadCodec(config=RedisCompressionConfig())
+    redis_repo.serializers = SerializerRegistry()
+    redis_repo.client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis_repo.client.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+    return StorySessionStore(redis_repo=redis_repo), pipe
+
+
+@pytest.mark.asyncio
+async def test_append_turn_writes_only_the_new_segment():
+    """Test that a turn does not rewrite the story told so far"""
+    store, pipe = create_store()
+    session = create_session("A very long story.\n\n" * 50 + "The fox woke.")
+
+    session.chosen_choices = ["Wake up"] * 50
+    session.logic.growth_moments = ["The fox was brave"] * 5
+
+    await store.append_turn(
+        session, "The fox woke.", ["woke"], chosen_choice="Wake up", growth_moment="Brave"
+    )
+
+    [hset_call] = pipe.hset.call_args_list
+    mapping = hset_call.kwargs["mapping"]
+    assert set(mapping) == {"logic", "choices", "turn_count", "last_updated"}
+    assert "growth_moments" not in mapping["logic"]
+    pipe.rpush.assert_any_call("story_session_segments:1", b"The fox woke.")
+    pipe.rpush.assert_any_call("story_session_key_words:1", "woke")
+    pipe.rpush.assert_any_call("story_session_chosen_choices:1", "Wake up")
+    pipe.rpush.assert_any_call("story_session_growth_moments:1", "Brave")
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_restores_session_from_hash_and_lists():
+    """Test that a saved session is read back with its segments"""
+    session = create_session("The forest was quiet.\n\nThe fox woke.")
+    session.key_words = ["quiet"]
+    session.chosen_choices = ["Wake up"]
+    session.logic.growth_moments = ["The fox was brave"]
+    store, pipe = create_store()
+    state = StorySessionStore._dump_state(session)
+    pipe.execute.return_value = [
+        {field.encode(): value.encode() for field, value in state.items()},
+        [b"The forest was quiet.", b"The fox woke."],
+        [b"quiet"],
+        [b"Wake up"],
+        [b"The fox was brave"],
+    ]
+
+    assert await store.get(session.user_id) == session
+    pipe.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_moves_legacy_choices_out_of_the_hash():
+    """Test that chosen choices kept in the hash are read and moved to their list"""
+    session = create_session("The fox woke.")
+    session.chosen_choices = ["Wake up"]
+    session.logic.growth_moments = ["The fox was brave"]
+    store, pipe = create_store()
+    state = session.model_dump(mode="json", exclude={"story_text", "key_words"})
+    pipe.execute.return_value = [
+        {field.encode(): json.dumps(value).encode() for field, value in state.items()},
+        [b"The fox woke."],
+        [],
+        [],
+        [],
+    ]
+
+    assert await store.get(session.user_id) == session
+    pipe.rpush.assert_any_call("story_session_chosen_choices:1", "Wake up")
+    pipe.rpush.assert_any_call("story_session_growth_moments:1", "The fox was brave")
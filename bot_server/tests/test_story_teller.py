@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the StoryTellerService
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.models.dto.story import StoryLogic, StoryParams, StorySession, VocabularyWord
+from lexi.models.dto.story_creation_params import StoryCreationParams
+from lexi.services.story_teller import StoryTellerService
+from lexi.utils.compression import PayloadCodec
+
+
+def create_service(redis_repo=None, llm_gateway=None) -> StoryTellerService:
+    config = MagicMock()
+    config.story_teller.compaction.is_enabled = False
+    config.story_teller.speculation.is_enabled = False
+    return StoryTellerService(
+        config=config,
+        redis_repo=redis_repo or MagicMock(),
+        llm_gateway=llm_gateway or MagicMock(),
+    )
+
+
+def create_session(story_text: str = "") -> StorySession:
+    return StorySession(
+        user_id=1,
+        params=StoryParams(
+            target_language_code="en",
+            native_language_code="ru",
+            protagonist="a clever fox",
+            setting="a dark forest",
+            openai_model="gpt-4o-mini",
+            max_tokens=600,
+            temperature=0.9,
+        ),
+        logic=StoryLogic(character_growths_moments_left=1),
+        story_text=story_text,
+        created_at=datetime.now(UTC),
+        last_updated=datetime.now(UTC),
+    )
+
+
+@pytest.mark.asyncio
+async def test_word_context_is_the_latest_sentence_with_the_word():
+    """Test that only the sentence containing the word is used as context"""
+    redis_repo = MagicMock()
+    redis_repo.codec = PayloadCodec(config=RedisCompressionConfig())
+    redis_repo.client.lrange = AsyncMock(
+        return_value=[b"The forest was quiet. The fox slept.", b"A branch cracked! The fox woke."]
+    )
+    service = create_service(redis_repo=redis_repo)
+
+    assert await service.get_word_context(1, "fox") == "The fox woke."
+    assert await service.get_word_context(1, "quiet") == "The forest was quiet."
+
+
+@pytest.mark.asyncio
+async def test_prefetch_vocabulary_defines_words_in_one_call():
+    """Test that all key words of a bit are defined with a single request and cached"""
+    redis_repo = MagicMock()
+    redis_repo.exists = AsyncMock(return_value=False)
+    redis_repo.set = AsyncMock()
+    llm_gateway = MagicMock()
+    response = MagicMock()
+    response.choices[0].message.content = (
+        "Word: branch\nDefinition: a part of a tree\nTranslation: ветка\n\n"
+        "Word: cracked\nDefinition: made a sharp sound\nTranslation: треснула\n"
+    )
+    llm_gateway.complete = AsyncMock(return_value=response)
+    service = create_service(redis_repo=redis_repo, llm_gateway=llm_gateway)
+    session = create_session()
+
+    await service.prefetch_vocabulary(
+        session, "A branch cracked! The fox opened one eye.", ["branch", "cracked"]
+    )
+
+    llm_gateway.complete.assert_awaited_once()
+    cached = [call.args[1] for call in redis_repo.set.await_args_list]
+    assert cached == [
+        VocabularyWord(
+            word="branch", definition="a part of a tree", translation="ветка", language_code="en"
+        ),
+        VocabularyWord(
+            word="cracked",
+            definition="made a sharp sound",
+            translation="треснула",
+            language_code="en",
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_new_story_drops_state_of_abandoned_one():
+    """Test that creating a story removes the summary and speculation left by the previous one"""
+    service = create_service()
+    openai_config = service.config.story_teller.openai
+    openai_config.model, openai_config.max_tokens, openai_config.temperature = "gpt", 600, 0.9
+    service.session_store = MagicMock(save=AsyncMock())
+    service.compactor = MagicMock(delete_summary=AsyncMock())
+    service.speculator = MagicMock(discard=AsyncMock())
+
+    await service.create_story_session(
+        user_id=1,
+        params=StoryCreationParams(
+            target_language_code="en",
+            native_language_code="ru",
+            protagonist="a clever fox",
+            setting="a dark forest",
+        ),
+    )
+
+    service.compactor.delete_summary.assert_awaited_once_with(1)
+    service.speculator.discard.assert_awaited_once_with(1)
+    service.session_store.save.assert_awaited_once()
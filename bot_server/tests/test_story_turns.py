@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for idempotent story turns
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.config.env.story_teller import TurnGuardConfig
+from lexi.models.dto.story import StoryBit, StoryChoice
+from lexi.services.story_turns import StoryTurnGuard, StoryTurnKey
+from lexi.telegram.keyboards.callback_data.story import CDStoryChoice
+from lexi.utils.compression import PayloadCodec
+from tests.test_redis_cache import create_redis
+
+
+def create_guard(storage: dict[str, bytes]) -> StoryTurnGuard:
+    redis_repo = MagicMock()
+    redis_repo.client = create_redis(storage)
+    redis_repo.codec = PayloadCodec(config=RedisCompressionConfig())
+    return StoryTurnGuard(config=TurnGuardConfig(is_enabled=True), redis_repo=redis_repo)
+
+
+@pytest.mark.asyncio
+async def test_repeated_tap_gets_story_bit_of_first():
+    """Test that only the first tap of a turn generates and the others wait for its result"""
+    storage: dict[str, bytes] = {}
+    first, second = create_guard(storage), create_guard(storage)
+    story_bit = StoryBit(
+        text="The fox ran.", choices=[StoryChoice(text="Hide", choice_id="1")], key_words=[], turn=3
+    )
+
+    turn = StoryTurnKey(user_id=1, story_id=100, turn=2)
+
+    assert await first.claim(turn)
+    assert not await second.claim(turn)
+    waiting = asyncio.create_task(second.get_result(turn))
+    await first.complete(turn, story_bit=story_bit)
+
+    assert await waiting == story_bit
+    assert await second.get_result(StoryTurnKey(user_id=1, story_id=100, turn=3)) is None
+
+
+@pytest.mark.asyncio
+async def test_new_story_does_not_reuse_turns_of_previous_one():
+    """Test that the same turn of a new story is claimed anew"""
+    guard = create_guard({})
+
+    assert await guard.claim(StoryTurnKey(user_id=1, story_id=100, turn=1))
+    assert await guard.claim(StoryTurnKey(user_id=1, story_id=200, turn=1))
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_can_be_retried():
+    """Test that releasing a turn lets the next tap claim it"""
+    guard = create_guard({})
+    turn = StoryTurnKey(user_id=1, story_id=100, turn=2)
+
+    assert await guard.claim(turn)
+    await guard.release(turn)
+
+    assert await guard.get_result(turn) is None
+    assert await guard.claim(turn)
+
+
+def test_keyboard_carries_turn():
+    """Test that the turn token survives the callback data round trip"""
+    data = CDStoryChoice(choice_id="2", turn=5, story_id=100).pack()
+
+    assert CDStoryChoice.unpack(data) == CDStoryChoice(choice_id="2", turn=5, story_id=100)
+
+
+def test_keyboards_without_turn_are_still_accepted():
+    """Test that callback data of keyboards sent before turns were tracked is unpacked"""
+    assert CDStoryChoice.unpack("story_choice:2") == CDStoryChoice(choice_id="2")
+    assert CDStoryChoice.unpack("story_choice:2:5") == CDStoryChoice(choice_id="2", turn=5)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for ordered and bounded handling of webhook updates
+"""
+
+import asyncio
+
+import pytest
+
+from lexi.config.env.update_scheduler import UpdateSchedulerConfig
+from lexi.errors.scheduler import UpdateQueueFullError, UserQueueFullError
+from lexi.services.update_scheduler import UpdateScheduler
+
+
+@pytest.mark.asyncio
+async def test_updates_of_a_user_run_in_order():
+    """Test that updates of one user never overlap while other users run concurrently"""
+    scheduler = UpdateScheduler(config=UpdateSchedulerConfig(max_concurrency=4))
+    events: list[str] = []
+
+    def job(name: str, delay: float):
+        async def run() -> None:
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+
+        return run
+
+    scheduler.submit(1, job("a1", 0.02))
+    scheduler.submit(1, job("a2", 0.0))
+    scheduler.submit(2, job("b1", 0.01))
+    await scheduler.close()
+
+    assert events.index("end a1") < events.index("start a2")
+    assert events.index("start b1") < events.index("end a1")
+    stats = scheduler.get_stats()
+    assert (stats.pending, stats.users, stats.processed) == (0, 0, 3)
+
+
+@pytest.mark.asyncio
+async def test_overflow_is_rejected():
+    """Test that a flooding user gets 429 and a full scheduler 503"""
+    scheduler = UpdateScheduler(config=UpdateSchedulerConfig(max_pending=3, max_pending_per_user=2))
+    blocker = asyncio.Event()
+
+    scheduler.submit(1, blocker.wait)
+    scheduler.submit(1, blocker.wait)
+    with pytest.raises(UserQueueFullError) as user_error:
+        scheduler.submit(1, blocker.wait)
+    scheduler.submit(2, blocker.wait)
+    with pytest.raises(UpdateQueueFullError) as full_error:
+        scheduler.submit(3, blocker.wait)
+
+    assert (user_error.value.status_code, full_error.value.status_code) == (429, 503)
+    assert scheduler.get_stats().max_user_queue == 2
+    blocker.set()
+    await scheduler.close()
+    assert scheduler.get_stats().pending == 0
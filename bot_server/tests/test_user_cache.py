@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process user cache
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import User as AiogramUser
+
+from lexi.config.env.redis import RedisCompressionConfig
+from lexi.config.env.user_cache import UserCacheConfig
+from lexi.models.dto.user import UserDto
+from lexi.models.sql import User
+from lexi.services.crud import UserService
+from lexi.services.crud.user_cache import LocalUserCache
+from lexi.utils.compression import PayloadCodec
+from lexi.utils.ttl_cache import TTLCache
+from tests.test_redis_cache import create_redis
+
+
+def create_service() -> UserService:
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    redis.delete = AsyncMock()
+    service = UserService(
+        session_pool=MagicMock(),
+        redis=redis,
+        config=MagicMock(),
+        codec=MagicMock(),
+        local_cache=LocalUserCache(config=UserCacheConfig(is_enabled=True), redis=redis),
+    )
+    service._get_cached = AsyncMock(return_value=UserDto(id=1, name="Ann", language="en"))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_skip_redis():
+    """Test that a burst of updates from one user reads Redis once"""
+    service = create_service()
+
+    first = await service.get(user_id=1)
+    second = await service.get(user_id=1)
+
+    service._get_cached.assert_awaited_once()
+    assert first == second and first is not second
+    local, redis = service.local_cache.get_stats()
+    assert (local.hits, local.misses, redis.hits) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_broadcast_and_applied():
+    """Test that clearing the cache publishes the user id and other processes drop it"""
+    service = create_service()
+    await service.get(user_id=1)
+
+    await service.clear_cache(user_id=1)
+
+    channel, data = service.redis.publish.call_args.args
+    assert channel == "user_cache_invalidation" and data.startswith("1:")
+    await service.get(user_id=1)
+    service.local_cache._on_message({"type": "message", "data": b"1:peer"})
+    await service.get(user_id=1)
+    assert service._get_cached.await_count == 3
+
+
+def test_user_loaded_during_invalidation_is_not_cached():
+    """Test that a load racing an invalidation does not put stale data back"""
+    cache = LocalUserCache(config=UserCacheConfig(is_enabled=True), redis=MagicMock())
+    version = cache.version
+    cache._on_message({"type": "message", "data": b"1:peer"})
+
+    cache.set(UserDto(id=1, name="Ann", language="en"), version)
+
+    assert cache.get(1) is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry goes first"""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert (cache.get(1), cache.get(2), cache.get(3)) == ("a", None, "c")
+
+
+@pytest.mark.asyncio
+async def test_first_contact_is_upserted_and_written_through():
+    """Test that a new user is inserted without a lookup, then served from the cache"""
+    now = datetime.now(UTC)
+    session = MagicMock()
+    session.scalar = AsyncMock(return_value=None)
+    session.scalars = AsyncMock(
+        return_value=MagicMock(
+            one_or_none=MagicMock(
+                return_value=User(
+                    id=1,
+                    name="Ann",
+                    language="en",
+                    use_last_story_language=True,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        )
+    )
+    session.commit = AsyncMock()
+    session.close = AsyncMock()
+    session_pool = MagicMock()
+    session_pool.return_value.__aenter__ = AsyncMock(return_value=session)
+    storage: dict[str, bytes] = {}
+    service = UserService(
+        session_pool=session_pool,
+        redis=create_redis(storage),
+        config=MagicMock(),
+        codec=PayloadCodec(config=RedisCompressionConfig()),
+    )
+    aiogram_user = AiogramUser(id=1, is_bot=False, first_name="Ann", language_code="en")
+    i18n_core = MagicMock(available_locales=("en",))
+
+    first = await service.get_or_create(aiogram_user=aiogram_user, i18n_core=i18n_core)
+    second = await service.get_or_create(aiogram_user=aiogram_user, i18n_core=i18n_core)
+
+    session.scalar.assert_not_awaited()
+    session.scalars.assert_awaited_once()
+    assert first == second == UserDto(id=1, name="Ann", language="en")
+    assert "cache:get_user:1" in storage
+
+
+@pytest.mark.asyncio
+async def test_written_user_survives_own_invalidation():
+    """Test that the echo of an invalidation published by this process keeps the new copy"""
+    service = create_service()
+    user = UserDto(id=1, name="Ann", language="de")
+    service.redis.set = AsyncMock()
+    service.codec.encode = MagicMock(return_value=b"")
+
+    await service._write_through(user)
+    [(_, data)] = [call.args for call in service.redis.publish.call_args_list]
+    service.local_cache._on_message({"type": "message", "data": data.encode()})
+
+    assert await service.get(user_id=1) == user
+    service._get_cached.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_contacts_share_one_upsert():
+    """Test that updates arriving together from a new user insert it once"""
+    service = create_service()
+    service.redis.get = AsyncMock(return_value=None)
+    service._upsert = AsyncMock(return_value=UserDto(id=1, name="Ann", language="en"))
+    aiogram_user = AiogramUser(id=1, is_bot=False, first_name="Ann", language_code="en")
+
+    first, second = await asyncio.gather(
+        service.get_or_create(aiogram_user=aiogram_user, i18n_core=MagicMock()),
+        service.get_or_create(aiogram_user=aiogram_user, i18n_core=MagicMock()),
+    )
+
+    service._upsert.assert_awaited_once()
+    assert first == second and first is not second
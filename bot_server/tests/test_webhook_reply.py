@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for replying to updates in the webhook response
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.methods import AnswerCallbackQuery, EditMessageText, SendMessage
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from lexi.telegram.middlewares.webhook_reply import (
+    WebhookReply,
+    WebhookReplyMiddleware,
+    build_webhook_reply,
+    webhook_reply,
+)
+
+
+@pytest.mark.asyncio
+async def test_first_callback_answer_goes_into_response():
+    """Test that only the first call is taken and later ones are sent"""
+    bot = Bot(token="42:TEST")
+    middleware = WebhookReplyMiddleware()
+    make_request = AsyncMock()
+    reply = WebhookReply()
+    token = webhook_reply.set(reply)
+    try:
+        response = await middleware(make_request, bot, AnswerCallbackQuery(callback_query_id="1"))
+        await middleware(make_request, bot, SendMessage(chat_id=1, text="Hi"))
+        await middleware(make_request, bot, AnswerCallbackQuery(callback_query_id="2"))
+    finally:
+        webhook_reply.reset(token)
+
+    assert response.result is True
+    assert await reply.wait(timeout=0) == AnswerCallbackQuery(callback_query_id="1")
+    assert make_request.await_count == 2
+    await bot.session.close()
+
+
+@pytest.mark.asyncio
+async def test_earlier_call_keeps_answer_in_order():
+    """Test that edits are sent and a call sent first closes the response"""
+    bot = Bot(token="42:TEST")
+    middleware = WebhookReplyMiddleware()
+    make_request = AsyncMock()
+    reply = WebhookReply()
+    edit = EditMessageText(chat_id=1, message_id=2, text="Menu")
+    answer = AnswerCallbackQuery(callback_query_id="1")
+    token = webhook_reply.set(reply)
+    try:
+        await middleware(make_request, bot, edit)
+        await middleware(make_request, bot, answer)
+    finally:
+        webhook_reply.reset(token)
+
+    assert await reply.wait(timeout=0) is None
+    assert [call.args[1] for call in make_request.await_args_list] == [edit, answer]
+    await bot.session.close()
+
+
+@pytest.mark.asyncio
+async def test_reply_body_resolves_defaults():
+    """Test that the response body names the method and resolves bot defaults"""
+    bot = Bot(token="42:TEST", default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    builder = InlineKeyboardBuilder()
+    builder.button(text="Back", callback_data="menu")
+
+    body = build_webhook_reply(
+        bot=bot,
+        method=EditMessageText(
+            chat_id=1, message_id=2, text="<b>Menu</b>", reply_markup=builder.as_markup()
+        ),
+    )
+
+    assert body is not None
+    assert (body["method"], body["parse_mode"]) == ("editMessageText", "HTML")
+    assert body["reply_markup"]["inline_keyboard"][0][0]["callback_data"] == "menu"
+    await bot.session.close()